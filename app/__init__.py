@@ -19,6 +19,16 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
 
+    # Stripe price ID -> plan name, resolved once for get_plan_from_price_id
+    app.config["STRIPE_PRICE_PLANS"] = {
+        price_id: plan
+        for price_id, plan in ((app.config.get("STRIPE_BASIC_PRICE_ID"), "basic"),)
+        if price_id
+    }
+
+    # Local attachment storage (used when Supabase isn't configured)
+    app.config.setdefault("UPLOAD_DIR", os.path.join(app.instance_path, "uploads"))
+
     # --- Validate required env vars (skip in testing) ---
     if config_name != "testing":
         try:
@@ -37,10 +47,6 @@ def create_app(config_name=None):
     with app.app_context():
         from app import models  # noqa: F401
 
-    # --- Tenant middleware ---
-    from app.middleware.tenant import init_tenant_middleware
-    init_tenant_middleware(app)
-
     # --- Register blueprints ---
     from app.blueprints.auth import auth_bp
     from app.blueprints.portal import portal_bp
@@ -94,11 +100,9 @@ def create_app(config_name=None):
     if app.debug:
         @app.route("/uploads/<path:filepath>")
         def serve_upload(filepath):
-            """Serve uploaded files from instance/uploads in dev mode."""
-            import os
+            """Serve uploaded files from UPLOAD_DIR (instance/uploads) in dev mode."""
             from flask import send_from_directory
-            upload_dir = os.path.join(app.instance_path, "uploads")
-            return send_from_directory(upload_dir, filepath)
+            return send_from_directory(app.config["UPLOAD_DIR"], filepath)
 
     # --- Error handlers ---
     @app.errorhandler(403)
@@ -167,9 +171,28 @@ def create_app(config_name=None):
     if not app.debug:
         logging.basicConfig(level=logging.INFO)
 
+    # --- Pre-compile templates ---
+    # Compile the hot templates at boot so a fresh worker's first requests
+    # (and first emails) don't pay for Jinja compilation. Skipped in debug,
+    # where templates auto-reload anyway.
+    if not app.debug:
+        _prewarm_templates(app)
+
     return app
 
 
+def _prewarm_templates(app):
+    """Load portal and email templates into the Jinja cache."""
+    names = app.jinja_env.list_templates(
+        filter_func=lambda name: name.startswith(("portal/", "emails/"))
+    )
+    for name in names:
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            app.logger.warning(f"Could not pre-compile template {name}: {e}")
+
+
 def register_cli(app):
     """Register custom CLI commands with the Flask app."""
 
@@ -384,6 +407,7 @@ def register_cli(app):
         into the kanban_columns / kanban_cards tables via SQLAlchemy.
         Skips if data already exists (idempotent).
         """
+        import json
         import sqlite3
         import uuid as _uuid
         from pathlib import Path
@@ -429,17 +453,85 @@ def register_cli(app):
                 title=row["title"],
                 description=row["description"] or "",
                 position=row["position"],
-                labels=row["labels"] or "[]",
-                comments=row["comments"] or "[]",
+                labels=json.loads(row["labels"] or "[]"),
+                comments=json.loads(row["comments"] or "[]"),
             ))
             card_count += 1
 
+        # Imported cards keep their old numbers; move the sequence past them
+        if db.engine.dialect.name == "postgresql":
+            db.session.execute(db.text(
+                "SELECT setval('kanban_card_num_seq', "
+                "COALESCE(MAX(card_number), 0) + 1, false) FROM kanban_cards"
+            ))
+
         db.session.commit()
         click.echo(f"Imported {len(old_cols)} columns and {card_count} cards.")
 
+    @app.cli.command("process-stripe-events")
+    @click.option("--min-age", default=5, help="Only retry pending events older than this many minutes.")
+    def process_stripe_events(min_age):
+        """Re-run Stripe webhook events that failed or never finished.
+
+        Webhooks are acknowledged before they're processed; anything left
+        "pending" or "processing" (worker restarted mid-task) or "failed"
+        is picked up here. Runs on a schedule (see Procfile).
+
+        Usage:
+            flask process-stripe-events
+        """
+        from datetime import datetime, timedelta, timezone
+
+        from app.models.stripe_event import StripeEvent
+        from app.services.stripe_service import process_stripe_event
+
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=min_age)
+        event_ids = [
+            row.stripe_event_id
+            for row in StripeEvent.query.filter(
+                db.or_(
+                    StripeEvent.status == "failed",
+                    db.and_(
+                        StripeEvent.status.in_(("pending", "processing")),
+                        StripeEvent.processed_at < cutoff,
+                    ),
+                )
+            ).order_by(StripeEvent.processed_at)
+        ]
+
+        failed = 0
+        for event_id in event_ids:
+            success, message = process_stripe_event(event_id, stale_before=cutoff)
+            if not success:
+                failed += 1
+                click.echo(f"  {event_id}: FAILED — {message}")
+
+        click.echo(f"Processed {len(event_ids) - failed}/{len(event_ids)} Stripe events.")
+
+    @app.cli.command("prune-stripe-events")
+    @click.option("--days", default=30, help="Delete processed events older than this many days.")
+    def prune_stripe_events(days):
+        """Delete old processed Stripe events from the idempotency table.
+
+        Stripe gives up retrying an event after three days, so processed
+        rows older than that no longer guard against duplicates.
+
+        Usage:
+            flask prune-stripe-events
+            flask prune-stripe-events --days 7
+        """
+        from datetime import datetime, timedelta, timezone
+
+        from app.services import stripe_service
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        deleted = stripe_service.prune_stripe_events(cutoff)
+        click.echo(f"Deleted {deleted} processed Stripe events older than {days} days.")
+
     @app.cli.command("send-reminders")
     @click.option("--dry-run", is_flag=True, help="Show what would be sent without actually sending.")
-    def send_reminders(dry_run):
+    @click.option("--quiet", is_flag=True, help="Skip the per-prospect report; print only sends and totals.")
+    def send_reminders(dry_run, quiet):
         """Send D3/D10/D30 follow-up emails to pitched prospects.
 
         Finds prospects with status "pitched" who have an email, checks
@@ -449,6 +541,7 @@ def register_cli(app):
         Usage:
             flask send-reminders
             flask send-reminders --dry-run
+            flask send-reminders --quiet
         """
         from app.services.reminder_service import process_reminders
-        process_reminders(dry_run=dry_run)
+        process_reminders(dry_run=dry_run, quiet=quiet)
@@ -32,7 +32,7 @@ from flask import (
     url_for,
 )
 from flask_login import current_user
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, selectinload, undefer
 
 from app.decorators import admin_required
 from app.extensions import db
@@ -45,6 +45,7 @@ from app.models.ticket import Ticket, TicketMessage
 from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceMember, WorkspaceSettings
 from app.services import invite_service, ticket_service
+from app.services.billing_service import get_latest_subscription
 from app.services.email_service import send_email
 from app.models.prospect_activity import ProspectActivity
 from app.models.contact_form import ContactFormConfig
@@ -128,10 +129,7 @@ def dashboard():
     pending_invite_records = (
         WorkspaceInvite.query
         .options(joinedload(WorkspaceInvite.workspace))
-        .filter(
-            WorkspaceInvite.used_at.is_(None),
-            WorkspaceInvite.expires_at > datetime.now(timezone.utc),
-        )
+        .filter(WorkspaceInvite.is_valid)
         .order_by(WorkspaceInvite.created_at.desc())
         .all()
     )
@@ -586,7 +584,7 @@ def prospect_detail(prospect_id):
             url_for("admin.workspace_detail", workspace_id=prospect.workspace_id)
         )
 
-    activities = prospect.activities.all()
+    activities = prospect.activities
 
     pitch_templates = (
         PitchTemplate.query
@@ -729,8 +727,7 @@ def prospect_send_outreach(prospect_id):
     invite_link = None
     if not prospect.workspace_id:
         # Check slug uniqueness
-        existing_site = Site.query.filter_by(site_slug=site_slug).first()
-        if existing_site:
+        if db.session.scalar(db.select(db.exists().where(Site.site_slug == site_slug))):
             flash(
                 f"Site slug '{site_slug}' is already taken. Please choose another.",
                 "error",
@@ -787,18 +784,17 @@ def prospect_send_outreach(prospect_id):
     else:
         # Workspace already exists — find existing invite or create new one
         workspace = db.session.get(Workspace, prospect.workspace_id)
-        site = workspace.sites.first() if workspace else None
+        site = workspace.sites[0] if workspace and workspace.sites else None
 
         # Look for a valid existing invite
         existing_invite = (
             WorkspaceInvite.query.filter_by(workspace_id=workspace.id)
-            .filter(
-                WorkspaceInvite.used_at.is_(None),
-            )
+            .filter(WorkspaceInvite.is_valid)
+            .order_by(WorkspaceInvite.created_at.desc())
             .first()
         )
 
-        if existing_invite and existing_invite.is_valid:
+        if existing_invite:
             invite = existing_invite
         else:
             invite = invite_service.generate_invite(
@@ -811,8 +807,8 @@ def prospect_send_outreach(prospect_id):
     base_url = current_app.config["APP_BASE_URL"]
     invite_link = f"{base_url}/auth/register?token={invite.token}"
 
-    # ── Send the combined outreach email ──
-    send_email(
+    # ── Combined outreach email, sent once the invite is committed ──
+    outreach_email = dict(
         to=recipient_email,
         subject=f"We built a website for {prospect.business_name}",
         template="emails/prospect_outreach.html",
@@ -866,6 +862,7 @@ def prospect_send_outreach(prospect_id):
     )
     db.session.add(audit)
     db.session.commit()
+    send_email(**outreach_email)
 
     status_msg = " Status moved to Pitched." if prospect.status == "pitched" else ""
     flash(
@@ -924,11 +921,12 @@ def prospect_convert(prospect_id):
             # Ensure an invite exists
             existing_invite = (
                 WorkspaceInvite.query.filter_by(workspace_id=workspace.id)
-                .filter(WorkspaceInvite.used_at.is_(None))
+                .filter(WorkspaceInvite.is_valid)
+                .order_by(WorkspaceInvite.created_at.desc())
                 .first()
             )
 
-            if existing_invite and existing_invite.is_valid:
+            if existing_invite:
                 invite = existing_invite
             else:
                 invite = invite_service.generate_invite(
@@ -948,8 +946,7 @@ def prospect_convert(prospect_id):
                 )
 
             # Check slug uniqueness
-            existing_site = Site.query.filter_by(site_slug=site_slug).first()
-            if existing_site:
+            if db.session.scalar(db.select(db.exists().where(Site.site_slug == site_slug))):
                 flash(f"Site slug '{site_slug}' is already taken.", "error")
                 return render_template(
                     "admin/workspace_convert.html",
@@ -1164,11 +1161,43 @@ def pitch_template_delete(template_id):
 # ══════════════════════════════════════════════
 
 
+def _latest_per_workspace(model, ws_ids):
+    """Newest `model` row (by created_at) for each workspace, keyed by
+    workspace_id.
+
+    Ranked with row_number() over each workspace's rows — ids are random
+    uuids, so max(id) would neither pick the newest row nor run on
+    Postgres' native uuid type.
+    """
+    ranked = (
+        db.select(
+            model.id,
+            db.func.row_number().over(
+                partition_by=model.workspace_id,
+                order_by=(model.created_at.desc(), model.id.desc()),
+            ).label("rank"),
+        )
+        .where(model.workspace_id.in_(ws_ids))
+        .subquery()
+    )
+    rows = db.session.scalars(
+        db.select(model)
+        .join(ranked, model.id == ranked.c.id)
+        .where(ranked.c.rank == 1)
+    ).all()
+    return {row.workspace_id: row for row in rows}
+
+
 @admin_bp.route("/workspaces")
 @admin_required
 def workspace_list():
     """List all workspaces with subscription status and invite info."""
-    workspaces = Workspace.query.order_by(Workspace.created_at.desc()).all()
+    workspaces = (
+        Workspace.query
+        .options(undefer(Workspace.member_count))
+        .order_by(Workspace.created_at.desc())
+        .all()
+    )
     ws_ids = [ws.id for ws in workspaces]
 
     # Batch fetch all related data in bulk queries
@@ -1178,42 +1207,9 @@ def workspace_list():
         for s in Site.query.filter(Site.workspace_id.in_(ws_ids)).all()
     }
 
-    # Subscriptions (latest per workspace) - use subquery for cross-database compatibility
-    from sqlalchemy import func as sql_func
-    from sqlalchemy import select
-
-    latest_sub_ids = (
-        db.session.query(sql_func.max(BillingSubscription.id).label("max_id"))
-        .filter(BillingSubscription.workspace_id.in_(ws_ids))
-        .group_by(BillingSubscription.workspace_id)
-        .subquery()
-    )
-    latest_subs = BillingSubscription.query.filter(
-        BillingSubscription.id.in_(select(latest_sub_ids))
-    ).all()
-    subs = {s.workspace_id: s for s in latest_subs}
-
-    # Latest invites - use subquery for cross-database compatibility
-    latest_invite_ids = (
-        db.session.query(sql_func.max(WorkspaceInvite.id).label("max_id"))
-        .filter(WorkspaceInvite.workspace_id.in_(ws_ids))
-        .group_by(WorkspaceInvite.workspace_id)
-        .subquery()
-    )
-    latest_invites = WorkspaceInvite.query.filter(
-        WorkspaceInvite.id.in_(select(latest_invite_ids))
-    ).all()
-    invites = {inv.workspace_id: inv for inv in latest_invites}
-
-    # Member counts
-    member_counts = dict(
-        db.session.query(
-            WorkspaceMember.workspace_id, sql_func.count(WorkspaceMember.id)
-        )
-        .filter(WorkspaceMember.workspace_id.in_(ws_ids))
-        .group_by(WorkspaceMember.workspace_id)
-        .all()
-    )
+    # Latest subscription and invite per workspace
+    subs = _latest_per_workspace(BillingSubscription, ws_ids)
+    invites = _latest_per_workspace(WorkspaceInvite, ws_ids)
 
     # Build enriched data for each workspace
     workspace_data = []
@@ -1224,7 +1220,7 @@ def workspace_list():
                 "site": sites.get(ws.id),
                 "subscription": subs.get(ws.id),
                 "latest_invite": invites.get(ws.id),
-                "member_count": member_counts.get(ws.id, 0),
+                "member_count": ws.member_count,
             }
         )
 
@@ -1267,11 +1263,7 @@ def workspace_detail(workspace_id):
     )
     member_data = [{"member": m, "user": m.user} for m in members]
 
-    subscription = (
-        BillingSubscription.query.filter_by(workspace_id=workspace_id)
-        .order_by(BillingSubscription.created_at.desc())
-        .first()
-    )
+    subscription = get_latest_subscription(workspace_id)
 
     billing_customer = workspace.billing_customer
 
@@ -1409,7 +1401,7 @@ def workspace_site_update(workspace_id):
         flash("Workspace not found.", "error")
         return redirect(url_for("admin.workspace_list"))
 
-    site = workspace.sites.first()
+    site = workspace.sites[0] if workspace.sites else None
     if site is None:
         flash("No site found for this workspace.", "error")
         return redirect(url_for("admin.workspace_detail", workspace_id=workspace_id))
@@ -1487,7 +1479,7 @@ def workspace_invite(workspace_id):
         flash("Workspace not found.", "error")
         return redirect(url_for("admin.workspace_list"))
 
-    site = workspace.sites.first()
+    site = workspace.sites[0] if workspace.sites else None
     if site is None:
         flash("Workspace has no site. Cannot generate invite.", "error")
         return redirect(url_for("admin.workspace_detail", workspace_id=workspace_id))
@@ -85,7 +85,9 @@ def register():
                 errors.append(email_error)
 
         # Check email uniqueness
-        if email and User.query.filter_by(email=email).first():
+        if email and db.session.scalar(
+            db.select(db.exists().where(User.email == email))
+        ):
             errors.append("An account with this email already exists.")
 
         # Re-validate token (could have been used between GET and POST)
@@ -118,10 +120,11 @@ def register():
 
         # --- Create workspace membership ---
         # First user gets "owner", subsequent users get "member"
-        existing_owner = WorkspaceMember.query.filter_by(
-            workspace_id=invite.workspace_id, role="owner"
-        ).first()
-        role = "member" if existing_owner else "owner"
+        has_owner = db.session.scalar(db.select(db.exists().where(
+            WorkspaceMember.workspace_id == invite.workspace_id,
+            WorkspaceMember.role == "owner",
+        )))
+        role = "member" if has_owner else "owner"
 
         membership = WorkspaceMember(
             user_id=user.id,
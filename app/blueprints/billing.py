@@ -29,11 +29,13 @@ from flask_login import current_user
 
 from app.decorators import login_required_for_site
 from app.extensions import limiter
+from app.middleware.tenant import load_subscription, resolve_tenant
 from app.services.stripe_service import create_checkout_session, create_portal_session
 
 logger = logging.getLogger(__name__)
 
 billing_bp = Blueprint("billing", __name__)
+billing_bp.before_request(resolve_tenant)
 
 
 # ──────────────────────────────────────────────
@@ -100,14 +102,9 @@ def checkout_status(site_slug):
     from Stripe and sync it ourselves — works even without webhooks.
     """
     from flask import jsonify
-    from app.models.billing import BillingSubscription
+    from app.services.billing_service import get_latest_subscription
 
-    sub = (
-        BillingSubscription.query
-        .filter_by(workspace_id=g.workspace_id)
-        .order_by(BillingSubscription.created_at.desc())
-        .first()
-    )
+    sub = get_latest_subscription(g.workspace_id)
     active = sub is not None and sub.status in ("active", "trialing")
 
     # If not active yet, try to sync from Stripe directly using the session_id
@@ -235,6 +232,7 @@ def billing_overview(site_slug):
     if g.access_level == "subscribe":
         return render_template("portal/subscribe.html")
 
+    load_subscription()
     return render_template("portal/billing.html")
 
 
@@ -13,8 +13,18 @@ Route Map:
 
 import logging
 import re
-
-from flask import Blueprint, jsonify, redirect as flask_redirect, request, make_response
+from urllib.parse import urlparse
+
+from flask import (
+    Blueprint,
+    current_app,
+    jsonify,
+    make_response,
+    redirect as flask_redirect,
+    request,
+)
+from sqlalchemy import lambda_stmt
+from sqlalchemy.orm import joinedload
 
 from app.extensions import db, limiter
 from app.models.contact_form import ContactFormConfig
@@ -35,6 +45,33 @@ def _cors_response(response):
     return response
 
 
+def _site_hosts(site):
+    """Return the hostnames a site is served from (with and without www.)."""
+    hosts = set()
+    if site is None:
+        return hosts
+    for value in (site.published_url, site.custom_domain):
+        if not value:
+            continue
+        host = urlparse(value if "://" in value else f"//{value}").hostname
+        if host:
+            host = host.removeprefix("www.")
+            hosts.update((host, f"www.{host}"))
+    return hosts
+
+
+def _is_allowed_redirect(url, site):
+    """Only redirect back to the submitting site or an explicitly allowed host."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return False
+    host = parsed.hostname.lower()
+    return (
+        host in current_app.config.get("ALLOWED_REDIRECT_HOSTS", ())
+        or host in _site_hosts(site)
+    )
+
+
 @form_relay_bp.route("/submit", methods=["OPTIONS"])
 def submit_preflight():
     """Handle CORS preflight requests."""
@@ -77,7 +114,12 @@ def submit():
             jsonify(ok=False, error="Missing access key.")
         ), 403
 
-    config = ContactFormConfig.query.filter_by(access_key=access_key).first()
+    # Lambda statement: built and cache-keyed once, not per submission
+    config = db.session.scalars(lambda_stmt(
+        lambda: db.select(ContactFormConfig)
+        .options(joinedload(ContactFormConfig.site))
+        .where(ContactFormConfig.access_key == access_key)
+    )).first()
 
     if config is None:
         return _cors_response(
@@ -143,7 +185,13 @@ def submit():
     )
 
     # If a redirect URL was provided, send the browser there instead of JSON
-    if redirect_url and redirect_url.startswith("http"):
-        return flask_redirect(redirect_url)
+    # (only back to the client's own site — never an open redirect)
+    if redirect_url:
+        if _is_allowed_redirect(redirect_url, site):
+            return flask_redirect(redirect_url)
+        logger.warning(
+            f"Form relay: ignoring redirect to disallowed URL {redirect_url!r} "
+            f"(site: {site_name})"
+        )
 
     return _cors_response(jsonify(ok=True)), 200
@@ -22,11 +22,13 @@ Route Map:
 import json
 import re
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 from functools import wraps
 
-from flask import Blueprint, current_app, jsonify, render_template, request
+from flask import Blueprint, abort, current_app, jsonify, render_template, request
 from flask_login import current_user
+from sqlalchemy.exc import IntegrityError
 
 from app.decorators import admin_required
 from app.extensions import db
@@ -57,6 +59,32 @@ def _kanban_api_auth(f):
     return decorated
 
 
+# ─── Board Cache ─────────────────────────────────────────────────
+# The serialized board is cached per process. Writes in this process drop
+# it immediately; writes handled by another worker are picked up on the
+# next read because the cache is keyed by a cheap fingerprint of both tables.
+# That fingerprint relies on updated_at, so writes here never stamp it from
+# the app host's clock — the Timestamps mixin's onupdate sets it from the
+# database's now() for every worker alike.
+
+_board_cache = None  # (version, json_body)
+
+
+def _board_version():
+    """Return a fingerprint that changes whenever any column or card changes."""
+    return tuple(db.session.execute(db.select(
+        db.select(db.func.count(KanbanColumn.id)).scalar_subquery(),
+        db.select(db.func.max(KanbanColumn.updated_at)).scalar_subquery(),
+        db.select(db.func.count(KanbanCard.id)).scalar_subquery(),
+        db.select(db.func.max(KanbanCard.updated_at)).scalar_subquery(),
+    )).one())
+
+
+def _invalidate_board_cache():
+    global _board_cache
+    _board_cache = None
+
+
 # ─── Page Route ──────────────────────────────────────────────────
 
 @kanban_bp.route("")
@@ -70,23 +98,31 @@ def board():
 @kanban_bp.route("/api/board")
 @_kanban_api_auth
 def api_board():
+    global _board_cache
+    version = _board_version()
+    cached = _board_cache
+    if cached is not None and cached[0] == version:
+        return current_app.response_class(cached[1], mimetype="application/json")
+
+    # Two queries for the whole board: every card is fetched in one ordered
+    # pass and grouped by column here, rather than one query per column.
     columns = KanbanColumn.query.order_by(KanbanColumn.position).all()
+    cards_by_column = defaultdict(list)
+    for card in KanbanCard.query.order_by(KanbanCard.position):
+        cards_by_column[card.kanban_column_id].append(card)
+
     result = []
     for col in columns:
-        cards = (
-            KanbanCard.query
-            .filter_by(kanban_column_id=col.id)
-            .order_by(KanbanCard.position)
-            .all()
-        )
         result.append({
             "id": col.id,
             "title": col.title,
             "position": col.position,
             "created_at": col.created_at.isoformat() if col.created_at else None,
-            "cards": [_card_dict(c) for c in cards],
+            "cards": [_card_dict(c) for c in cards_by_column[col.id]],
         })
-    return jsonify(result)
+    body = current_app.json.dumps(result)
+    _board_cache = (version, body)
+    return current_app.response_class(body, mimetype="application/json")
 
 
 # ─── Column API ──────────────────────────────────────────────────
@@ -94,7 +130,7 @@ def api_board():
 @kanban_bp.route("/api/columns", methods=["POST"])
 @_kanban_api_auth
 def api_create_column():
-    data = request.get_json(force=True)
+    data = _read_json()
     max_pos = db.session.query(db.func.max(KanbanColumn.position)).scalar() or -1
     col = KanbanColumn(
         title=data.get("title", "New Column"),
@@ -102,6 +138,7 @@ def api_create_column():
     )
     db.session.add(col)
     db.session.commit()
+    _invalidate_board_cache()
     return jsonify({"id": col.id, "title": col.title, "position": col.position}), 201
 
 
@@ -111,12 +148,13 @@ def api_update_column(col_id):
     col = db.session.get(KanbanColumn, col_id)
     if not col:
         return jsonify({"error": "Column not found"}), 404
-    data = request.get_json(force=True)
+    data = _read_json()
     if "title" in data:
         col.title = data["title"]
     if "position" in data:
         col.position = data["position"]
     db.session.commit()
+    _invalidate_board_cache()
     return jsonify({"id": col.id, "title": col.title, "position": col.position})
 
 
@@ -127,18 +165,20 @@ def api_delete_column(col_id):
     if col:
         db.session.delete(col)
         db.session.commit()
+        _invalidate_board_cache()
     return jsonify({"success": True})
 
 
 @kanban_bp.route("/api/columns/reorder", methods=["PUT"])
 @_kanban_api_auth
 def api_reorder_columns():
-    data = request.get_json(force=True)
+    data = _read_json()
     for i, cid in enumerate(data.get("column_ids", [])):
         col = db.session.get(KanbanColumn, cid)
         if col:
             col.position = i
     db.session.commit()
+    _invalidate_board_cache()
     return jsonify({"success": True})
 
 
@@ -147,46 +187,68 @@ def api_reorder_columns():
 @kanban_bp.route("/api/cards", methods=["POST"])
 @_kanban_api_auth
 def api_create_card():
-    data = request.get_json(force=True)
+    data = _read_json()
     col_id = data["column_id"]
-    max_pos = (
-        db.session.query(db.func.max(KanbanCard.position))
-        .filter_by(kanban_column_id=col_id)
-        .scalar()
-    )
-    max_pos = max_pos if max_pos is not None else -1
-    next_num = (db.session.query(db.func.max(KanbanCard.card_number)).scalar() or 0) + 1
-    card = KanbanCard(
-        kanban_column_id=col_id,
-        card_number=next_num,
-        title=data.get("title", "New Card"),
-        description=data.get("description", ""),
-        position=max_pos + 1,
-        labels=json.dumps(data.get("labels", [])) if isinstance(data.get("labels"), list) else data.get("labels", "[]"),
-    )
-    db.session.add(card)
-    db.session.commit()
+    labels = _parse_labels(data.get("labels"))
+
+    # The card number comes from the kanban_card_num_seq sequence where the
+    # database has one. Without it (SQLite), it and the next position are
+    # computed inside the INSERT itself rather than read first; two creators
+    # racing for the same number still trip the unique constraint — retry
+    # those.
+    numbering = {}
+    if not db.session.get_bind().dialect.supports_sequences:
+        numbering["card_number"] = _next_card_number()
+
+    for attempt in range(3):
+        card = KanbanCard(
+            kanban_column_id=col_id,
+            title=data.get("title", "New Card"),
+            description=data.get("description", ""),
+            position=_next_card_position(col_id),
+            labels=labels,
+            **numbering,
+        )
+        db.session.add(card)
+        try:
+            db.session.commit()
+            break
+        except IntegrityError:
+            db.session.rollback()
+            if attempt == 2:
+                raise
+    _invalidate_board_cache()
     return jsonify(_card_dict(card)), 201
 
 
 @kanban_bp.route("/api/cards/<card_id>", methods=["PUT"])
 @_kanban_api_auth
 def api_update_card(card_id):
-    card = db.session.get(KanbanCard, card_id)
-    if not card:
-        return jsonify({"error": "Card not found"}), 404
-    data = request.get_json(force=True)
-    for key in ("title", "description", "kanban_column_id", "position"):
-        if key in data:
-            setattr(card, key, data[key])
+    data = _read_json()
+    values = {
+        key: data[key]
+        for key in ("title", "description", "kanban_column_id", "position")
+        if key in data
+    }
     if "column_id" in data:
-        card.kanban_column_id = data["column_id"]
+        values["kanban_column_id"] = data["column_id"]
     if "labels" in data:
-        val = data["labels"]
-        card.labels = json.dumps(val) if isinstance(val, list) else val
-    card.updated_at = datetime.now(timezone.utc)
+        values["labels"] = _parse_labels(data["labels"])
+
+    # One UPDATE ... RETURNING doubles as the existence check
+    card = db.session.execute(
+        db.update(KanbanCard)
+        .where(KanbanCard.id == card_id)
+        .values(**values)
+        .returning(KanbanCard)
+    ).scalar_one_or_none()
+    if not card:
+        return jsonify({"error": "Card not found"}), 404
+    # Serialize while the RETURNING values are loaded; commit expires them
+    payload = _card_dict(card)
     db.session.commit()
-    return jsonify(_card_dict(card))
+    _invalidate_board_cache()
+    return jsonify(payload)
 
 
 @kanban_bp.route("/api/cards/<card_id>", methods=["DELETE"])
@@ -196,21 +258,21 @@ def api_delete_card(card_id):
     if card:
         db.session.delete(card)
         db.session.commit()
+        _invalidate_board_cache()
     return jsonify({"success": True})
 
 
 @kanban_bp.route("/api/cards/reorder", methods=["PUT"])
 @_kanban_api_auth
 def api_reorder_cards():
-    data = request.get_json(force=True)
-    now = datetime.now(timezone.utc)
+    data = _read_json()
     for item in data.get("cards", []):
         card = db.session.get(KanbanCard, item["id"])
         if card:
             card.kanban_column_id = item["column_id"]
             card.position = item["position"]
-            card.updated_at = now
     db.session.commit()
+    _invalidate_board_cache()
     return jsonify({"success": True})
 
 
@@ -222,11 +284,7 @@ def api_get_comments(card_id):
     card = db.session.get(KanbanCard, card_id)
     if not card:
         return jsonify([])
-    try:
-        comments = json.loads(card.comments) if card.comments else []
-    except (json.JSONDecodeError, TypeError):
-        comments = []
-    return jsonify(comments)
+    return jsonify(card.comments or [])
 
 
 @kanban_bp.route("/api/cards/<card_id>/comments", methods=["POST"])
@@ -235,24 +293,20 @@ def api_add_comment(card_id):
     card = db.session.get(KanbanCard, card_id)
     if not card:
         return jsonify({"error": "Card not found"}), 404
-    data = request.get_json(force=True)
+    data = _read_json()
     text = data.get("text", "").strip()
     if not text:
         return jsonify({"error": "Comment text required"}), 400
 
-    try:
-        comments = json.loads(card.comments) if card.comments else []
-    except (json.JSONDecodeError, TypeError):
-        comments = []
-
-    comments.append({
+    now = datetime.now(timezone.utc)
+    # Assign a new list: the JSON column only notices replacement
+    card.comments = [*(card.comments or []), {
         "author": data.get("author", "Anonymous"),
         "text": text,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    })
-    card.comments = json.dumps(comments)
-    card.updated_at = datetime.now(timezone.utc)
+        "created_at": now.isoformat(),
+    }]
     db.session.commit()
+    _invalidate_board_cache()
     return jsonify({"success": True}), 201
 
 
@@ -261,7 +315,10 @@ def api_add_comment(card_id):
 @kanban_bp.route("/api/cards/<card_id>/create-prospect", methods=["POST"])
 @_kanban_api_auth
 def api_create_prospect(card_id):
-    card = db.session.get(KanbanCard, card_id)
+    # Lock the card row so two concurrent clicks can't both create a prospect
+    card = db.session.execute(
+        db.select(KanbanCard).where(KanbanCard.id == card_id).with_for_update()
+    ).scalar_one_or_none()
     if not card:
         return jsonify({"error": "Card not found"}), 404
     if card.prospect_id:
@@ -284,8 +341,11 @@ def api_create_prospect(card_id):
     db.session.add(prospect)
     db.session.flush()
 
-    card.prospect_id = prospect.id
-    card.updated_at = datetime.now(timezone.utc)
+    db.session.execute(
+        db.update(KanbanCard)
+        .where(KanbanCard.id == card.id)
+        .values(prospect_id=prospect.id)
+    )
 
     actor_id = current_user.id if current_user.is_authenticated else None
     db.session.add(AuditEvent(
@@ -300,6 +360,7 @@ def api_create_prospect(card_id):
     ))
 
     db.session.commit()
+    _invalidate_board_cache()
     return jsonify({
         "success": True,
         "prospect_id": prospect.id,
@@ -310,12 +371,52 @@ def api_create_prospect(card_id):
 
 # ─── Helpers ─────────────────────────────────────────────────────
 
+# Card descriptions are the largest payloads (markdown research briefs)
+MAX_JSON_BYTES = 256 * 1024
+
+
+def _read_json(max_bytes=MAX_JSON_BYTES):
+    """Parse the JSON body, rejecting oversized payloads before reading them."""
+    if (request.content_length or 0) > max_bytes:
+        abort(413)
+    return request.get_json(force=True) or {}
+
+
+def _parse_labels(value):
+    """Accept labels as a list or a JSON-encoded list string (older clients)."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def _next_card_number():
+    """SQL expression for the next global card number (inlined into the INSERT).
+
+    Only used on databases without sequences.
+    """
+    return db.select(
+        db.func.coalesce(db.func.max(KanbanCard.card_number), 0) + 1
+    ).scalar_subquery()
+
+
+def _next_card_position(col_id):
+    """SQL expression for the next position at the bottom of a column."""
+    return (
+        db.select(db.func.coalesce(db.func.max(KanbanCard.position), -1) + 1)
+        .where(KanbanCard.kanban_column_id == col_id)
+        .scalar_subquery()
+    )
+
+
 def _card_dict(card):
-    """Serialize a KanbanCard to a JSON-safe dict."""
-    try:
-        comments = json.loads(card.comments) if card.comments else []
-    except (json.JSONDecodeError, TypeError):
-        comments = []
+    """Serialize a KanbanCard to a JSON-safe dict.
+
+    labels goes out as a JSON-encoded string — the board JS and API bots
+    were built against the old text column and JSON.parse it.
+    """
     return {
         "id": card.id,
         "card_number": card.card_number,
@@ -323,8 +424,8 @@ def _card_dict(card):
         "title": card.title,
         "description": card.description or "",
         "position": card.position,
-        "labels": card.labels or "[]",
-        "comments": comments,
+        "labels": json.dumps(card.labels or []),
+        "comments": card.comments or [],
         "prospect_id": card.prospect_id,
         "created_at": card.created_at.isoformat() if card.created_at else None,
         "updated_at": card.updated_at.isoformat() if card.updated_at else None,
@@ -349,12 +450,17 @@ def _parse_card_markdown(description, card_title):
         "demo_url": None,
     }
 
+    # Cheap substring checks let plain-text descriptions skip the regexes
+    has_table = "|" in description
+    has_bold = "**" in description
+    has_http = "http" in description
+
     # --- Table format extraction ---
     table_patterns = {
         "contact_name": r"\|\s*Owner\s*\|\s*(.+?)\s*\|",
         "contact_phone": r"\|\s*Phone\s*\|\s*(.+?)\s*\|",
     }
-    for field, pattern in table_patterns.items():
+    for field, pattern in (table_patterns.items() if has_table else ()):
         m = re.search(pattern, description, re.IGNORECASE)
         if m:
             val = m.group(1).strip()
@@ -366,7 +472,7 @@ def _parse_card_markdown(description, card_title):
         "contact_name": r"\*\*Owner(?:/Decision Maker)?:\*\*\s*(.+)",
         "contact_phone": r"\*\*Phone:\*\*\s*(.+)",
     }
-    for field, pattern in bold_patterns.items():
+    for field, pattern in (bold_patterns.items() if has_bold else ()):
         if not result[field]:
             m = re.search(pattern, description)
             if m:
@@ -376,8 +482,8 @@ def _parse_card_markdown(description, card_title):
 
     # --- Email extraction ---
     email_patterns = [
-        r"\|\s*Email\s*\|\s*(.+?)\s*\|",
-        r"\*\*Email:\*\*\s*(\S+)",
+        *([r"\|\s*Email\s*\|\s*(.+?)\s*\|"] if has_table else []),
+        *([r"\*\*Email:\*\*\s*(\S+)"] if has_bold else []),
     ]
     for pattern in email_patterns:
         m = re.search(pattern, description, re.IGNORECASE)
@@ -393,7 +499,7 @@ def _parse_card_markdown(description, card_title):
         r"\[Facebook\]\((https?://(?:www\.)?facebook\.com/\S+?)\)",
         r"(https?://(?:www\.)?facebook\.com/[^\s\)|\]]+)",
     ]
-    for pattern in fb_patterns:
+    for pattern in (fb_patterns if has_http else ()):
         m = re.search(pattern, description)
         if m:
             result["source"] = "facebook"
@@ -401,7 +507,7 @@ def _parse_card_markdown(description, card_title):
             break
 
     # --- Source fallback: Google Maps URL ---
-    if result["source"] == "other":
+    if result["source"] == "other" and has_http:
         maps_patterns = [
             r"\|\s*Google Maps\s*\|\s*\[?(?:[^\]]*\]\()?(https?://(?:www\.)?google\.com/maps\S+?)[\s\)|\|]",
             r"(https?://(?:www\.)?google\.com/maps/\S+)",
@@ -418,7 +524,7 @@ def _parse_card_markdown(description, card_title):
         r"\*\*(?:Demo|Preview)\s*URL:\*\*\s*(\S+)",
         r"\|\s*(?:Demo|Preview)\s*(?:URL)?\s*\|\s*(\S+?)\s*\|",
     ]
-    for pattern in demo_patterns:
+    for pattern in (demo_patterns if has_http else ()):
         m = re.search(pattern, description, re.IGNORECASE)
         if m:
             val = m.group(1).strip()
@@ -432,14 +538,14 @@ def _parse_card_markdown(description, card_title):
 def _extract_business_name(description, card_title):
     """Get the business name from markdown or fall back to card title."""
     # Try table format: | Name | Value |
-    m = re.search(r"\|\s*Name\s*\|\s*(.+?)\s*\|", description)
+    m = "|" in description and re.search(r"\|\s*Name\s*\|\s*(.+?)\s*\|", description)
     if m:
         name = m.group(1).strip()
         if name and "NOT FOUND" not in name.upper():
             return name
 
     # Try bold format: **Business Name:** Value  or  **Business:** Value
-    m = re.search(r"\*\*Business(?: Name)?:\*\*\s*(.+)", description)
+    m = "**" in description and re.search(r"\*\*Business(?: Name)?:\*\*\s*(.+)", description)
     if m:
         name = m.group(1).strip()
         if name and "NOT FOUND" not in name.upper():
@@ -10,27 +10,35 @@ Ticket routes:
   POST /<site_slug>/tickets/<id>/reply — add reply to ticket thread
 """
 
+import hashlib
+import time
+
 from flask import (
     Blueprint,
     current_app,
     flash,
     g,
+    make_response,
     redirect,
     render_template,
     request,
+    session,
     url_for,
 )
 from flask_login import current_user
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy.orm import joinedload, raiseload
 
 from app.decorators import login_required_for_site
 from app.extensions import db
+from app.middleware.tenant import load_subscription, resolve_tenant
 from app.models.ticket import Ticket
 from app.models.workspace import WorkspaceMember
-from app.models.user import User
 from app.services import ticket_service
 from app.services.email_service import send_email
 
 portal_bp = Blueprint("portal", __name__)
+portal_bp.before_request(resolve_tenant)
 
 
 # ──────────────────────────────────────────────
@@ -58,21 +66,6 @@ def dashboard(site_slug):
     access = g.access_level
 
     # No subscription yet — show subscribe page
-    # But if they just came from checkout, re-check the DB fresh
-    # (the webhook may have arrived between the redirect and this request)
-    if access == "subscribe" and request.args.get("from") == "checkout":
-        from app.models.billing import BillingSubscription
-
-        fresh_sub = (
-            BillingSubscription.query.filter_by(workspace_id=g.workspace_id)
-            .order_by(BillingSubscription.created_at.desc())
-            .first()
-        )
-        if fresh_sub and fresh_sub.status in ("active", "trialing"):
-            g.subscription = fresh_sub
-            g.access_level = "full"
-            access = "full"
-
     if access == "subscribe":
         return render_template("portal/subscribe.html")
 
@@ -80,33 +73,133 @@ def dashboard(site_slug):
     if access == "blocked":
         return render_template("portal/suspended.html")
 
-    # Full or read_only — show dashboard
-    recent_tickets = (
-        Ticket.query.filter_by(workspace_id=g.workspace_id)
-        .order_by(Ticket.last_activity_at.desc())
-        .limit(5)
+    load_subscription()
+
+    # Workspace team members — users arrive in the same JOIN
+    members = (
+        WorkspaceMember.query
+        .options(
+            joinedload(WorkspaceMember.user).options(*_strict_loading()),
+            *_strict_loading(),
+        )
+        .filter_by(workspace_id=g.workspace_id)
         .all()
     )
+    team_members = [{"user": m.user, "member": m} for m in members if m.user]
 
-    # Workspace team members - batch fetch all users at once
-    members = WorkspaceMember.query.filter_by(workspace_id=g.workspace_id).all()
-    user_ids = [m.user_id for m in members]
-    users = (
-        {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()}
-        if user_ids
-        else {}
+    etag = _page_etag(
+        [(m.user_id, m.role, m.user.updated_at) for m in members if m.user],
     )
-    team_members = [
-        {"user": users.get(m.user_id), "member": m}
-        for m in members
-        if users.get(m.user_id)
-    ]
+    if etag is not None and etag in request.if_none_match:
+        return _not_modified(etag)
 
-    return render_template(
+    # Full or read_only — show dashboard
+    # Latest 5 tickets plus workspace-wide totals in one round-trip — the
+    # window aggregates are computed over every ticket before the LIMIT.
+    rows = db.session.execute(
+        db.select(
+            Ticket,
+            db.func.count().over().label("total"),
+            db.func.sum(
+                db.case((Ticket.status != "done", 1), else_=0)
+            ).over().label("open"),
+        )
+        .options(*_strict_loading())
+        .where(Ticket.workspace_id == g.workspace_id)
+        .order_by(Ticket.last_activity_at.desc())
+        .limit(5)
+    ).all()
+    recent_tickets = [row.Ticket for row in rows]
+    ticket_counts = {
+        "total": rows[0].total if rows else 0,
+        "open": rows[0].open if rows else 0,
+    }
+
+    return _with_etag(etag, render_template(
         "portal/dashboard.html",
         recent_tickets=recent_tickets,
+        ticket_counts=ticket_counts,
         team_members=team_members,
+    ))
+
+
+# ─── Conditional GET ───
+# The dashboard and ticket list are re-requested far more often than they
+# change. Both pages are a function of the rows fingerprinted below, so a
+# browser revalidating with If-None-Match gets a 304 without the page's
+# ticket queries or template render. Pages with pending flash messages
+# are always rendered (the flash is consumed by the render). The session's
+# CSRF secret is fingerprinted, so a cached copy's embedded CSRF tokens
+# always belong to the current session, and the time bucket keeps them
+# well inside their one-hour lifetime — a deploy's template changes show
+# up within half an hour.
+
+_ETAG_MAX_AGE_SECONDS = 1800
+
+
+def _page_etag(*extra):
+    """ETag for the current tenant page, or None if it must be rendered.
+
+    Fingerprints the user and their session's CSRF secret, the tenant
+    rows on g (including the subscription, on pages that loaded it), the
+    workspace's ticket count + latest ticket change (one index-covered
+    aggregate) and any page-specific `extra` values.
+    """
+    if session.get("_flashes"):
+        return None
+    # Creates the session's CSRF secret first if this is its first form
+    generate_csrf()
+    csrf_secret = session.get(current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token"))
+
+    ticket_count, tickets_changed = db.session.execute(
+        db.select(db.func.count(), db.func.max(Ticket.updated_at))
+        .where(Ticket.workspace_id == g.workspace_id)
+    ).one()
+    sub = g.get("subscription")
+    parts = (
+        request.full_path,
+        current_user.id,
+        current_user.updated_at,
+        csrf_secret,
+        g.workspace.name,
+        g.site.id,
+        g.site.updated_at,
+        g.access_level,
+        sub.id if sub else None,
+        sub.updated_at if sub else None,
+        ticket_count,
+        tickets_changed,
+        int(time.time() // _ETAG_MAX_AGE_SECONDS),
+        extra,
     )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _not_modified(etag):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _with_etag(etag, body):
+    response = make_response(body)
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _strict_loading():
+    """Loader options that make lazy loads raise in debug/testing.
+
+    The dashboard loads everything it renders up front; raiseload turns any
+    accidental per-row lazy load (N+1) into an error during development
+    instead of silent extra queries in production.
+    """
+    if current_app.debug or current_app.testing:
+        return (raiseload("*"),)
+    return ()
 
 
 # ──────────────────────────────────────────────
@@ -122,15 +215,19 @@ def ticket_list(site_slug):
     Accessible at all access levels (full, read_only, blocked)
     so clients can always view existing tickets.
     """
+    etag = _page_etag()
+    if etag is not None and etag in request.if_none_match:
+        return _not_modified(etag)
+
     status_filter = request.args.get("status")
     tickets = ticket_service.list_tickets_for_workspace(
         g.workspace_id, status_filter=status_filter
     )
-    return render_template(
+    return _with_etag(etag, render_template(
         "portal/tickets/list.html",
         tickets=tickets,
         status_filter=status_filter,
-    )
+    ))
 
 
 @portal_bp.route("/<site_slug>/tickets/new", methods=["GET", "POST"])
@@ -181,14 +278,14 @@ def ticket_new(site_slug):
                 )
                 ticket_service.add_attachments(ticket.id, msg.id, uploaded_files)
 
-            db.session.commit()
-
-            # Email notification to admin
+            # Email notification to admin — built before the commit, which
+            # expires every loaded row and would cost a re-SELECT per object
+            ticket_id = ticket.id
             admin_email = current_app.config.get(
                 "MAIL_CONTACT_TO", "info@belvieudigital.com"
             )
             base_url = current_app.config["APP_BASE_URL"]
-            send_email(
+            notification = dict(
                 to=admin_email,
                 subject=f"New ticket from {g.workspace.name}: {subject}",
                 template="emails/ticket_new_notification.html",
@@ -199,15 +296,18 @@ def ticket_new(site_slug):
                     "workspace_name": g.workspace.name,
                     "author_name": current_user.full_name,
                     "author_email": current_user.email,
-                    "ticket_url": f"{base_url}/admin/tickets/{ticket.id}",
+                    "ticket_url": f"{base_url}/admin/tickets/{ticket_id}",
                 },
                 reply_to=current_user.email,
             )
 
+            db.session.commit()
+            send_email(**notification)
+
             flash("Ticket created successfully.", "success")
             return redirect(
                 url_for(
-                    "portal.ticket_detail", site_slug=site_slug, ticket_id=ticket.id
+                    "portal.ticket_detail", site_slug=site_slug, ticket_id=ticket_id
                 )
             )
         except ValueError as e:
@@ -258,12 +358,6 @@ def ticket_reply(site_slug, ticket_id):
             url_for("portal.ticket_detail", site_slug=site_slug, ticket_id=ticket_id)
         )
 
-    # Verify ticket belongs to this workspace
-    ticket = db.session.get(Ticket, ticket_id)
-    if ticket is None or ticket.workspace_id != g.workspace_id:
-        flash("Ticket not found.", "error")
-        return redirect(url_for("portal.ticket_list", site_slug=site_slug))
-
     message = request.form.get("message", "").strip()
     uploaded_files = request.files.getlist("attachments")
     uploaded_files = [f for f in uploaded_files if f and f.filename]
@@ -275,24 +369,26 @@ def ticket_reply(site_slug, ticket_id):
         )
 
     try:
+        # Scoped to this workspace — a foreign ticket id is "not found"
         msg = ticket_service.add_message(
             ticket_id=ticket_id,
             user_id=current_user.id,
             message=message or "(attached files)",
             is_internal=False,  # client replies are never internal
+            workspace_id=g.workspace_id,
         )
+        ticket = msg.ticket
 
         if uploaded_files:
             ticket_service.add_attachments(ticket_id, msg.id, uploaded_files)
 
-        db.session.commit()
-
-        # Email notification to admin
+        # Email notification to admin — built before the commit expires
+        # the loaded rows
         admin_email = current_app.config.get(
             "MAIL_CONTACT_TO", "info@belvieudigital.com"
         )
         base_url = current_app.config["APP_BASE_URL"]
-        send_email(
+        notification = dict(
             to=admin_email,
             subject=f"Reply from {g.workspace.name}: {ticket.subject}",
             template="emails/ticket_reply_to_admin.html",
@@ -307,7 +403,13 @@ def ticket_reply(site_slug, ticket_id):
             reply_to=current_user.email,
         )
 
+        db.session.commit()
+        send_email(**notification)
+
         flash("Reply added.", "success")
+    except ticket_service.TicketNotFound as e:
+        flash(str(e), "error")
+        return redirect(url_for("portal.ticket_list", site_slug=site_slug))
     except ValueError as e:
         flash(str(e), "error")
 
@@ -8,7 +8,12 @@ import logging
 
 from flask import Blueprint, request, jsonify
 
-from app.services.stripe_service import verify_webhook_signature, handle_webhook_event
+from app.services import background_service
+from app.services.stripe_service import (
+    process_stripe_event,
+    record_webhook_event,
+    verify_webhook_signature,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +22,18 @@ webhooks_bp = Blueprint("webhooks", __name__, url_prefix="/stripe")
 
 @webhooks_bp.route("/webhooks", methods=["POST"])
 def stripe_webhook():
-    """Receive and process Stripe webhook events.
+    """Receive Stripe webhook events.
 
     1. Get raw body (required for signature verification)
     2. Verify signature with STRIPE_WEBHOOK_SECRET
-    3. Pass to handle_webhook_event (idempotent via stripe_events table)
-    4. Return 200 to acknowledge receipt
+    3. Record the event in stripe_events (idempotent — retries of an
+       event that is processed or already queued return 200 immediately;
+       only a failed event is re-run)
+    4. Hand processing off to the background runner and return 200
+
+    Stripe only waits for the signature check and one INSERT; handler DB
+    writes and Stripe API calls happen after the response. Failed events
+    stay in stripe_events for `flask process-stripe-events` to retry.
 
     CSRF is exempted for this blueprint in create_app().
     """
@@ -40,9 +51,18 @@ def stripe_webhook():
         logger.warning(f"Webhook signature verification failed: {e}")
         return jsonify({"error": "Invalid signature"}), 400
 
-    # --- Process event (idempotent) ---
-    success, message = handle_webhook_event(event)
+    # --- Record event (idempotent) ---
+    if not record_webhook_event(event, payload):
+        logger.info(f"Duplicate webhook event {event['id']}, skipping")
+        return jsonify({"status": "already_processed"}), 200
+
+    # --- Process in the background ---
+    future = background_service.submit(process_stripe_event, event["id"])
+    if not future.done():
+        return jsonify({"status": "queued"}), 200
 
+    # Ran inline (TASKS_ALWAYS_EAGER) — report the outcome
+    success, message = future.result()
     if success:
         return jsonify({"status": message}), 200
     else:
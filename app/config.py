@@ -1,5 +1,12 @@
 import os
 
+from sqlalchemy.pool import NullPool
+
+
+def _is_truthy(value):
+    """Parse an on/off env var value ("1", "true", "yes" → True)."""
+    return (value or "").lower() in ("1", "true", "yes")
+
 
 class Config:
     """Base configuration. Shared across all environments."""
@@ -21,11 +28,13 @@ class Config:
     STRIPE_PUBLISHABLE_KEY = os.environ.get("STRIPE_PUBLISHABLE_KEY")
     APP_BASE_URL = os.environ.get("APP_BASE_URL", "http://localhost:5000")
 
+    # Hard ceiling on request bodies — roomy enough for a ticket with several
+    # 10 MB attachments; per-endpoint JSON limits are tighter.
+    MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 50 * 1024 * 1024))
+
     # --- Promo pricing ---
     # When True, the $250 setup fee is waived site-wide (Stripe, UI, emails).
-    PROMO_NO_SETUP_FEE = os.environ.get(
-        "PROMO_NO_SETUP_FEE", ""
-    ).lower() in ("1", "true", "yes")
+    PROMO_NO_SETUP_FEE = _is_truthy(os.environ.get("PROMO_NO_SETUP_FEE"))
 
     # --- Email (Google Workspace SMTP) ---
     MAIL_SMTP_HOST = os.environ.get("MAIL_SMTP_HOST", "smtp.gmail.com")
@@ -35,6 +44,40 @@ class Config:
     MAIL_FROM_NAME = os.environ.get("MAIL_FROM_NAME", "Belvieu Digital")
     MAIL_FROM_ADDRESS = os.environ.get("MAIL_FROM_ADDRESS")  # defaults to MAIL_USERNAME
     MAIL_CONTACT_TO = os.environ.get("MAIL_CONTACT_TO", "info@belvieudigital.com")
+    # Logged-in SMTP connections kept open per process and reused
+    MAIL_POOL_MAX_CONNECTIONS = int(os.environ.get("MAIL_POOL_MAX_CONNECTIONS", 5))
+    MAIL_POOL_MAX_MESSAGES_PER_CONN = int(os.environ.get("MAIL_POOL_MAX_MESSAGES_PER_CONN", 100))
+
+    # --- Background tasks ---
+    # Threads per worker process: webhook processing / notification email
+    BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS", 4))
+    EMAIL_WORKERS = int(os.environ.get("EMAIL_WORKERS", 2))
+    TASKS_ALWAYS_EAGER = False
+
+    # --- Rate limiting ---
+    # With REDIS_URL set, every gunicorn worker counts against one shared
+    # budget; without it each worker keeps its own in-memory counters
+    # (fine for dev/test). If Redis is unreachable, limits fall back to
+    # memory rather than failing requests.
+    RATELIMIT_STORAGE_URI = os.environ.get("REDIS_URL") or "memory://"
+    RATELIMIT_STORAGE_OPTIONS = {
+        "max_connections": int(os.environ.get("REDIS_MAX_CONNECTIONS", 10)),
+    } if os.environ.get("REDIS_URL") else {}
+    RATELIMIT_STRATEGY = "moving-window"
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+
+    # --- Tenant resolution ---
+    # Seconds a confirmed workspace membership is trusted without a query
+    MEMBERSHIP_CACHE_TTL = int(os.environ.get("MEMBERSHIP_CACHE_TTL", 120))
+
+    # --- Form relay ---
+    # Extra hosts the relay may redirect to after a submission, on top of
+    # the submitting site's own published URL / custom domain.
+    ALLOWED_REDIRECT_HOSTS = frozenset(
+        h.strip().lower()
+        for h in os.environ.get("ALLOWED_REDIRECT_HOSTS", "").split(",")
+        if h.strip()
+    )
 
     # --- Kanban API (bot access) ---
     KANBAN_API_KEY = os.environ.get("KANBAN_API_KEY")
@@ -53,7 +96,7 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_pre_ping": True,
-        "pool_recycle": 300,
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 300)),
     }
 
     # --- Session / cookies ---
@@ -77,9 +120,7 @@ class Config:
             "APP_BASE_URL",
         ]
         # Setup price ID is only required when promo is OFF
-        promo_on = os.environ.get(
-            "PROMO_NO_SETUP_FEE", ""
-        ).lower() in ("1", "true", "yes")
+        promo_on = _is_truthy(os.environ.get("PROMO_NO_SETUP_FEE"))
         if not promo_on:
             required.append("STRIPE_SETUP_PRICE_ID")
         missing = [v for v in required if not os.environ.get(v)]
@@ -113,6 +154,7 @@ class TestConfig(Config):
     PROMO_NO_SETUP_FEE = False  # default off in tests; override per-test as needed
     WTF_CSRF_ENABLED = False  # disable CSRF for test forms
     RATELIMIT_ENABLED = False  # disable rate limiting in tests
+    TASKS_ALWAYS_EAGER = True  # run background tasks inline so tests see results
     SESSION_COOKIE_SECURE = False
     REMEMBER_COOKIE_SECURE = False
     SERVER_NAME = "localhost"
@@ -130,15 +172,32 @@ class ProdConfig(Config):
     SESSION_COOKIE_SECURE = True
     REMEMBER_COOKIE_SECURE = True
 
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        **Config.SQLALCHEMY_ENGINE_OPTIONS,
-        "pool_size": 5,
-        "max_overflow": 10,
-        "pool_timeout": 30,
-        "connect_args": {
-            "options": "-c statement_timeout=10000",
-        },
-    }
+    _connect_args = {"options": "-c statement_timeout=10000"}
+
+    # Behind Supabase's transaction pooler the server already pools, so a
+    # second client-side pool only holds idle connections — DB_NULLPOOL=true
+    # opens one per checkout instead.
+    if _is_truthy(os.environ.get("DB_NULLPOOL")):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "poolclass": NullPool,
+            "connect_args": _connect_args,
+        }
+    else:
+        # Sized per gunicorn worker: one connection for the (sync) request
+        # thread plus one per background task thread, so a burst of webhook
+        # processing never leaves a request waiting on pool_timeout. LIFO
+        # checkout keeps the hot connections busy and lets the rest idle
+        # out through pool_recycle.
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            **Config.SQLALCHEMY_ENGINE_OPTIONS,
+            "pool_size": int(
+                os.environ.get("DB_POOL_SIZE") or 1 + Config.BACKGROUND_WORKERS
+            ),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW") or 10),
+            "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT") or 30),
+            "pool_use_lifo": True,
+            "connect_args": _connect_args,
+        }
 
 
 config_by_name = {
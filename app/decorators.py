@@ -6,11 +6,49 @@ Custom route decorators for access control.
 - admin_required: ensures user is logged in AND has is_admin=True.
 """
 
+import threading
+import time
 from functools import wraps
 
-from flask import abort, g
+from flask import abort, current_app, g
 from flask_login import current_user, login_required
 
+from app.models.workspace import WorkspaceMember
+
+
+# ─── Membership cache ───
+# (user_id, workspace_id) → expires_at, for confirmed memberships only.
+# Memberships are only ever added by the app (invite acceptance), so a
+# cached "yes" can only go stale if a row is deleted out-of-band — the TTL
+# bounds that. Misses are never cached, so new members get in immediately.
+
+_membership_cache = {}
+_membership_cache_lock = threading.Lock()
+_MEMBERSHIP_CACHE_MAX_ENTRIES = 4096
+
+
+def _is_member(user_id, workspace_id):
+    key = (user_id, workspace_id)
+    now = time.monotonic()
+    expires_at = _membership_cache.get(key)
+    if expires_at is not None and expires_at > now:
+        return True
+
+    membership = WorkspaceMember.query.filter_by(
+        user_id=user_id,
+        workspace_id=workspace_id,
+    ).first()
+    if membership is None:
+        return False
+
+    ttl = current_app.config.get("MEMBERSHIP_CACHE_TTL", 0)
+    if ttl:
+        with _membership_cache_lock:
+            if len(_membership_cache) >= _MEMBERSHIP_CACHE_MAX_ENTRIES:
+                _membership_cache.clear()
+            _membership_cache[key] = now + ttl
+    return True
+
 
 def login_required_for_site(f):
     """Require login + workspace membership for the current site_slug."""
@@ -22,16 +60,8 @@ def login_required_for_site(f):
         if not hasattr(g, "workspace_id") or g.workspace_id is None:
             abort(404)
 
-        # Dual check: verify membership exists (imported lazily to avoid
-        # circular imports -- models aren't defined yet in Phase 0)
-        from app.models.workspace import WorkspaceMember
-
-        membership = WorkspaceMember.query.filter_by(
-            user_id=current_user.id,
-            workspace_id=g.workspace_id,
-        ).first()
-
-        if membership is None:
+        # Dual check: verify membership exists
+        if not _is_member(current_user.id, g.workspace_id):
             abort(403)
 
         return f(*args, **kwargs)
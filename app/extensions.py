@@ -10,6 +10,7 @@ from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from sqlalchemy.orm import load_only
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -18,8 +19,7 @@ csrf = CSRFProtect()
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=[],  # No global limit — we apply per-route
-    storage_uri="memory://",
-)
+)  # storage / strategy come from RATELIMIT_* config
 
 # Flask-Login config
 login_manager.login_view = "auth.login"
@@ -29,7 +29,23 @@ login_manager.login_message_category = "info"
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID from session. Imports lazily to avoid circular deps."""
+    """Load user by ID from session. Imports lazily to avoid circular deps.
+
+    Runs on every authenticated request, so only the columns current_user
+    is read for (auth checks, nav, notifications, page ETags) are loaded;
+    the password hash and reset-token columns load on first access.
+    """
     from app.models.user import User
 
-    return User.query.get(user_id)
+    return db.session.get(
+        User,
+        user_id,
+        options=[load_only(
+            User.id,
+            User.email,
+            User.full_name,
+            User.is_admin,
+            User.is_active,
+            User.updated_at,
+        )],
+    )
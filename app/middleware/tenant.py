@@ -1,50 +1,55 @@
 """Tenant middleware — resolves site_slug to workspace context.
 
-Runs before every request to portal routes (/<site_slug>/*).
-Sets g.workspace_id, g.workspace, g.site, g.subscription, g.access_level.
+Runs before every request to the tenant-scoped blueprints (portal and
+billing — every route under /<site_slug>/*).
+Sets g.workspace_id, g.workspace, g.site, g.access_level.
 
-Access levels (computed from billing_subscriptions.status):
+Access levels (workspaces.access_level, mirrored from the newest
+billing_subscriptions.status on every flush that writes a subscription):
     "full"       — active or trialing subscription
     "read_only"  — past_due (grace period)
     "blocked"    — canceled, unpaid, incomplete_expired
     "subscribe"  — no subscription exists yet
+
+The subscription row itself is only needed by the pages that show plan
+details; they call load_subscription() to put it on g.subscription.
 """
 
 from flask import abort, g, request
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager
 
 from app.extensions import db
 from app.models.site import Site
-from app.models.billing import BillingSubscription
-from app.models.workspace import Workspace
+from app.services.billing_service import get_latest_subscription
+
+
+def _load_site(site_slug):
+    """Site + workspace (with its access level) in one query.
+
+    populate_existing: the access level must come from this read even if
+    the session already holds the rows from earlier in its life.
+    """
+    return db.session.scalars(
+        db.select(Site)
+        .join(Site.workspace)
+        .options(contains_eager(Site.workspace))
+        .where(Site.site_slug == site_slug)
+        .execution_options(populate_existing=True)
+    ).first()
 
 
 def resolve_tenant():
-    """Before-request hook for portal routes.
+    """Before-request hook for tenant-scoped blueprints.
 
-    Extracts site_slug from the URL, loads the workspace context,
-    and computes the access level from subscription status.
+    Extracts site_slug from the URL and loads the site, its workspace and
+    the workspace's access level.
 
-    Only runs on routes that have a `site_slug` URL parameter.
-    Skips static files, auth routes, admin routes, and webhooks.
+    Registered on the portal and billing blueprints rather than the app,
+    so it only fires on their matched routes — all of which carry a
+    `site_slug` URL parameter. Static, auth, admin and webhook traffic
+    never reaches it.
     """
-    if request.view_args is None:
-        return
-    site_slug = request.view_args.get("site_slug")
-    if site_slug is None:
-        return
-
-    path = request.path
-    if path.startswith(("/static/", "/auth/", "/admin/", "/stripe/")):
-        return
-
-    # Single query: load site + workspace in one JOIN
-    site = (
-        Site.query
-        .options(joinedload(Site.workspace))
-        .filter_by(site_slug=site_slug)
-        .first()
-    )
+    site = _load_site(request.view_args["site_slug"])
     if site is None:
         abort(404)
 
@@ -53,27 +58,12 @@ def resolve_tenant():
     g.site = site
     g.workspace = workspace
     g.workspace_id = workspace.id
+    g.access_level = workspace.access_level
+
 
-    # Subscription query (still needed, but just 1 query)
-    subscription = (
-        BillingSubscription.query
-        .filter_by(workspace_id=workspace.id)
-        .order_by(BillingSubscription.created_at.desc())
-        .first()
-    )
-
-    g.subscription = subscription
-
-    if subscription is None:
-        g.access_level = "subscribe"
-    elif subscription.status in ("active", "trialing"):
-        g.access_level = "full"
-    elif subscription.status == "past_due":
-        g.access_level = "read_only"
-    else:
-        g.access_level = "blocked"
-
-
-def init_tenant_middleware(app):
-    """Register the tenant resolver as a before_request hook."""
-    app.before_request(resolve_tenant)
+def load_subscription():
+    """Put the workspace's newest BillingSubscription (or None) on
+    g.subscription, loading it at most once per request."""
+    if "subscription" not in g:
+        g.subscription = get_latest_subscription(g.workspace_id)
+    return g.subscription
@@ -2,22 +2,26 @@
 
 - BillingCustomer: links a workspace to a Stripe customer ID.
 - BillingSubscription: tracks subscription state synced from Stripe webhooks.
-  billing_subscriptions.status is the source of truth for entitlement gating.
+  billing_subscriptions.status is the source of truth for entitlement gating;
+  the newest row's status is mirrored onto workspaces.access_level on flush.
 """
 
-import uuid
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.extensions import db
+from app.models.mixins import CreatedAt, Timestamps, UUIDPrimaryKey
+from app.models.types import UUIDString
 
 
-class BillingCustomer(db.Model):
+class BillingCustomer(UUIDPrimaryKey, CreatedAt, db.Model):
     __tablename__ = "billing_customers"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     workspace_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("workspaces.id"),
         unique=True,
         nullable=False,
@@ -25,9 +29,6 @@ class BillingCustomer(db.Model):
     stripe_customer_id = db.Column(
         db.String(255), unique=True, nullable=False
     )
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
 
     # --- Relationships ---
     workspace = db.relationship("Workspace", back_populates="billing_customer")
@@ -36,7 +37,7 @@ class BillingCustomer(db.Model):
         return f"<BillingCustomer stripe={self.stripe_customer_id}>"
 
 
-class BillingSubscription(db.Model):
+class BillingSubscription(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "billing_subscriptions"
 
     # -- Valid statuses (synced from Stripe) --
@@ -49,11 +50,8 @@ class BillingSubscription(db.Model):
         "incomplete_expired",
     ]
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     workspace_id = db.Column(
-        db.String(36), db.ForeignKey("workspaces.id"), nullable=False
+        UUIDString, db.ForeignKey("workspaces.id"), nullable=False
     )
     stripe_subscription_id = db.Column(
         db.String(255), unique=True, nullable=False
@@ -67,13 +65,10 @@ class BillingSubscription(db.Model):
         db.DateTime(timezone=True), nullable=True
     )
     cancel_at_period_end = db.Column(db.Boolean, default=False)
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
+
+    # Tenant middleware: a workspace's newest subscription
+    __table_args__ = (
+        db.Index("ix_billing_subscriptions_workspace_created", "workspace_id", "created_at"),
     )
 
     # --- Relationships ---
@@ -83,3 +78,64 @@ class BillingSubscription(db.Model):
 
     def __repr__(self):
         return f"<BillingSubscription {self.plan} ({self.status})>"
+
+
+def latest_access_level_expr(workspace_id):
+    """SQL expression: access level implied by the workspace's newest
+    subscription (or "subscribe" if it has none).
+
+    Access levels:
+        "full"       — active or trialing
+        "read_only"  — past_due (grace period)
+        "blocked"    — canceled, unpaid, incomplete_expired
+        "subscribe"  — no subscription exists yet
+    """
+    status = BillingSubscription.status
+    latest = (
+        db.select(
+            db.case(
+                (status.in_(("active", "trialing")), "full"),
+                (status == "past_due", "read_only"),
+                else_="blocked",
+            )
+        )
+        .where(BillingSubscription.workspace_id == workspace_id)
+        .order_by(BillingSubscription.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return db.func.coalesce(latest, "subscribe")
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_workspace_access_level(session, flush_context):
+    """Recompute workspaces.access_level for every workspace whose
+    subscriptions this flush wrote, in the same transaction.
+
+    Covers every writer (webhooks, checkout sync, admin, scripts) without
+    each one having to remember. Workspaces already loaded in the session
+    get the new value set in place.
+    """
+    workspace_ids = {
+        obj.workspace_id
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, BillingSubscription) and obj.workspace_id
+    }
+    if not workspace_ids:
+        return
+
+    from app.models.workspace import Workspace
+
+    workspaces = Workspace.__table__
+    rows = session.connection().execute(
+        db.update(workspaces)
+        .where(workspaces.c.id.in_(workspace_ids))
+        .values(access_level=latest_access_level_expr(workspaces.c.id))
+        .returning(workspaces.c.id, workspaces.c.access_level)
+    )
+    for workspace_id, access_level in rows:
+        workspace = session.identity_map.get(
+            session.identity_key(Workspace, workspace_id)
+        )
+        if workspace is not None:
+            set_committed_value(workspace, "access_level", access_level)
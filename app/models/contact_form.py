@@ -8,55 +8,63 @@ where to forward the email.
 """
 
 import secrets
-import uuid
+from functools import lru_cache
+
+from sqlalchemy.orm import validates
 
 from app.extensions import db
+from app.models.mixins import Timestamps, UUIDPrimaryKey
+from app.models.types import URLSafeToken, UUIDString
+
+
+@lru_cache(maxsize=1024)
+def _split_recipients(recipient_emails):
+    """Parse a stored recipient string once per distinct value."""
+    return tuple(e.strip() for e in recipient_emails.split(",") if e.strip())
 
 
-class ContactFormConfig(db.Model):
+class ContactFormConfig(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "contact_form_configs"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     site_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("sites.id"),
         unique=True,
         nullable=False,
     )
     access_key = db.Column(
-        db.String(100), unique=True, nullable=False
-    )
+        URLSafeToken, unique=True, nullable=False
+    )  # base64url text in Python, raw bytes in the table
     recipient_emails = db.Column(
         db.Text, nullable=False
-    )  # comma-separated emails, e.g. "owner@biz.com,manager@biz.com"
+    )  # comma-separated emails, e.g. "owner@biz.com, manager@biz.com"
     is_enabled = db.Column(db.Boolean, default=True, nullable=False)
 
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
-    )
-
     # --- Relationships ---
     site = db.relationship("Site", backref=db.backref("contact_form_config", uselist=False))
 
     @staticmethod
     def generate_access_key():
-        """Generate a secure access key (~64-char base64 string)."""
-        return secrets.token_urlsafe(48)
+        """Generate a secure access key (43-char base64url string, 32 bytes)."""
+        return secrets.token_urlsafe(32)
+
+    @validates("recipient_emails")
+    def _normalize_recipient_emails(self, key, value):
+        """Store recipients stripped, lowercased and de-duplicated."""
+        if not value:
+            return value
+        emails = dict.fromkeys(e.lower() for e in _split_recipients(value))
+        return ", ".join(emails)
 
     def get_recipient_list(self):
-        """Return recipient_emails as a cleaned list."""
+        """Return recipient_emails as a cleaned list.
+
+        The parse is cached per stored value, so the relay hot path doesn't
+        re-split the same string on every submission.
+        """
         if not self.recipient_emails:
             return []
-        return [
-            e.strip() for e in self.recipient_emails.split(",") if e.strip()
-        ]
+        return list(_split_recipients(self.recipient_emails))
 
     def __repr__(self):
         return f"<ContactFormConfig site_id={self.site_id} enabled={self.is_enabled}>"
@@ -5,23 +5,24 @@ workspace + site. Client registers by visiting the invite URL.
 Tokens are one-time-use with 30-day expiration.
 """
 
-import uuid
-from datetime import datetime, timezone
+from datetime import timezone
+
+from sqlalchemy.ext.hybrid import hybrid_property
 
 from app.extensions import db
+from app.utils.clock import request_now
+from app.models.mixins import CreatedAt, UUIDPrimaryKey
+from app.models.types import UUIDString
 
 
-class WorkspaceInvite(db.Model):
+class WorkspaceInvite(UUIDPrimaryKey, CreatedAt, db.Model):
     __tablename__ = "workspace_invites"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     workspace_id = db.Column(
-        db.String(36), db.ForeignKey("workspaces.id"), nullable=False
+        UUIDString, db.ForeignKey("workspaces.id"), nullable=False
     )
     site_id = db.Column(
-        db.String(36), db.ForeignKey("sites.id"), nullable=False
+        UUIDString, db.ForeignKey("sites.id"), nullable=False
     )
     email = db.Column(
         db.String(255), nullable=True
@@ -35,33 +36,62 @@ class WorkspaceInvite(db.Model):
     used_at = db.Column(
         db.DateTime(timezone=True), nullable=True
     )  # set when consumed during registration
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
+
+    # Only unused invites are ever looked up by workspace (latest open
+    # invite, reminder sweep), so the index skips consumed ones. On
+    # Postgres it also carries token and expires_at, so those lookups
+    # (which only read the token and check expiry) are index-only.
+    __table_args__ = (
+        db.Index(
+            "ix_workspace_invites_open",
+            "workspace_id",
+            "created_at",
+            postgresql_include=["token", "expires_at"],
+            postgresql_where=db.text("used_at IS NULL"),
+            sqlite_where=db.text("used_at IS NULL"),
+        ),
     )
 
     # --- Relationships ---
     workspace = db.relationship("Workspace", back_populates="invites")
     site = db.relationship("Site", back_populates="invites")
 
-    @property
+    # The hybrids below also work as SQL predicates, e.g.
+    # WorkspaceInvite.query.filter(WorkspaceInvite.is_valid), so lookups
+    # can pick a usable invite in the query (against the database clock)
+    # instead of fetching rows and checking them in Python.
+
+    @hybrid_property
     def is_expired(self):
         """Check if the invite has expired."""
-        now = datetime.now(timezone.utc)
+        now = request_now()
         expires = self.expires_at
         # SQLite returns naive datetimes; Postgres returns aware ones.
         if expires.tzinfo is None:
             expires = expires.replace(tzinfo=timezone.utc)
         return now > expires
 
-    @property
+    @is_expired.expression
+    def is_expired(cls):
+        return cls.expires_at <= db.func.now()
+
+    @hybrid_property
     def is_used(self):
         """Check if the invite has already been consumed."""
         return self.used_at is not None
 
-    @property
+    @is_used.expression
+    def is_used(cls):
+        return cls.used_at.is_not(None)
+
+    @hybrid_property
     def is_valid(self):
         """Check if the invite can still be used."""
         return not self.is_expired and not self.is_used
 
+    @is_valid.expression
+    def is_valid(cls):
+        return db.and_(cls.used_at.is_(None), cls.expires_at > db.func.now())
+
     def __repr__(self):
         return f"<WorkspaceInvite token={self.token[:8]}... workspace={self.workspace_id}>"
@@ -4,21 +4,19 @@ Provides columns (lanes) and cards for the internal research pipeline.
 Cards hold markdown research briefs and can be linked to Prospects.
 """
 
-import uuid
-
 from app.extensions import db
+from app.models.mixins import Timestamps, UUIDPrimaryKey
+from app.models.types import JSONDocument, UUIDString
 
 
-class KanbanColumn(db.Model):
+class KanbanColumn(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "kanban_columns"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     title = db.Column(db.String(255), nullable=False)
     position = db.Column(db.Integer, nullable=False, default=0)
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
+
+    __table_args__ = (
+        db.Index("ix_kanban_columns_position", "position"),
     )
 
     cards = db.relationship(
@@ -33,35 +31,34 @@ class KanbanColumn(db.Model):
         return f"<KanbanColumn {self.title}>"
 
 
-class KanbanCard(db.Model):
+class KanbanCard(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "kanban_cards"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     kanban_column_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("kanban_columns.id", ondelete="CASCADE"),
         nullable=False,
     )
-    card_number = db.Column(db.Integer, nullable=True, unique=True)
+    # Drawn from kanban_card_num_seq on Postgres. SQLite (dev/tests) has no
+    # sequences, so api_create_card numbers cards inline there.
+    card_number = db.Column(
+        db.Integer, db.Sequence("kanban_card_num_seq"), nullable=True, unique=True
+    )
     title = db.Column(db.String(500), nullable=False)
     description = db.Column(db.Text, default="")
     position = db.Column(db.Integer, nullable=False, default=0)
-    labels = db.Column(db.Text, default="[]")
-    comments = db.Column(db.Text, default="[]")
+    labels = db.Column(JSONDocument, default=list)  # list of color names
+    comments = db.Column(JSONDocument, default=list)  # [{author, text, created_at}]
     prospect_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("prospects.id"),
         nullable=True,
     )
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
+
+    # Board loads filter by column and order by position — one composite
+    # index serves both without a sort step.
+    __table_args__ = (
+        db.Index("ix_kanban_cards_column_position", "kanban_column_id", "position"),
     )
 
     prospect = db.relationship("Prospect", foreign_keys=[prospect_id])
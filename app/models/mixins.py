@@ -0,0 +1,41 @@
+"""Column mixins shared by the models.
+
+Every table keys on a UUID `id` and most carry `created_at` /
+`updated_at` stamped by the database. Declarative copies these columns
+onto each model that mixes them in, so the definitions live in one place.
+"""
+
+import uuid
+
+from app.extensions import db
+from app.models.types import UUIDString, uuid7
+
+
+def _uuid4():
+    return str(uuid.uuid4())
+
+
+class UUIDPrimaryKey:
+    """Random (uuid4) string primary key."""
+
+    id = db.Column(UUIDString, primary_key=True, default=_uuid4)
+
+
+class TimeOrderedPrimaryKey:
+    """Time-ordered (uuid7) primary key, for append-heavy tables."""
+
+    id = db.Column(UUIDString, primary_key=True, default=uuid7)
+
+
+class CreatedAt:
+    created_at = db.Column(
+        db.DateTime(timezone=True), server_default=db.func.now()
+    )
+
+
+class Timestamps(CreatedAt):
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        server_default=db.func.now(),
+        onupdate=db.func.now(),
+    )
@@ -13,46 +13,69 @@ Template variables use {{variable}} syntax:
   {{portal_url}}     — portal base URL
 """
 
-import uuid
+import re
+from functools import lru_cache
 
 from app.extensions import db
+from app.models.mixins import Timestamps, UUIDPrimaryKey
+from app.models.types import UUIDString
 
+_PLACEHOLDER = re.compile(
+    r"\{\{(business_name|demo_url|contact_name|first_name|my_phone|portal_url)\}\}"
+)
 
-class PitchTemplate(db.Model):
+
+@lru_cache(maxsize=256)
+def _compile(body):
+    """Split a template body into literal strings and placeholder names.
+
+    Returns a tuple of (is_placeholder, text) pairs, so render only walks
+    the body once per distinct body rather than once per placeholder per
+    call. Cached by body text, so edits simply compile to a new entry.
+    """
+    parts = []
+    pos = 0
+    for match in _PLACEHOLDER.finditer(body):
+        if match.start() > pos:
+            parts.append((False, body[pos:match.start()]))
+        parts.append((True, match.group(1)))
+        pos = match.end()
+    if pos < len(body):
+        parts.append((False, body[pos:]))
+    return tuple(parts)
+
+
+class PitchTemplate(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "pitch_templates"
 
     CATEGORIES = ["initial", "followup"]
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     name = db.Column(db.String(255), nullable=False)
     body = db.Column(db.Text, nullable=False)
-    category = db.Column(db.String(50), nullable=False, default="initial")
-    is_active = db.Column(db.Boolean, nullable=False, default=True)
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
+    category = db.Column(
+        db.Enum(*CATEGORIES, name="pitch_template_category"),
+        nullable=False,
+        default="initial",
     )
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
 
     def render(self, prospect, portal_url="https://portal.belvieudigital.com", my_phone="(713) 725-4459"):
         """Replace template variables with prospect-specific values."""
-        text = self.body
-        replacements = {
-            "{{business_name}}": prospect.business_name or "",
-            "{{demo_url}}": prospect.demo_url or "",
-            "{{contact_name}}": prospect.contact_name or "",
-            "{{first_name}}": (prospect.contact_name or "").split(" ")[0] if prospect.contact_name else "",
-            "{{my_phone}}": my_phone,
-            "{{portal_url}}": portal_url,
+        if "{{" not in self.body:
+            return self.body  # nothing to substitute
+
+        values = {
+            "business_name": prospect.business_name or "",
+            "demo_url": prospect.demo_url or "",
+            "contact_name": prospect.contact_name or "",
+            "first_name": prospect.first_name,
+            "my_phone": my_phone,
+            "portal_url": portal_url,
         }
-        for placeholder, value in replacements.items():
-            text = text.replace(placeholder, value)
-        return text
+        return "".join(
+            values[text] if is_placeholder else text
+            for is_placeholder, text in _compile(self.body)
+        )
 
     def __repr__(self):
         return f"<PitchTemplate {self.name} ({'active' if self.is_active else 'inactive'})>"
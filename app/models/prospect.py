@@ -4,12 +4,16 @@ Tracks businesses from discovery through conversion or decline.
 Pipeline: researching -> site_built -> pitched -> converted -> declined
 """
 
-import uuid
-
 from app.extensions import db
+from app.models.mixins import Timestamps, UUIDPrimaryKey
+from app.models.types import UUIDString
+
 
+# Statuses still moving through the pipeline
+_ACTIVE_STATUS_SQL = "status IN ('researching', 'site_built', 'pitched')"
 
-class Prospect(db.Model):
+
+class Prospect(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "prospects"
 
     # -- Valid statuses for pipeline tracking --
@@ -21,9 +25,6 @@ class Prospect(db.Model):
         "declined",
     ]
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     business_name = db.Column(db.String(255), nullable=False)
     contact_name = db.Column(db.String(255), nullable=True)
     contact_email = db.Column(db.String(255), nullable=True)
@@ -38,19 +39,29 @@ class Prospect(db.Model):
     demo_url = db.Column(
         db.String(500), nullable=True
     )  # cloudflare .dev preview link
-    status = db.Column(db.String(50), default="researching", nullable=False)
+    # Native ENUM on Postgres (4 bytes per row), plain VARCHAR elsewhere
+    status = db.Column(
+        db.Enum(*STATUSES, name="prospect_status"),
+        default="researching",
+        nullable=False,
+    )
     workspace_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("workspaces.id", use_alter=True, name="fk_prospects_workspace_id"),
         nullable=True,
     )  # set when converted
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
+
+    # Partial index over the open pipeline only: the pipeline filter and
+    # the pitched-reminder sweep never look at converted/declined rows,
+    # which are most of the table over time.
+    __table_args__ = (
+        db.Index(
+            "ix_prospects_active",
+            "status",
+            "updated_at",
+            postgresql_where=db.text(_ACTIVE_STATUS_SQL),
+            sqlite_where=db.text(_ACTIVE_STATUS_SQL),
+        ),
     )
 
     # --- Relationships ---
@@ -62,5 +73,10 @@ class Prospect(db.Model):
         uselist=False,
     )
 
+    @property
+    def first_name(self):
+        """First word of contact_name ("" when there is no contact)."""
+        return (self.contact_name or "").partition(" ")[0]
+
     def __repr__(self):
         return f"<Prospect {self.business_name} ({self.status})>"
@@ -4,40 +4,60 @@ Tracks outreach attempts on prospects: emails, texts, calls, notes.
 Displayed as a timeline on the prospect detail page.
 """
 
-import uuid
-
 from app.extensions import db
+from app.models.mixins import CreatedAt, TimeOrderedPrimaryKey
+from app.models.types import UUIDString
 
 
-class ProspectActivity(db.Model):
+class ProspectActivity(TimeOrderedPrimaryKey, CreatedAt, db.Model):
     __tablename__ = "prospect_activities"
 
     TYPES = ["email", "text", "call", "note"]
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     prospect_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("prospects.id"),
         nullable=False,
-        index=True,
     )
     activity_type = db.Column(
-        db.String(50), nullable=False
+        db.Enum(*TYPES, name="prospect_activity_type"), nullable=False
     )  # email | text | call | note
     note = db.Column(db.Text, nullable=True)
+    reminder_tier = db.Column(
+        db.String(8), nullable=True
+    )  # d3 | d10 | d30 on automated reminder emails, else NULL
     actor_user_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("users.id"),
         nullable=True,
     )
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
+
+    # Timeline: a prospect's activities, newest first. Also serves plain
+    # prospect_id lookups, so no separate single-column index.
+    # The reminder sweep aggregates each prospect's email activities (first
+    # outreach time, tiers sent); on Postgres reminder_tier is carried in
+    # the index so that is an index-only scan. The partial index covers
+    # just the reminder rows, for looking up a prospect's sent tiers.
+    __table_args__ = (
+        db.Index("ix_prospect_activities_prospect_created", "prospect_id", "created_at"),
+        db.Index(
+            "ix_prospect_activities_prospect_type_created",
+            "prospect_id",
+            "activity_type",
+            "created_at",
+            postgresql_include=["reminder_tier"],
+        ),
+        db.Index(
+            "ix_prospect_activities_reminder_tier",
+            "prospect_id",
+            "reminder_tier",
+            postgresql_where=db.text("reminder_tier IS NOT NULL"),
+            sqlite_where=db.text("reminder_tier IS NOT NULL"),
+        ),
     )
 
     # --- Relationships ---
-    prospect = db.relationship("Prospect", backref=db.backref("activities", lazy="dynamic", order_by="ProspectActivity.created_at.desc()"))
+    prospect = db.relationship("Prospect", backref=db.backref("activities", order_by="ProspectActivity.created_at.desc()"))
     actor = db.relationship("User", lazy="joined")
 
     def __repr__(self):
@@ -5,22 +5,19 @@ site.status is a DERIVED / PRESENTATION value -- entitlement gating
 uses billing_subscriptions.status (not this field).
 """
 
-import uuid
-
 from app.extensions import db
+from app.models.mixins import Timestamps, UUIDPrimaryKey
+from app.models.types import UUIDString
 
 
-class Site(db.Model):
+class Site(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "sites"
 
     # -- Valid statuses (presentation only, NOT used for access gating) --
     STATUSES = ["demo", "active", "paused", "cancelled"]
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     workspace_id = db.Column(
-        db.String(36), db.ForeignKey("workspaces.id"), nullable=False
+        UUIDString, db.ForeignKey("workspaces.id"), nullable=False
     )
     site_slug = db.Column(db.String(100), unique=True, nullable=False)
     display_name = db.Column(db.String(255), nullable=True)
@@ -51,23 +48,10 @@ class Site(db.Model):
         db.DateTime(timezone=True), nullable=True
     )  # when the client made their selection
 
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
-    )
-
     # --- Relationships ---
     workspace = db.relationship("Workspace", back_populates="sites")
-    invites = db.relationship(
-        "WorkspaceInvite", back_populates="site", lazy="dynamic"
-    )
-    tickets = db.relationship(
-        "Ticket", back_populates="site", lazy="dynamic"
-    )
+    invites = db.relationship("WorkspaceInvite", back_populates="site")
+    tickets = db.relationship("Ticket", back_populates="site")
 
     def __repr__(self):
         return f"<Site {self.site_slug} ({self.status})>"
@@ -1,30 +1,37 @@
-"""Stripe event model (idempotency table).
+"""Stripe event model (idempotency table + processing queue).
 
-Every webhook event is recorded by its Stripe event ID. Before processing
-any event, the handler checks this table. If the event_id already exists,
-it returns 200 immediately — preventing double-writes from Stripe retries.
-"""
+Every webhook event is recorded by its Stripe event ID as soon as its
+signature is verified. If the event_id already exists and was processed,
+the webhook returns 200 immediately — preventing double-writes from Stripe
+retries. The verified payload is kept until the event has been processed
+in the background, so pending/failed events can be re-run.
 
-import uuid
+Processed rows are only useful while Stripe might still retry them;
+`flask prune-stripe-events` deletes them after 30 days.
+"""
 
 from app.extensions import db
+from app.models.mixins import TimeOrderedPrimaryKey
+from app.models.types import UUIDString
 
 
-class StripeEvent(db.Model):
+class StripeEvent(TimeOrderedPrimaryKey, db.Model):
     __tablename__ = "stripe_events"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     stripe_event_id = db.Column(
         db.String(255), unique=True, nullable=False
-    )  # e.g. "evt_1Abc..."
+    )  # e.g. "evt_1Abc..." — the unique index serves the idempotency lookup
     event_type = db.Column(
         db.String(255), nullable=False
     )  # e.g. "checkout.session.completed"
+    status = db.Column(
+        db.String(20), nullable=False, default="processed", server_default="processed"
+    )  # pending | processing | processed | failed
+    payload = db.Column(db.Text, nullable=True)  # event JSON, cleared once processed
+    error = db.Column(db.Text, nullable=True)  # last handler error, if failed
     processed_at = db.Column(
         db.DateTime(timezone=True), server_default=db.func.now()
-    )
+    )  # when received; updated when claimed and when processing finishes
 
     def __repr__(self):
         return f"<StripeEvent {self.stripe_event_id} ({self.event_type})>"
@@ -7,12 +7,16 @@ Includes assigned_to, last_activity_at, and is_internal on messages
 from day one per plan specs.
 """
 
-import uuid
+import enum
 
 from app.extensions import db
+from app.models.mixins import (
+    CreatedAt, TimeOrderedPrimaryKey, Timestamps, UUIDPrimaryKey,
+)
+from app.models.types import UUIDString
 
 
-class Ticket(db.Model):
+class Ticket(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "tickets"
 
     # -- Valid statuses --
@@ -31,42 +35,36 @@ class Ticket(db.Model):
     # -- Valid priorities --
     PRIORITIES = ["low", "normal", "high"]
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     workspace_id = db.Column(
-        db.String(36), db.ForeignKey("workspaces.id"), nullable=False
+        UUIDString, db.ForeignKey("workspaces.id"), nullable=False
     )
     site_id = db.Column(
-        db.String(36), db.ForeignKey("sites.id"), nullable=False
+        UUIDString, db.ForeignKey("sites.id"), nullable=False
     )
     author_user_id = db.Column(
-        db.String(36), db.ForeignKey("users.id"), nullable=False
+        UUIDString, db.ForeignKey("users.id"), nullable=False
     )
     assigned_to_user_id = db.Column(
-        db.String(36), db.ForeignKey("users.id"), nullable=True
+        UUIDString, db.ForeignKey("users.id"), nullable=True
     )
     subject = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
     category = db.Column(
-        db.String(50), nullable=True
+        db.Enum(*CATEGORIES, name="ticket_category"), nullable=True
     )  # content_update | bug | question
     status = db.Column(
-        db.String(50), default="open", nullable=False
+        db.Enum(*STATUSES, name="ticket_status"), default="open", nullable=False
     )  # open | in_progress | waiting_on_client | done
     priority = db.Column(
-        db.String(50), default="normal", nullable=False
+        db.Enum(*PRIORITIES, name="ticket_priority"), default="normal", nullable=False
     )  # low | normal | high
     last_activity_at = db.Column(
         db.DateTime(timezone=True), server_default=db.func.now()
     )
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
+
+    # Dashboard/list: a workspace's tickets, most recently active first
+    __table_args__ = (
+        db.Index("ix_tickets_workspace_activity", "workspace_id", "last_activity_at"),
     )
 
     # --- Relationships ---
@@ -85,7 +83,6 @@ class Ticket(db.Model):
     messages = db.relationship(
         "TicketMessage",
         back_populates="ticket",
-        lazy="dynamic",
         order_by="TicketMessage.created_at",
     )
 
@@ -93,25 +90,19 @@ class Ticket(db.Model):
         return f"<Ticket {self.subject[:30]} ({self.status})>"
 
 
-class TicketMessage(db.Model):
+class TicketMessage(TimeOrderedPrimaryKey, CreatedAt, db.Model):
     __tablename__ = "ticket_messages"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     ticket_id = db.Column(
-        db.String(36), db.ForeignKey("tickets.id"), nullable=False
+        UUIDString, db.ForeignKey("tickets.id"), nullable=False
     )
     author_user_id = db.Column(
-        db.String(36), db.ForeignKey("users.id"), nullable=False
+        UUIDString, db.ForeignKey("users.id"), nullable=False
     )
     message = db.Column(db.Text, nullable=False)
     is_internal = db.Column(
         db.Boolean, default=False
     )  # internal notes visible to admin only
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
 
     # --- Relationships ---
     ticket = db.relationship("Ticket", back_populates="messages")
@@ -127,30 +118,55 @@ class TicketMessage(db.Model):
         return f"<TicketMessage ticket={self.ticket_id} internal={self.is_internal}>"
 
 
-class TicketAttachment(db.Model):
+class AttachmentKind(enum.IntEnum):
+    """How an attachment is displayed, stored as a SmallInteger."""
+
+    OTHER = 0
+    IMAGE = 1
+    PDF = 2
+
+    @classmethod
+    def for_content_type(cls, content_type):
+        if content_type and content_type.startswith("image/"):
+            return cls.IMAGE
+        if content_type == "application/pdf":
+            return cls.PDF
+        return cls.OTHER
+
+
+_SIZE_UNITS = ("B", "KB", "MB")
+
+
+def _attachment_kind_default(context):
+    return AttachmentKind.for_content_type(
+        context.get_current_parameters().get("content_type")
+    )
+
+
+class TicketAttachment(UUIDPrimaryKey, CreatedAt, db.Model):
     """File attachment on a ticket message (images, PDFs, etc.).
 
     Files are stored in Supabase Storage (prod) or local filesystem (dev).
     """
     __tablename__ = "ticket_attachments"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     message_id = db.Column(
-        db.String(36), db.ForeignKey("ticket_messages.id"), nullable=False
+        UUIDString, db.ForeignKey("ticket_messages.id"), nullable=False
     )
     ticket_id = db.Column(
-        db.String(36), db.ForeignKey("tickets.id"), nullable=False
+        UUIDString, db.ForeignKey("tickets.id"), nullable=False
     )
     filename = db.Column(db.String(255), nullable=False)       # original filename
     storage_path = db.Column(db.String(500), nullable=False)   # path in bucket / on disk
     content_type = db.Column(db.String(100), nullable=False)   # e.g. image/png, application/pdf
+    kind = db.Column(
+        db.SmallInteger,
+        nullable=False,
+        default=_attachment_kind_default,
+        server_default="0",
+    )  # AttachmentKind, derived from content_type on insert
     file_size = db.Column(db.Integer, nullable=False)          # bytes
     public_url = db.Column(db.String(1000), nullable=True)     # public URL for display
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
 
     # --- Relationships ---
     message = db.relationship("TicketMessage", back_populates="attachments")
@@ -158,21 +174,21 @@ class TicketAttachment(db.Model):
 
     @property
     def is_image(self):
-        return self.content_type and self.content_type.startswith("image/")
+        return self.kind == AttachmentKind.IMAGE
 
     @property
     def is_pdf(self):
-        return self.content_type == "application/pdf"
+        return self.kind == AttachmentKind.PDF
 
     @property
     def human_size(self):
         """Return human-readable file size."""
-        if self.file_size < 1024:
-            return f"{self.file_size} B"
-        elif self.file_size < 1024 * 1024:
-            return f"{self.file_size / 1024:.1f} KB"
-        else:
-            return f"{self.file_size / (1024 * 1024):.1f} MB"
+        size = self.file_size
+        # Each unit is 2**10 of the last, so the bit length picks it
+        unit = min(max(size.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+        if unit == 0:
+            return f"{size} B"
+        return f"{size / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
 
     def __repr__(self):
         return f"<TicketAttachment {self.filename} ({self.content_type})>"
@@ -0,0 +1,87 @@
+"""Shared column types and id generators."""
+
+import base64
+import binascii
+import os
+import time
+import uuid
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import JSON, LargeBinary, String, TypeDecorator
+
+
+class UUIDString(TypeDecorator):
+    """UUID key column that the app reads and writes as a str.
+
+    Stored as a native 16-byte uuid on PostgreSQL and as String(36)
+    elsewhere (SQLite in tests/dev), so ids stay plain strings in routes,
+    templates and JSON while Postgres rows and indexes carry half the
+    bytes and compare as fixed-width values.
+
+    Values that aren't UUIDs bind as NULL: looking a row up by a malformed
+    id (e.g. from a URL) finds nothing instead of failing Postgres's cast.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return None
+
+
+class URLSafeToken(TypeDecorator):
+    """Random token the app handles as base64url text but stores as bytes.
+
+    Tokens from secrets.token_urlsafe() go in as their raw bytes, so
+    the column and its unique index hold 32-48 bytes instead of
+    43-64 characters. Lookups compare the bytes directly. Reading the
+    column gives back the unpadded base64url string.
+
+    Strings that aren't base64url bind as NULL, so they match nothing.
+    """
+
+    impl = LargeBinary(48)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            padded = value.encode("ascii") + b"=" * (-len(value) % 4)
+            return base64.b64decode(padded, altchars=b"-_", validate=True)
+        except (ValueError, binascii.Error):
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+# JSON column that is binary JSONB on Postgres: parsed once on write and
+# handed back already decoded, instead of text re-parsed on every read.
+JSONDocument = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def uuid7():
+    """New time-ordered UUID (RFC 9562 version 7) as a str.
+
+    48-bit millisecond timestamp up front, random bits after, so ids from
+    append-only tables land on the rightmost leaf of the primary key index
+    instead of a random page.
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
@@ -4,19 +4,16 @@ Stores authentication credentials and profile info.
 Flask-Login integration via UserMixin.
 """
 
-import uuid
-
 from flask_login import UserMixin
 
 from app.extensions import db
+from app.models.mixins import Timestamps, UUIDPrimaryKey
+from app.models.types import UUIDString
 
 
-class User(UserMixin, db.Model):
+class User(UserMixin, UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "users"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     email = db.Column(db.String(255), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     full_name = db.Column(db.String(255))
@@ -24,14 +21,6 @@ class User(UserMixin, db.Model):
     is_active = db.Column(db.Boolean, default=True)
     password_reset_token = db.Column(db.String(255), nullable=True)
     password_reset_expires = db.Column(db.DateTime(timezone=True), nullable=True)
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
-    )
 
     # --- Relationships ---
     workspace_memberships = db.relationship(
@@ -5,26 +5,29 @@
 - WorkspaceSettings: per-workspace config (brand color, feature flags, etc.).
 """
 
-import uuid
+from sqlalchemy.orm import column_property
 
 from app.extensions import db
+from app.models.mixins import CreatedAt, Timestamps, UUIDPrimaryKey
+from app.models.types import JSONDocument, UUIDString
 
 
-class Workspace(db.Model):
+class Workspace(UUIDPrimaryKey, CreatedAt, db.Model):
     __tablename__ = "workspaces"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     name = db.Column(db.String(255), nullable=False)
     prospect_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("prospects.id", use_alter=True, name="fk_workspaces_prospect_id"),
         nullable=True,
     )
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
+    # Denormalized from the newest billing_subscriptions row so the tenant
+    # middleware can gate access without touching billing tables. Kept in
+    # sync on every flush that writes a subscription (see models/billing.py).
+    access_level = db.Column(
+        db.String(16), default="subscribe", server_default="subscribe",
+        nullable=False, index=True,
+    )  # full | read_only | blocked | subscribe
 
     # --- Relationships ---
     # The prospect this workspace was converted from (via workspace.prospect_id).
@@ -32,33 +35,23 @@ class Workspace(db.Model):
     prospect = db.relationship(
         "Prospect", foreign_keys=[prospect_id]
     )
-    members = db.relationship(
-        "WorkspaceMember", back_populates="workspace", lazy="dynamic"
-    )
+    members = db.relationship("WorkspaceMember", back_populates="workspace")
     settings = db.relationship(
         "WorkspaceSettings",
         back_populates="workspace",
         uselist=False,
         cascade="all, delete-orphan",
     )
-    sites = db.relationship(
-        "Site", back_populates="workspace", lazy="dynamic"
-    )
-    invites = db.relationship(
-        "WorkspaceInvite", back_populates="workspace", lazy="dynamic"
-    )
+    sites = db.relationship("Site", back_populates="workspace")
+    invites = db.relationship("WorkspaceInvite", back_populates="workspace")
     billing_customer = db.relationship(
         "BillingCustomer",
         back_populates="workspace",
         uselist=False,
         cascade="all, delete-orphan",
     )
-    billing_subscriptions = db.relationship(
-        "BillingSubscription", back_populates="workspace", lazy="dynamic"
-    )
-    tickets = db.relationship(
-        "Ticket", back_populates="workspace", lazy="dynamic"
-    )
+    billing_subscriptions = db.relationship("BillingSubscription", back_populates="workspace")
+    tickets = db.relationship("Ticket", back_populates="workspace")
     audit_events = db.relationship(
         "AuditEvent", back_populates="workspace", lazy="dynamic"
     )
@@ -67,22 +60,16 @@ class Workspace(db.Model):
         return f"<Workspace {self.name}>"
 
 
-class WorkspaceMember(db.Model):
+class WorkspaceMember(UUIDPrimaryKey, CreatedAt, db.Model):
     __tablename__ = "workspace_members"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     user_id = db.Column(
-        db.String(36), db.ForeignKey("users.id"), nullable=False
+        UUIDString, db.ForeignKey("users.id"), nullable=False
     )
     workspace_id = db.Column(
-        db.String(36), db.ForeignKey("workspaces.id"), nullable=False
+        UUIDString, db.ForeignKey("workspaces.id"), nullable=False
     )
     role = db.Column(db.String(50), default="owner")  # owner | member
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
 
     __table_args__ = (
         db.UniqueConstraint(
@@ -98,32 +85,33 @@ class WorkspaceMember(db.Model):
         return f"<WorkspaceMember user={self.user_id} workspace={self.workspace_id}>"
 
 
-class WorkspaceSettings(db.Model):
+# Member count as a correlated subquery. Deferred: only loaded by queries
+# that ask for it with .options(undefer(Workspace.member_count)), which
+# then get it in the same SELECT as the workspace rows.
+Workspace.member_count = column_property(
+    db.select(db.func.count(WorkspaceMember.id))
+    .where(WorkspaceMember.workspace_id == Workspace.id)
+    .correlate_except(WorkspaceMember)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+
+class WorkspaceSettings(UUIDPrimaryKey, Timestamps, db.Model):
     __tablename__ = "workspace_settings"
 
-    id = db.Column(
-        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
     workspace_id = db.Column(
-        db.String(36),
+        UUIDString,
         db.ForeignKey("workspaces.id"),
         unique=True,
         nullable=False,
     )
     brand_color = db.Column(db.String(7), nullable=True)  # hex color
-    plan_features = db.Column(db.JSON, default=dict)  # feature flags / limits
+    plan_features = db.Column(JSONDocument, default=dict)  # feature flags / limits
     update_allowance = db.Column(
         db.Integer, nullable=True
     )  # monthly limit, null = unlimited
-    notification_prefs = db.Column(db.JSON, default=dict)
-    created_at = db.Column(
-        db.DateTime(timezone=True), server_default=db.func.now()
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        server_default=db.func.now(),
-        onupdate=db.func.now(),
-    )
+    notification_prefs = db.Column(JSONDocument, default=dict)
 
     # --- Relationships ---
     workspace = db.relationship("Workspace", back_populates="settings")
@@ -0,0 +1,108 @@
+"""
+Background task runner for WaaS Portal.
+
+Runs slow side effects (Stripe webhook processing, notification emails)
+on a small per-process thread pool so the HTTP response doesn't wait on
+them. Each task gets its own app context, and with it a fresh DB session
+that is removed when the task finishes.
+
+Tasks run on named queues, each with its own pool, so a burst on one
+(e.g. webhook retries) can't starve another (notification email). The
+"default" queue is sized by BACKGROUND_WORKERS, "email" by EMAIL_WORKERS.
+
+Set TASKS_ALWAYS_EAGER = True (the test config does) to run tasks inline
+in the caller's context instead.
+
+On interpreter exit the pools are shut down, waiting for queued tasks, so
+emails already accepted by send_email still go out when a worker stops.
+
+Usage:
+    from app.services import background_service
+
+    background_service.submit(process_stripe_event, event_id)
+    background_service.submit_to("email", send_email_sync, to, subject, ...)
+"""
+
+import atexit
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Queue name -> config key holding its worker count
+QUEUES = {
+    "default": "BACKGROUND_WORKERS",
+    "email": "EMAIL_WORKERS",
+}
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app, queue):
+    executor = _executors.get(queue)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(queue)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=app.config.get(QUEUES[queue], 4),
+                    thread_name_prefix=f"background-{queue}",
+                )
+                _executors[queue] = executor
+    return executor
+
+
+def shutdown(wait=True):
+    """Shut down every queue's pool, by default letting queued tasks finish.
+
+    Registered with atexit; a later submit starts a fresh pool.
+    """
+    with _executor_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+atexit.register(shutdown)
+
+
+def _run(app, fn, args, kwargs):
+    with app.app_context():
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            logger.exception(f"Background task {fn.__name__} failed")
+            raise
+
+
+def submit(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) in the background on the default queue.
+
+    Returns a Future. In eager mode the Future is already resolved
+    (holding the result or the exception) when this returns.
+    """
+    return submit_to("default", fn, *args, **kwargs)
+
+
+def submit_to(queue, fn, *args, **kwargs):
+    """Same as submit, on the named queue (a key of QUEUES)."""
+    if queue not in QUEUES:
+        raise ValueError(f"Unknown background queue: {queue}")
+
+    app = current_app._get_current_object()
+
+    if app.config.get("TASKS_ALWAYS_EAGER"):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            logger.exception(f"Background task {fn.__name__} failed")
+            future.set_exception(e)
+        return future
+
+    return _get_executor(app, queue).submit(_run, app, fn, args, kwargs)
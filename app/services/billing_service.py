@@ -5,6 +5,7 @@ Responsible for:
 - Upserting billing_subscriptions rows from Stripe webhook data
 - Deriving site.status from subscription status (presentation only)
 - Getting or creating BillingCustomer records
+- Looking up a workspace's latest subscription
 """
 
 import logging
@@ -24,16 +25,30 @@ def get_plan_from_price_id(price_id, app_config):
     Single tier: all subscriptions are 'basic' ($59/mo).
     Setup fee ($250) is charged separately when PROMO_NO_SETUP_FEE is off.
     Returns None if the price_id doesn't match the configured plan.
+    The mapping (STRIPE_PRICE_PLANS) is built once in create_app.
     """
-    if price_id == app_config.get("STRIPE_BASIC_PRICE_ID"):
-        return "basic"
-    return None
+    return app_config["STRIPE_PRICE_PLANS"].get(price_id)
+
+
+def get_latest_subscription(workspace_id):
+    """Return the workspace's newest BillingSubscription, or None.
+
+    A 2.0-style select() with LIMIT 1 (served by the
+    (workspace_id, created_at) index) rather than Query.first().
+    """
+    return db.session.scalars(
+        db.select(BillingSubscription)
+        .where(BillingSubscription.workspace_id == workspace_id)
+        .order_by(BillingSubscription.created_at.desc())
+        .limit(1)
+    ).first()
 
 
 def get_or_create_billing_customer(workspace_id, stripe_customer_id):
     """Get existing BillingCustomer or create one.
 
-    Returns the BillingCustomer instance (committed).
+    Returns the BillingCustomer instance (flushed, not committed — the
+    caller owns the transaction).
     """
     customer = BillingCustomer.query.filter_by(
         workspace_id=workspace_id
@@ -43,7 +58,7 @@ def get_or_create_billing_customer(workspace_id, stripe_customer_id):
         # Update stripe_customer_id if it changed (shouldn't happen, but safety)
         if customer.stripe_customer_id != stripe_customer_id:
             customer.stripe_customer_id = stripe_customer_id
-            db.session.commit()
+            db.session.flush()
         return customer
 
     # Also check by stripe_customer_id (in case workspace_id wasn't matched)
@@ -58,7 +73,7 @@ def get_or_create_billing_customer(workspace_id, stripe_customer_id):
         stripe_customer_id=stripe_customer_id,
     )
     db.session.add(customer)
-    db.session.commit()
+    db.session.flush()
     return customer
 
 
@@ -68,7 +83,8 @@ def upsert_subscription(workspace_id, stripe_subscription_id, status,
     """Create or update a BillingSubscription from Stripe data.
 
     This is the core sync function called by webhook handlers.
-    Returns the BillingSubscription instance.
+    Returns the BillingSubscription instance (added to the session, not
+    flushed — the caller's commit writes it with the rest of the event).
     """
     sub = BillingSubscription.query.filter_by(
         stripe_subscription_id=stripe_subscription_id
@@ -99,7 +115,6 @@ def upsert_subscription(workspace_id, stripe_subscription_id, status,
         )
         db.session.add(sub)
 
-    db.session.flush()
     return sub
 
 
@@ -114,23 +129,43 @@ def derive_site_status(workspace_id, subscription_status):
         past_due           -> 'active' (still up, portal shows warning)
         canceled / unpaid  -> 'paused'
     """
-    site = Site.query.filter_by(workspace_id=workspace_id).first()
-    if not site:
-        logger.warning(f"No site found for workspace {workspace_id}")
-        return
+    derive_site_statuses([(workspace_id, subscription_status)])
 
-    if subscription_status in ("active", "trialing", "past_due"):
-        site.status = "active"
-    elif subscription_status in ("canceled", "unpaid", "incomplete_expired"):
-        site.status = "paused"
 
-    db.session.flush()
+def derive_site_statuses(updates):
+    """derive_site_status for several workspaces, loading their sites in
+    one query (e.g. when replaying a backlog of webhook events).
+
+    Args:
+        updates: Iterable of (workspace_id, subscription_status) pairs.
+            A later pair for the same workspace wins.
+    """
+    statuses = dict(updates)
+    sites = Site.query.filter(
+        Site.workspace_id.in_(statuses)
+    ).order_by(Site.created_at).all()
+
+    site_by_workspace = {}
+    for site in sites:
+        site_by_workspace.setdefault(site.workspace_id, site)
+
+    for workspace_id, subscription_status in statuses.items():
+        site = site_by_workspace.get(workspace_id)
+        if not site:
+            logger.warning(f"No site found for workspace {workspace_id}")
+            continue
+
+        if subscription_status in ("active", "trialing", "past_due"):
+            site.status = "active"
+        elif subscription_status in ("canceled", "unpaid", "incomplete_expired"):
+            site.status = "paused"
 
 
 def log_billing_audit(workspace_id, action, metadata=None):
     """Log a billing-related audit event.
 
-    Actor is None because webhook events are system-initiated.
+    Actor is None because webhook events are system-initiated. The row is
+    only added to the session; it is written by the caller's commit.
     """
     event = AuditEvent(
         workspace_id=workspace_id,
@@ -139,7 +174,6 @@ def log_billing_audit(workspace_id, action, metadata=None):
         metadata_=metadata or {},
     )
     db.session.add(event)
-    db.session.flush()
 
 
 def get_workspace_id_from_stripe_customer(stripe_customer_id):
@@ -5,42 +5,120 @@ Uses:
   actual registry databases (Verisign for .com/.net, etc.).
 - python-whois as a fallback for TLDs not covered by RDAP (like .co, .io, .me).
 - Cloudflare Domain Pricing API (cfdomainpricing.com) for live wholesale
-  TLD pricing. Cached in memory with a 24-hour TTL.
+  TLD pricing. Cached in memory (and on disk, shared across workers) with
+  a 24-hour TTL.
 
 No API keys or accounts required. No bootstrap step.
 """
 
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import requests
 import whois
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.extensions import db
 
 logger = logging.getLogger(__name__)
 
+# One keep-alive session for every outbound lookup, so repeat checks
+# against the same registry (almost every .com goes to Verisign) skip the
+# DNS + TCP + TLS handshake. No retries: callers already fall back.
+_http = requests.Session()
+_http.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=Retry(total=0)),
+)
+
+# Runs the pricing fetch alongside the availability lookup
+_lookup_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="domain-lookup")
+# python-whois has no overall timeout of its own; lookups run here so the
+# caller can give up after WHOIS_TIMEOUT seconds.
+_whois_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="whois")
+WHOIS_TIMEOUT = 6
+
+# ──────────────────────────────────────────────
+# Disk Cache
+# ──────────────────────────────────────────────
+
+# The pricing and RDAP bootstrap tables are shared by every worker on the
+# box; keeping the last fetch on disk means a restarted worker reads it
+# instead of re-downloading both before its first check.
+DOMAIN_CACHE_DIR = os.environ.get("DOMAIN_CACHE_DIR") or tempfile.gettempdir()
+
+
+def _disk_cache_path(name: str) -> str:
+    return os.path.join(DOMAIN_CACHE_DIR, f"waas_{name}.json")
+
+
+def _load_disk_cache(name: str, ttl: float) -> tuple[dict, float] | None:
+    """Return (data, fetched_at) from disk if written within ttl, else None."""
+    path = _disk_cache_path(name)
+    try:
+        fetched = os.stat(path).st_mtime
+        if time.time() - fetched > ttl:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f), fetched
+    except (OSError, ValueError):
+        return None
+
+
+def _save_disk_cache(name: str, data: dict) -> None:
+    """Write data atomically, so readers never see a partial file."""
+    path = _disk_cache_path(name)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Could not write {path}: {e}")
+
+
 # ──────────────────────────────────────────────
 # Cloudflare Pricing Cache
 # ──────────────────────────────────────────────
 
 CF_PRICING_URL = "https://cfdomainpricing.com/prices.json"
-_cf_prices: dict = {}
+_cf_prices: dict[str, tuple[float | None, float | None]] = {}
 _cf_prices_fetched: float = 0
 CF_CACHE_TTL = 86400  # 24 hours
 
 
-def _get_cf_prices() -> dict:
-    """Return cached Cloudflare TLD pricing, refreshing if stale or empty."""
+def _get_cf_prices() -> dict[str, tuple[float | None, float | None]]:
+    """Return cached Cloudflare TLD pricing, refreshing if stale or empty.
+
+    Flattened at refresh to {tld: (registration, renewal)}, so a lookup is
+    one dict get and a tuple unpack.
+    """
     global _cf_prices, _cf_prices_fetched
 
     if time.time() - _cf_prices_fetched > CF_CACHE_TTL or not _cf_prices:
+        cached = _load_disk_cache("cf_prices", CF_CACHE_TTL)
+        if cached:
+            data, _cf_prices_fetched = cached
+            _cf_prices = {tld: tuple(prices) for tld, prices in data.items()}
+            return _cf_prices
         try:
-            resp = requests.get(CF_PRICING_URL, timeout=10)
+            resp = _http.get(CF_PRICING_URL, timeout=10)
             resp.raise_for_status()
-            _cf_prices = resp.json()
+            _cf_prices = {
+                tld: (pricing.get("registration"), pricing.get("renewal"))
+                for tld, pricing in resp.json().items()
+                if pricing  # empty entries count as unpriced
+            }
             _cf_prices_fetched = time.time()
+            _save_disk_cache("cf_prices", _cf_prices)
             logger.info(
                 f"Refreshed Cloudflare pricing: {len(_cf_prices)} TLDs loaded"
             )
@@ -64,8 +142,12 @@ def _get_rdap_servers() -> dict:
     global _rdap_servers, _rdap_servers_fetched
 
     if time.time() - _rdap_servers_fetched > RDAP_CACHE_TTL or not _rdap_servers:
+        cached = _load_disk_cache("rdap_servers", RDAP_CACHE_TTL)
+        if cached:
+            _rdap_servers, _rdap_servers_fetched = cached
+            return _rdap_servers
         try:
-            resp = requests.get(IANA_RDAP_BOOTSTRAP_URL, timeout=10)
+            resp = _http.get(IANA_RDAP_BOOTSTRAP_URL, timeout=10)
             resp.raise_for_status()
             data = resp.json()
 
@@ -82,6 +164,7 @@ def _get_rdap_servers() -> dict:
 
             _rdap_servers = servers
             _rdap_servers_fetched = time.time()
+            _save_disk_cache("rdap_servers", servers)
             logger.info(f"Loaded IANA RDAP bootstrap: {len(servers)} TLDs")
         except Exception as e:
             logger.warning(f"Failed to fetch IANA RDAP bootstrap: {e}")
@@ -106,7 +189,7 @@ def _rdap_check(domain: str, tld: str) -> bool | None:
     url = f"{rdap_base}domain/{domain}"
 
     try:
-        resp = requests.get(
+        resp = _http.get(
             url,
             headers={"Accept": "application/rdap+json"},
             timeout=8,
@@ -141,7 +224,7 @@ def _whois_check(domain: str) -> bool | None:
         None  = couldn't determine
     """
     try:
-        w = whois.whois(domain)
+        w = _whois_pool.submit(whois.whois, domain).result(timeout=WHOIS_TIMEOUT)
 
         # python-whois returns an object even for available domains,
         # but domain_name will be None/empty if the domain doesn't exist.
@@ -153,6 +236,9 @@ def _whois_check(domain: str) -> bool | None:
     except whois.exceptions.WhoisDomainNotFoundError:
         # "No match" / "Domain not found" → available
         return False
+    except TimeoutError:
+        logger.warning(f"WHOIS timeout for {domain}")
+        return None
     except Exception as e:
         error_str = str(e).lower()
         if "not found" in error_str or "no match" in error_str:
@@ -161,10 +247,114 @@ def _whois_check(domain: str) -> bool | None:
         return None
 
 
+# ──────────────────────────────────────────────
+# Availability Cache
+# ──────────────────────────────────────────────
+
+# A search box re-checks the same domain as the user types; remember
+# definite answers briefly. "Available" expires sooner since someone
+# could register it at any moment.
+AVAILABILITY_TTL_TAKEN = 300  # 5 minutes
+AVAILABILITY_TTL_AVAILABLE = 60
+# WHOIS servers rate-limit aggressively, so their answers are kept longer
+AVAILABILITY_TTL_WHOIS = 3600  # 1 hour
+AVAILABILITY_CACHE_MAX = 4096
+_availability_cache: dict[str, tuple[bool, float]] = {}  # domain -> (registered, expires_at)
+# Lookups currently running, so concurrent checks of one domain share a
+# single round-trip instead of each hitting the registry.
+_availability_inflight: dict[str, Future] = {}
+_availability_lock = threading.Lock()
+
+
+def _lookup_registered(domain: str, tld: str) -> tuple[bool | None, bool]:
+    """RDAP, or WHOIS for TLDs that have no RDAP server.
+
+    Returns (registered, via_whois); registered as for _rdap_check. When a
+    TLD has an RDAP server but the query fails, WHOIS is not tried — it
+    would only be slower at failing against the same registry.
+    """
+    # --- Tier 1: RDAP (fast, direct HTTP) ---
+    if tld in _get_rdap_servers():
+        return _rdap_check(domain, tld), False
+
+    # --- Tier 2: WHOIS fallback ---
+    logger.info(f"No RDAP for .{tld}, falling back to WHOIS for {domain}")
+    return _whois_check(domain), True
+
+
+def _fresh_cache_entry(domain: str) -> tuple[bool, float] | None:
+    """The domain's cache entry, or None if it is missing or expired."""
+    cached = _availability_cache.get(domain)
+    if cached is not None and time.time() < cached[1]:
+        return cached
+    return None
+
+
+def _cached_availability(domain: str, tld: str) -> bool | None:
+    """_lookup_registered through the availability cache.
+
+    Inconclusive (None) results are never cached. A check that arrives
+    while the same domain is already being looked up waits for that
+    lookup's answer.
+    """
+    cached = _fresh_cache_entry(domain)
+    if cached is not None:
+        return cached[0]
+
+    with _availability_lock:
+        # Re-checked under the lock: a lookup may have finished (cached
+        # and left _availability_inflight) since the check above.
+        cached = _fresh_cache_entry(domain)
+        pending = _availability_inflight.get(domain)
+        if cached is None and pending is None:
+            future = _availability_inflight[domain] = Future()
+    if cached is not None:
+        return cached[0]
+    if pending is not None:
+        return pending.result()
+
+    try:
+        result, via_whois = _lookup_registered(domain, tld)
+    except BaseException as e:
+        with _availability_lock:
+            _availability_inflight.pop(domain, None)
+        future.set_exception(e)
+        raise
+
+    with _availability_lock:
+        if result is not None:
+            if via_whois:
+                ttl = AVAILABILITY_TTL_WHOIS
+            elif result:
+                ttl = AVAILABILITY_TTL_TAKEN
+            else:
+                ttl = AVAILABILITY_TTL_AVAILABLE
+            _availability_cache.pop(domain, None)
+            if len(_availability_cache) >= AVAILABILITY_CACHE_MAX:
+                # dicts keep insertion order: the first key is the oldest
+                del _availability_cache[next(iter(_availability_cache))]
+            _availability_cache[domain] = (result, time.time() + ttl)
+        # Only now that the answer is cached, so a check arriving in
+        # between finds either the in-flight lookup or the cache entry
+        _availability_inflight.pop(domain, None)
+    future.set_result(result)
+
+    return result
+
+
 # ──────────────────────────────────────────────
 # TLD Extraction
 # ──────────────────────────────────────────────
 
+_MULTI_PART_TLDS = frozenset({
+    "co.uk", "me.uk", "net.uk", "org.uk",
+    "co.nz", "net.nz", "org.nz", "geek.nz",
+    "com.mx", "org.mx",
+    "com.co", "net.co", "nom.co",
+    "com.ai", "net.ai", "off.ai", "org.ai",
+})
+
+
 def _extract_tld(domain: str) -> str:
     """Extract the TLD from a domain name.
 
@@ -172,23 +362,25 @@ def _extract_tld(domain: str) -> str:
     """
     domain = domain.lower().strip().rstrip(".")
 
-    multi_part_tlds = [
-        "co.uk", "me.uk", "net.uk", "org.uk",
-        "co.nz", "net.nz", "org.nz", "geek.nz",
-        "com.mx", "org.mx",
-        "com.co", "net.co", "nom.co",
-        "com.ai", "net.ai", "off.ai", "org.ai",
-    ]
-    for tld in multi_part_tlds:
-        if domain.endswith(f".{tld}"):
-            return tld
-
-    parts = domain.rsplit(".", 1)
-    if len(parts) == 2:
-        return parts[1]
+    parts = domain.rsplit(".", 2)
+    if len(parts) == 3:
+        candidate = f"{parts[1]}.{parts[2]}"
+        if candidate in _MULTI_PART_TLDS:
+            return candidate
+    if len(parts) >= 2:
+        return parts[-1]
     return ""
 
 
+# Lowercase LDH labels (1-63 chars, no leading/trailing hyphen), at most
+# 253 chars in all, ending in an alphabetic or punycode TLD.
+_DOMAIN_RE = re.compile(
+    r"(?=.{1,253}\Z)"
+    r"(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+"
+    r"(?:[a-z]{2,63}|xn--[a-z0-9-]{1,59})\Z"
+)
+
+
 # ──────────────────────────────────────────────
 # Public API
 # ──────────────────────────────────────────────
@@ -198,6 +390,8 @@ def check_domain_availability(domain_name: str, price_limit: float = 25.00) -> d
 
     Strategy: Try RDAP first (fastest, most accurate). If no RDAP server
     exists for the TLD, fall back to WHOIS (covers virtually everything).
+    Definite answers are cached per domain (minutes for RDAP, an hour for
+    WHOIS).
 
     Args:
         domain_name: Full domain (e.g. "mariospizza.com")
@@ -228,17 +422,18 @@ def check_domain_availability(domain_name: str, price_limit: float = 25.00) -> d
     if domain_name.startswith("www."):
         domain_name = domain_name[4:]
 
+    # Reject anything that can't be a hostname before spending a lookup on it
+    if not _DOMAIN_RE.match(domain_name):
+        return {"error": "Please enter a valid domain name (e.g. mybusiness.com)"}
+
     tld = _extract_tld(domain_name)
     if not tld:
         return {"error": "Could not determine the domain extension (e.g. .com)"}
 
-    # --- Tier 1: RDAP (fast, direct HTTP) ---
-    result = _rdap_check(domain_name, tld)
-
-    # --- Tier 2: WHOIS fallback ---
-    if result is None:
-        logger.info(f"No RDAP for .{tld}, falling back to WHOIS for {domain_name}")
-        result = _whois_check(domain_name)
+    # Pricing (a cache hit most of the time) and availability are
+    # independent; on a cold pricing cache the two fetches overlap.
+    cf_prices_future = _lookup_pool.submit(_get_cf_prices)
+    result = _cached_availability(domain_name, tld)
 
     # --- Both failed ---
     if result is None:
@@ -252,8 +447,7 @@ def check_domain_availability(domain_name: str, price_limit: float = 25.00) -> d
     available = not result  # True=taken from checkers, flip for our API
 
     # --- Look up pricing from Cloudflare ---
-    cf_prices = _get_cf_prices()
-    tld_pricing = cf_prices.get(tld)
+    tld_pricing = cf_prices_future.result().get(tld)
 
     price = None
     renewal = None
@@ -261,8 +455,7 @@ def check_domain_availability(domain_name: str, price_limit: float = 25.00) -> d
     within_budget = False
 
     if tld_pricing:
-        price = tld_pricing.get("registration")
-        renewal = tld_pricing.get("renewal")
+        price, renewal = tld_pricing
         price_source = "cloudflare"
         if price is not None:
             within_budget = price <= price_limit
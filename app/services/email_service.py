@@ -14,62 +14,153 @@ Usage:
         template="emails/welcome.html",
         context={"name": "Jane"},
     )
+
+Bulk jobs (e.g. the reminder sweep) can hand send_emails_sync a list to
+send over a single SMTP session, or spread over a few in parallel.
 """
 
 import logging
+import queue
 import smtplib
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from flask import current_app, render_template
 
+from app.services import background_service
+
 logger = logging.getLogger(__name__)
 
 
-def _send_smtp(app, msg):
-    """Send an email via SMTP in a background thread (non-blocking)."""
+# ─── SMTP connection pool ───
+# Each send used to pay for a fresh TCP + STARTTLS + AUTH handshake. Logged-in
+# connections are now parked per process and reused until they have sent
+# MAIL_POOL_MAX_MESSAGES_PER_CONN messages or the server drops them.
+
+_pool = queue.LifoQueue()
+
+
+class _PooledConnection:
+    __slots__ = ("server", "key", "sent")
+
+    def __init__(self, server, key):
+        self.server = server
+        self.key = key  # (host, port, username, password) it was opened with
+        self.sent = 0
+
+
+def _open_connection(key):
+    host, port, username, password = key
+    server = smtplib.SMTP(host, port, timeout=30)
+    try:
+        server.ehlo()
+        server.starttls()
+        server.ehlo()
+        server.login(username, password)
+    except Exception:
+        _close(server)
+        raise
+    return _PooledConnection(server, key)
+
+
+def _close(server):
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _is_alive(server):
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _checkout(key):
+    """Reuse a live pooled connection for these credentials, or open one."""
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            return _open_connection(key)
+        if conn.key == key and _is_alive(conn.server):
+            return conn
+        _close(conn.server)
+
+
+def _checkin(app, conn):
+    max_messages = app.config.get("MAIL_POOL_MAX_MESSAGES_PER_CONN", 100)
+    max_connections = app.config.get("MAIL_POOL_MAX_CONNECTIONS", 5)
+    if conn.sent >= max_messages or _pool.qsize() >= max_connections:
+        _close(conn.server)
+    else:
+        _pool.put(conn)
+
+
+def _send_smtp(app, msgs):
+    """Send built messages over one pooled SMTP connection.
+
+    Returns a list holding, per message, None if it was sent (or mail
+    isn't configured) or the exception that stopped it.
+    """
     with app.app_context():
         host = app.config.get("MAIL_SMTP_HOST", "smtp.gmail.com")
         port = app.config.get("MAIL_SMTP_PORT", 587)
         username = app.config.get("MAIL_USERNAME")
         password = app.config.get("MAIL_PASSWORD")
+        max_messages = app.config.get("MAIL_POOL_MAX_MESSAGES_PER_CONN", 100)
 
         if not username or not password:
             logger.warning("Email not sent — MAIL_USERNAME or MAIL_PASSWORD not configured.")
-            return
+            return [None] * len(msgs)
 
-        try:
-            with smtplib.SMTP(host, port, timeout=30) as server:
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-                server.login(username, password)
-                server.send_message(msg)
-            logger.info(f"Email sent to {msg['To']} — {msg['Subject']}")
-        except Exception as e:
-            logger.error(f"Failed to send email to {msg['To']}: {e}")
+        key = (host, port, username, password)
+        conn = None
+        results = []
+        for msg in msgs:
+            try:
+                if conn is None:
+                    conn = _checkout(key)
+                try:
+                    conn.server.send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # Dropped between the liveness check and the send — one
+                    # retry on a fresh connection rather than losing the message.
+                    _close(conn.server)
+                    conn = None
+                    conn = _open_connection(key)
+                    conn.server.send_message(msg)
+                conn.sent += 1
+                logger.info(f"Email sent to {msg['To']} — {msg['Subject']}")
+                results.append(None)
+            except Exception as e:
+                logger.error(f"Failed to send email to {msg['To']}: {e}")
+                if conn is not None:
+                    _close(conn.server)
+                    conn = None
+                results.append(e)
+                continue
 
+            if conn.sent >= max_messages:
+                _checkin(app, conn)  # retires it
+                conn = None
 
-def send_email(to, subject, template, context=None, reply_to=None):
-    """
-    Send a templated HTML email.
+        if conn is not None:
+            _checkin(app, conn)
+        return results
 
-    Args:
-        to:        Recipient email address (str or list).
-        subject:   Email subject line.
-        template:  Path to Jinja2 HTML template (relative to templates/).
-        context:   Dict of variables to pass to the template.
-        reply_to:  Optional reply-to address.
-    """
-    app = current_app._get_current_object()
-    context = context or {}
 
+def _build_message(app, to, subject, template, context, reply_to):
     from_name = app.config.get("MAIL_FROM_NAME", "Belvieu Digital")
     from_email = app.config.get("MAIL_FROM_ADDRESS", app.config.get("MAIL_USERNAME", ""))
 
     # Render the HTML template
-    html_body = render_template(template, **context)
+    html_body = render_template(template, **(context or {}))
 
     # Build the message
     msg = MIMEMultipart("alternative")
@@ -81,11 +172,28 @@ def send_email(to, subject, template, context=None, reply_to=None):
         msg["Reply-To"] = reply_to
 
     msg.attach(MIMEText(html_body, "html"))
+    return msg
+
+
+def send_email(to, subject, template, context=None, reply_to=None):
+    """
+    Send a templated HTML email.
 
-    # Send in background thread so the request doesn't block
-    thread = threading.Thread(target=_send_smtp, args=(app, msg))
-    thread.daemon = True
-    thread.start()
+    Queued on the "email" background queue — the template is rendered and
+    the message sent by the worker, so the request only pays for the
+    enqueue. The dedicated queue keeps notifications from waiting behind
+    webhook processing.
+
+    Args:
+        to:        Recipient email address (str or list).
+        subject:   Email subject line.
+        template:  Path to Jinja2 HTML template (relative to templates/).
+        context:   Dict of variables to pass to the template.
+        reply_to:  Optional reply-to address.
+    """
+    background_service.submit_to(
+        "email", send_email_sync, to, subject, template, context, reply_to,
+    )
 
 
 def send_email_sync(to, subject, template, context=None, reply_to=None):
@@ -94,21 +202,56 @@ def send_email_sync(to, subject, template, context=None, reply_to=None):
     where you need to confirm delivery before responding.
     """
     app = current_app._get_current_object()
-    context = context or {}
+    msg = _build_message(app, to, subject, template, context, reply_to)
+    _send_smtp(app, [msg])
 
-    from_name = app.config.get("MAIL_FROM_NAME", "Belvieu Digital")
-    from_email = app.config.get("MAIL_FROM_ADDRESS", app.config.get("MAIL_USERNAME", ""))
 
-    html_body = render_template(template, **context)
+def send_emails_sync(emails, connections=1):
+    """
+    Send several templated emails back to back over one SMTP connection
+    (or, with connections > 1, a few in parallel).
 
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = subject
-    msg["From"] = f"{from_name} <{from_email}>"
-    msg["To"] = to if isinstance(to, str) else ", ".join(to)
+    Args:
+        emails:      Iterable of dicts of send_email_sync keyword arguments.
+        connections: Spread the batch over up to this many pooled SMTP
+                     connections, each sending its share on its own thread,
+                     so server round-trips overlap.
 
-    if reply_to:
-        msg["Reply-To"] = reply_to
+    Returns:
+        A list with one entry per email: None if it was sent, otherwise
+        the exception that stopped it (a failed email doesn't stop the rest).
+    """
+    app = current_app._get_current_object()
+    results = []
+    built = []  # (index into results, message)
+    for email in emails:
+        try:
+            built.append((len(results), _build_message(
+                app, email["to"], email["subject"], email["template"],
+                email.get("context"), email.get("reply_to"),
+            )))
+            results.append(None)
+        except Exception as e:
+            logger.error(f"Failed to build email to {email.get('to')}: {e}")
+            results.append(e)
 
-    msg.attach(MIMEText(html_body, "html"))
+    msgs = [msg for _, msg in built]
+    connections = max(1, min(connections, len(msgs)))
+    if connections == 1:
+        sent = _send_smtp(app, msgs)
+    else:
+        # Connection i sends every i-th message; slices map results back
+        sent = [None] * len(msgs)
+        with ThreadPoolExecutor(
+            max_workers=connections, thread_name_prefix="email-batch",
+        ) as pool:
+            futures = [
+                pool.submit(_send_smtp, app, msgs[i::connections])
+                for i in range(connections)
+            ]
+        for i, future in enumerate(futures):
+            sent[i::connections] = future.result()
 
-    _send_smtp(app, msg)
+    for (index, _), error in zip(built, sent):
+        results[index] = error
+    return results
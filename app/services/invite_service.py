@@ -9,6 +9,8 @@ Handles the full lifecycle of workspace invite tokens:
 import secrets
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import lambda_stmt
+
 from app.extensions import db
 from app.models.invite import WorkspaceInvite
 
@@ -23,7 +25,8 @@ def generate_invite(workspace_id, site_id, email=None, expires_days=45):
         expires_days: Number of days until the token expires (default 45)
 
     Returns:
-        WorkspaceInvite: the newly created invite row
+        WorkspaceInvite: the newly created invite row (flushed; the
+        caller commits)
     """
     token = secrets.token_urlsafe(48)  # produces ~64-char base64 string
     invite = WorkspaceInvite(
@@ -34,7 +37,7 @@ def generate_invite(workspace_id, site_id, email=None, expires_days=45):
         expires_at=datetime.now(timezone.utc) + timedelta(days=expires_days),
     )
     db.session.add(invite)
-    db.session.commit()
+    db.session.flush()
     return invite
 
 
@@ -52,7 +55,9 @@ def validate_token(token):
     if not token:
         return None, "No invite token provided."
 
-    invite = WorkspaceInvite.query.filter_by(token=token).first()
+    invite = db.session.scalars(lambda_stmt(
+        lambda: db.select(WorkspaceInvite).where(WorkspaceInvite.token == token)
+    )).first()
 
     if invite is None:
         return None, "Invalid invite link."
@@ -97,7 +102,7 @@ def consume_invite(invite):
     Args:
         invite: WorkspaceInvite row to consume
     """
-    invite.used_at = datetime.now(timezone.utc)
+    invite.used_at = db.func.now()  # stamped by the database at flush
     db.session.add(invite)
     # Don't commit here — caller should commit as part of the
     # larger registration transaction
@@ -11,16 +11,19 @@ on a daily cron schedule via Railway.
 """
 
 import logging
-from datetime import datetime, timezone
+import smtplib
+import time
+from datetime import datetime, timedelta, timezone
 
 import click
 from flask import current_app
+from sqlalchemy.orm import load_only
 
 from app.extensions import db
 from app.models.prospect import Prospect
 from app.models.prospect_activity import ProspectActivity
 from app.models.invite import WorkspaceInvite
-from app.services.email_service import send_email_sync
+from app.services.email_service import send_emails_sync
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,12 @@ REMINDER_TIERS = [
     ("d30", 30),
 ]
 
+# Transient SMTP failures (dropped connection, 4xx, network errors) are
+# retried within the run with exponential backoff; anything still failing
+# is picked up by the next day's sweep, since its tier stays unsent.
+SEND_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 5
+
 REMINDER_SUBJECTS = {
     "d3": "Just making sure you saw this — {business_name}",
     "d10": "Your website for {business_name} is still ready",
@@ -37,119 +46,185 @@ REMINDER_SUBJECTS = {
 }
 
 
-def _get_first_outreach_activity(prospect_id):
-    """Return the first email-type ProspectActivity for a prospect, or None."""
+def _outreach_summary_subquery():
+    """Per prospect with email activity: first_at, the time of its first
+    email that isn't a reminder, and a sent_<tier> count for each tier."""
     return (
-        ProspectActivity.query
-        .filter_by(prospect_id=prospect_id, activity_type="email")
-        .filter(~ProspectActivity.note.contains("Reminder "))
-        .order_by(ProspectActivity.created_at.asc())
-        .first()
+        db.select(
+            ProspectActivity.prospect_id,
+            db.func.min(db.case(
+                (ProspectActivity.reminder_tier.is_(None), ProspectActivity.created_at),
+            )).label("first_at"),
+            *(
+                db.func.count(db.case(
+                    (ProspectActivity.reminder_tier == tier_label, 1),
+                )).label(f"sent_{tier_label}")
+                for tier_label, _ in REMINDER_TIERS
+            ),
+        )
+        .where(ProspectActivity.activity_type == "email")
+        .group_by(ProspectActivity.prospect_id)
+        .subquery()
     )
 
 
-def _has_reminder_been_sent(prospect_id, tier_label):
-    """Check if a reminder for the given tier has already been sent."""
-    marker = f"Reminder {tier_label} sent"
-    return (
-        ProspectActivity.query
-        .filter_by(prospect_id=prospect_id, activity_type="email")
-        .filter(ProspectActivity.note.contains(marker))
-        .first()
-    ) is not None
-
-
-def _get_invite_link(prospect):
-    """Find a valid (unused, unexpired) invite link for the prospect's workspace."""
-    if not prospect.workspace_id:
-        return None
-
-    invite = (
-        WorkspaceInvite.query
-        .filter_by(workspace_id=prospect.workspace_id)
-        .filter(WorkspaceInvite.used_at.is_(None))
+def _load_invite_links(workspace_ids):
+    """Newest valid (unused, unexpired) invite link per workspace, in one query."""
+    if not workspace_ids:
+        return {}
+
+    invites = db.session.execute(
+        db.select(WorkspaceInvite.workspace_id, WorkspaceInvite.token)
+        .where(
+            WorkspaceInvite.workspace_id.in_(workspace_ids),
+            WorkspaceInvite.is_valid,
+        )
         .order_by(WorkspaceInvite.created_at.desc())
-        .first()
     )
 
-    if invite and invite.is_valid:
-        base_url = current_app.config["APP_BASE_URL"]
-        return f"{base_url}/auth/register?token={invite.token}"
-
-    return None
+    base_url = current_app.config["APP_BASE_URL"]
+    links = {}
+    for workspace_id, token in invites:
+        links.setdefault(workspace_id, f"{base_url}/auth/register?token={token}")
+    return links
+
+
+def _is_transient(error):
+    """Whether a send failure is worth retrying in this run."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPException):
+        return isinstance(error, smtplib.SMTPServerDisconnected)
+    return isinstance(error, OSError)
+
+
+def _send_with_retries(emails):
+    """send_emails_sync, re-sending transiently failed emails up to
+    SEND_ATTEMPTS times in all. Returns the final per-email results."""
+    connections = current_app.config.get("MAIL_POOL_MAX_CONNECTIONS", 5)
+    results = send_emails_sync(emails, connections=connections)
+    for attempt in range(1, SEND_ATTEMPTS):
+        retry = [i for i, error in enumerate(results) if _is_transient(error)]
+        if not retry:
+            break
+        delay = RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+        click.echo(f"   Retrying {len(retry)} reminder(s) in {delay}s...")
+        time.sleep(delay)
+        retried = send_emails_sync([emails[i] for i in retry], connections=connections)
+        for i, error in zip(retry, retried):
+            results[i] = error
+    return results
 
 
 def _log_reminder_activity(prospect_id, tier_label, email):
-    """Log a ProspectActivity for the sent reminder."""
-    activity = ProspectActivity(
+    """Log a ProspectActivity for the sent reminder.
+
+    Nothing reads the row back during the sweep, so it is a Core INSERT
+    rather than a tracked ORM object.
+    """
+    db.session.execute(db.insert(ProspectActivity).values(
         prospect_id=prospect_id,
         activity_type="email",
         note=f"Reminder {tier_label} sent to {email}",
+        reminder_tier=tier_label,
         actor_user_id=None,
-    )
-    db.session.add(activity)
+    ))
 
 
-def process_reminders(dry_run=False):
+def process_reminders(dry_run=False, quiet=False):
     """Find eligible prospects and send reminder emails.
 
     Args:
         dry_run: If True, log what would be sent but don't actually send.
+        quiet: If True, skip the per-prospect tier report; send results,
+            failures and the totals are still printed.
 
     Returns:
         int: Number of reminders sent (or would-be-sent in dry-run mode).
     """
     now = datetime.now(timezone.utc)
     sent_count = 0
+    outbox = []  # (prospect, tier_label, send_emails_sync kwargs)
 
     if dry_run:
         click.echo("[DRY RUN] No emails will actually be sent.\n")
 
-    prospects = (
-        Prospect.query
-        .filter(Prospect.status == "pitched")
-        .filter(Prospect.contact_email.isnot(None))
-        .filter(Prospect.contact_email != "")
-        .all()
+    # Only prospects with at least one tier that is due and not yet sent;
+    # the rest (no outreach, too recent, every due tier sent) never load.
+    summary = _outreach_summary_subquery()
+    sent_columns = [summary.c[f"sent_{tier_label}"] for tier_label, _ in REMINDER_TIERS]
+    rows = db.session.execute(
+        db.select(Prospect, summary.c.first_at, *sent_columns)
+        .join(summary, summary.c.prospect_id == Prospect.id)
+        # Just what the loop and the email read; notes etc. stay unloaded
+        .options(load_only(
+            Prospect.id,
+            Prospect.business_name,
+            Prospect.contact_name,
+            Prospect.contact_email,
+            Prospect.demo_url,
+            Prospect.workspace_id,
+        ))
+        .where(
+            Prospect.status == "pitched",
+            Prospect.contact_email.isnot(None),
+            Prospect.contact_email != "",
+            db.or_(*(
+                db.and_(
+                    summary.c.first_at <= now - timedelta(days=tier_days),
+                    summary.c[f"sent_{tier_label}"] == 0,
+                )
+                for tier_label, tier_days in REMINDER_TIERS
+            )),
+        )
+    ).all()
+
+    click.echo(
+        f"Found {len(rows)} pitched prospect(s) with an email address "
+        f"and a reminder due."
     )
 
-    click.echo(f"Found {len(prospects)} pitched prospect(s) with an email address.")
-
-    if not prospects:
+    if not rows:
         all_prospects = Prospect.query.count()
         pitched = Prospect.query.filter_by(status="pitched").count()
         click.echo(f"  Total prospects in DB: {all_prospects}")
         click.echo(f"  With status 'pitched': {pitched}")
         if pitched > 0:
-            click.echo("  None of the pitched prospects have a contact_email set.")
+            click.echo(
+                "  None of the pitched prospects have both a contact_email and an "
+                "outreach email (sent via the admin panel) old enough for a reminder "
+                "they haven't already had."
+            )
         return 0
 
     click.echo("")
 
-    for prospect in prospects:
-        click.echo(f"── {prospect.business_name} ({prospect.contact_email}) ──")
+    reply_to = current_app.config.get("MAIL_FROM_ADDRESS")
+    invite_links = _load_invite_links(
+        {p.workspace_id for p, *_ in rows if p.workspace_id}
+    )
 
-        first_outreach = _get_first_outreach_activity(prospect.id)
-        if not first_outreach:
-            click.echo("   SKIP: No outreach email activity found for this prospect.")
-            click.echo("         (An outreach email must be sent first via the admin panel.)\n")
-            continue
+    for prospect, pitch_date, *sent_counts in rows:
+        # One write per prospect rather than a flush per line
+        report = [f"── {prospect.business_name} ({prospect.contact_email}) ──"]
 
-        pitch_date = first_outreach.created_at
+        sent_tiers = {
+            tier_label
+            for (tier_label, _), count in zip(REMINDER_TIERS, sent_counts)
+            if count
+        }
         if pitch_date.tzinfo is None:
             pitch_date = pitch_date.replace(tzinfo=timezone.utc)
         days_since_pitch = (now - pitch_date).days
 
-        click.echo(f"   Outreach sent: {pitch_date.strftime('%Y-%m-%d')} ({days_since_pitch} days ago)")
+        report.append(f"   Outreach sent: {pitch_date.strftime('%Y-%m-%d')} ({days_since_pitch} days ago)")
 
         # Walk tiers highest-to-lowest to find the best one to send.
         # If a prospect is 10 days out with no reminders, send D10 — not D3.
         target_tier = None
         for tier_label, tier_days in reversed(REMINDER_TIERS):
-            already_sent = _has_reminder_been_sent(prospect.id, tier_label)
-
-            if already_sent:
-                click.echo(f"   {tier_label.upper()} (>={tier_days}d): already sent")
+            if tier_label in sent_tiers:
+                report.append(f"   {tier_label.upper()} (>={tier_days}d): already sent")
                 continue
 
             if days_since_pitch >= tier_days:
@@ -160,60 +235,67 @@ def process_reminders(dry_run=False):
         if target_tier:
             t_label, t_days = target_tier
             for tier_label, tier_days in REMINDER_TIERS:
-                if tier_days < t_days and not _has_reminder_been_sent(prospect.id, tier_label):
-                    click.echo(f"   {tier_label.upper()} (>={tier_days}d): skipped (superseded by {t_label.upper()})")
+                if tier_days < t_days and tier_label not in sent_tiers:
+                    report.append(f"   {tier_label.upper()} (>={tier_days}d): skipped (superseded by {t_label.upper()})")
 
         # Also show tiers that are not yet eligible
         for tier_label, tier_days in REMINDER_TIERS:
-            if days_since_pitch < tier_days and not _has_reminder_been_sent(prospect.id, tier_label):
-                click.echo(f"   {tier_label.upper()} (>={tier_days}d): not yet eligible ({tier_days - days_since_pitch}d to go)")
-
-        sent_this_prospect = False
+            if days_since_pitch < tier_days and tier_label not in sent_tiers:
+                report.append(f"   {tier_label.upper()} (>={tier_days}d): not yet eligible ({tier_days - days_since_pitch}d to go)")
 
         if not target_tier:
-            click.echo("   No action needed for this prospect.")
+            report.append("   No action needed for this prospect.")
         else:
             tier_label, tier_days = target_tier
-            invite_link = _get_invite_link(prospect)
+            invite_link = invite_links.get(prospect.workspace_id)
             subject = REMINDER_SUBJECTS[tier_label].format(
                 business_name=prospect.business_name,
             )
-            reply_to = current_app.config.get("MAIL_FROM_ADDRESS")
 
             if dry_run:
-                click.echo(f"   {tier_label.upper()} (>={tier_days}d): WOULD SEND → {prospect.contact_email}")
-                click.echo(f"      Subject: {subject}")
+                report.append(f"   {tier_label.upper()} (>={tier_days}d): WOULD SEND → {prospect.contact_email}")
+                report.append(f"      Subject: {subject}")
                 sent_count += 1
-                sent_this_prospect = True
             else:
-                click.echo(f"   {tier_label.upper()} (>={tier_days}d): SENDING → {prospect.contact_email}")
-                click.echo(f"      Subject: {subject}")
-
-                try:
-                    send_email_sync(
-                        to=prospect.contact_email,
-                        subject=subject,
-                        template="emails/prospect_reminder.html",
-                        context={
-                            "business_name": prospect.business_name,
-                            "contact_name": prospect.contact_name,
-                            "demo_url": prospect.demo_url,
-                            "invite_link": invite_link,
-                            "reminder_tier": tier_label,
-                        },
-                        reply_to=reply_to,
-                    )
-
+                report.append(f"   {tier_label.upper()} (>={tier_days}d): QUEUED → {prospect.contact_email}")
+                report.append(f"      Subject: {subject}")
+                outbox.append((prospect, tier_label, {
+                    "to": prospect.contact_email,
+                    "subject": subject,
+                    "template": "emails/prospect_reminder.html",
+                    "context": {
+                        "business_name": prospect.business_name,
+                        "contact_name": prospect.contact_name,
+                        "demo_url": prospect.demo_url,
+                        "invite_link": invite_link,
+                        "reminder_tier": tier_label,
+                    },
+                    "reply_to": reply_to,
+                }))
+
+        if not quiet:
+            click.echo("\n".join(report) + "\n")
+
+    # Send everything over a few parallel SMTP sessions (at most as many as
+    # the connection pool keeps) rather than one per prospect
+    if outbox:
+        click.echo(f"Sending {len(outbox)} reminder(s)...")
+        results = _send_with_retries([email for _, _, email in outbox])
+        for (prospect, tier_label, _), error in zip(outbox, results):
+            if error is not None:
+                click.echo(f"   ✗ {prospect.business_name} {tier_label.upper()}: FAILED: {error}")
+                continue
+            # A savepoint per row, so one bad insert doesn't undo the others;
+            # everything lands in a single commit below.
+            try:
+                with db.session.begin_nested():
                     _log_reminder_activity(prospect.id, tier_label, prospect.contact_email)
-                    db.session.commit()
-                    sent_count += 1
-                    sent_this_prospect = True
-                    click.echo("      ✓ Sent and logged.")
-
-                except Exception as e:
-                    click.echo(f"      ✗ FAILED: {e}")
-                    db.session.rollback()
-
+            except Exception as e:
+                click.echo(f"   ✗ {prospect.business_name} {tier_label.upper()}: sent, but logging FAILED: {e}")
+                continue
+            sent_count += 1
+            click.echo(f"   ✓ {prospect.business_name} {tier_label.upper()}: sent and logged.")
+        db.session.commit()
         click.echo("")
 
     click.echo(f"{'[DRY RUN] ' if dry_run else ''}Done: {sent_count} reminder(s) {'would be ' if dry_run else ''}sent.")
@@ -1,17 +1,22 @@
 """Storage service — file uploads to Supabase Storage (prod) or local disk (dev).
 
 Supabase bucket: ticket-attachments (must be created in Supabase dashboard).
-Local fallback: instance/uploads/ directory.
+Local fallback: UPLOAD_DIR (instance/uploads/ by default).
 
 Provides a unified interface for uploading and retrieving files.
 """
 
+import hashlib
 import logging
 import os
-import uuid
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import requests
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -19,22 +24,48 @@ logger = logging.getLogger(__name__)
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
 # Allowed MIME types
-ALLOWED_TYPES = {
+ALLOWED_TYPES = frozenset({
     "image/jpeg",
     "image/png",
     "image/gif",
     "image/webp",
     "image/heic",
     "application/pdf",
-}
+})
 
-ALLOWED_EXTENSIONS = {
+# Lowercase; validate_file lowercases the uploaded name's extension
+ALLOWED_EXTENSIONS = frozenset({
     ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".pdf",
-}
-
-
+})
+
+# Max concurrent uploads per upload_files() call
+MAX_PARALLEL_UPLOADS = 8
+
+# Read size when hashing an upload for its storage name
+HASH_CHUNK_SIZE = 64 * 1024
+
+# One keep-alive session for Supabase, so back-to-back uploads and deletes
+# skip the TCP + TLS handshake. Connection failures and 502-504 answers
+# are retried with backoff (status retries only for idempotent DELETEs;
+# a failed upload already falls back to local disk).
+_http = requests.Session()
+_http.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
+@lru_cache(maxsize=1)
 def _get_supabase_config():
-    """Return Supabase storage config if available, else None."""
+    """Return Supabase storage config if available, else None.
+
+    Read from the environment once per process (it's fixed at boot);
+    call _get_supabase_config.cache_clear() after changing it.
+    """
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_KEY")
     bucket = os.environ.get("SUPABASE_STORAGE_BUCKET", "ticket-attachments")
@@ -93,20 +124,22 @@ def upload_file(file, ticket_id, message_id):
     """
     original_name = file.filename
     ext = os.path.splitext(original_name)[1].lower()
-    safe_name = f"{uuid.uuid4().hex}{ext}"
-    storage_path = f"{ticket_id}/{message_id}/{safe_name}"
 
-    # Read file data
-    file_data = file.read()
-    file_size = len(file_data)
+    # Content-addressed name: the same bytes always land on the same
+    # object, so a repeated attachment overwrites rather than duplicates.
+    # Hashed in chunks, never held in memory whole; the stream then goes
+    # straight to Supabase / disk.
+    stream = file.stream
+    digest, file_size = _content_digest(stream)
+    storage_path = f"{ticket_id}/{message_id}/{digest}{ext}"
     content_type = file.content_type or "application/octet-stream"
 
     # Try Supabase first, fall back to local
     supabase = _get_supabase_config()
     if supabase:
-        public_url = _upload_supabase(supabase, storage_path, file_data, content_type)
+        public_url = _upload_supabase(supabase, storage_path, stream, content_type)
     else:
-        public_url = _upload_local(storage_path, file_data)
+        public_url = _upload_local(storage_path, stream)
 
     return {
         "filename": original_name,
@@ -117,8 +150,51 @@ def upload_file(file, ticket_id, message_id):
     }
 
 
-def _upload_supabase(config, path, data, content_type):
-    """Upload to Supabase Storage. Returns public URL."""
+def _content_digest(stream):
+    """(blake2b-128 hex digest, size in bytes) of a seekable stream.
+
+    Leaves the stream rewound to the start.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    file_size = stream.tell()
+    stream.seek(0)
+    return digest.hexdigest(), file_size
+
+
+def upload_files(files, ticket_id, message_id):
+    """Upload several files concurrently.
+
+    Uploads are network-bound, so N attachments take about as long as the
+    slowest one instead of the sum of all of them.
+
+    Returns a list, in input order, of (file, metadata dict or the
+    Exception the upload raised).
+    """
+    if len(files) <= 1:
+        return [(file, _upload_or_error(file, ticket_id, message_id)) for file in files]
+
+    app = current_app._get_current_object()
+
+    def _upload(file):
+        with app.app_context():
+            return _upload_or_error(file, ticket_id, message_id)
+
+    with ThreadPoolExecutor(max_workers=min(len(files), MAX_PARALLEL_UPLOADS)) as pool:
+        return list(zip(files, pool.map(_upload, files)))
+
+
+def _upload_or_error(file, ticket_id, message_id):
+    try:
+        return upload_file(file, ticket_id, message_id)
+    except Exception as e:
+        return e
+
+
+def _upload_supabase(config, path, stream, content_type):
+    """Upload a file-like object to Supabase Storage. Returns public URL."""
     url = f"{config['url']}/storage/v1/object/{config['bucket']}/{path}"
 
     headers = {
@@ -128,7 +204,7 @@ def _upload_supabase(config, path, data, content_type):
     }
 
     try:
-        resp = requests.post(url, headers=headers, data=data, timeout=30)
+        resp = _http.post(url, headers=headers, data=stream, timeout=30)
         resp.raise_for_status()
 
         # Build public URL
@@ -139,19 +215,19 @@ def _upload_supabase(config, path, data, content_type):
     except Exception as e:
         logger.error(f"Supabase upload failed: {e}")
         # Fall back to local
-        return _upload_local(path, data)
+        stream.seek(0)
+        return _upload_local(path, stream)
 
 
-def _upload_local(path, data):
+def _upload_local(path, stream):
     """Upload to local filesystem (dev fallback). Returns URL path."""
-    upload_dir = os.path.join(
-        current_app.instance_path, "uploads", os.path.dirname(path)
-    )
-    os.makedirs(upload_dir, exist_ok=True)
-
-    filepath = os.path.join(current_app.instance_path, "uploads", path)
-    with open(filepath, "wb") as f:
-        f.write(data)
+    filepath = os.path.join(current_app.config["UPLOAD_DIR"], path)
+    # Paths are content-addressed, so an existing file already holds these
+    # bytes; only a new one needs its directory made and the data copied.
+    if not os.path.exists(filepath):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as f:
+            shutil.copyfileobj(stream, f)
 
     logger.info(f"Uploaded locally: {filepath}")
     # Return a URL path that our Flask app can serve
@@ -165,11 +241,11 @@ def delete_file(storage_path):
         try:
             url = f"{supabase['url']}/storage/v1/object/{supabase['bucket']}/{storage_path}"
             headers = {"Authorization": f"Bearer {supabase['key']}"}
-            requests.delete(url, headers=headers, timeout=10)
+            _http.delete(url, headers=headers, timeout=10)
         except Exception as e:
             logger.warning(f"Failed to delete from Supabase: {e}")
     else:
-        filepath = os.path.join(current_app.instance_path, "uploads", storage_path)
+        filepath = os.path.join(current_app.config["UPLOAD_DIR"], storage_path)
         try:
             os.remove(filepath)
         except FileNotFoundError:
@@ -8,11 +8,14 @@ Responsible for:
 - Idempotency via stripe_events table
 """
 
+import json
 import logging
 from datetime import datetime, timezone
 
 import stripe
 from flask import current_app
+from sqlalchemy import lambda_stmt
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.extensions import db
 from app.models.audit import AuditEvent
@@ -175,6 +178,8 @@ def create_checkout_session(workspace_id, site_id, site_slug,
         customer = stripe.Customer.create(**customer_params)
         stripe_customer_id = customer.id
         get_or_create_billing_customer(workspace_id, stripe_customer_id)
+        # Keep the new Stripe customer linked even if checkout creation fails
+        db.session.commit()
 
     def _create_session(customer_id):
         # Build line items — skip setup fee when promo is active
@@ -334,58 +339,135 @@ def create_portal_session(workspace_id, site_slug):
 # ──────────────────────────────────────────────
 
 def verify_webhook_signature(payload, sig_header):
-    """Verify Stripe webhook signature and construct the event.
+    """Verify Stripe webhook signature and parse the event.
 
-    Returns the verified Stripe event object.
+    Only the signature is checked against the raw payload; the event comes
+    back as a plain dict rather than a StripeObject, since the request just
+    needs its id and type and the handlers work from the stored payload.
     Raises stripe.error.SignatureVerificationError on invalid signature.
     """
     webhook_secret = current_app.config["STRIPE_WEBHOOK_SECRET"]
-    return stripe.Webhook.construct_event(payload, sig_header, webhook_secret)
+    stripe.WebhookSignature.verify_header(
+        payload, sig_header, webhook_secret,
+        tolerance=stripe.Webhook.DEFAULT_TOLERANCE,
+    )
+    return json.loads(payload)
 
 
-def handle_webhook_event(event):
-    """Process a verified Stripe webhook event.
+def record_webhook_event(event, payload):
+    """Persist a verified event so it can be processed in the background.
 
-    Idempotency: checks stripe_events table before processing.
-    If the event was already processed, returns immediately.
+    `payload` is the raw request body, stored as received.
 
-    Returns (success: bool, message: str).
+    Returns True if it was recorded, or is a failed event worth re-running
+    (process_stripe_event claims it, so concurrent re-runs don't overlap).
+    Returns False if another delivery already owns it — processed, or
+    still pending/processing (the sweep recovers those if a worker died).
     """
-    event_id = event["id"]
-    event_type = event["type"]
+    # Nothing here needs the row as an object, so this goes through Core.
+    # A first delivery is one INSERT ... ON CONFLICT DO NOTHING RETURNING;
+    # only when that hits an existing row (a retry, or the same event
+    # delivered concurrently) do we look at the stored status.
+    stripe_event_id = event["id"]
+    inserted = db.session.execute(
+        _insert_ignoring_conflicts(StripeEvent, StripeEvent.stripe_event_id)
+        .values(
+            stripe_event_id=stripe_event_id,
+            event_type=event["type"],
+            status="pending",
+            payload=payload,
+        )
+        .returning(StripeEvent.id)
+    ).scalar()
+    db.session.commit()
+    if inserted is not None:
+        return True
+
+    # The lookup is a lambda statement so it isn't rebuilt and re-keyed
+    # for the SQL cache on every retry.
+    status = db.session.execute(lambda_stmt(
+        lambda: db.select(StripeEvent.status)
+        .where(StripeEvent.stripe_event_id == stripe_event_id)
+    )).scalar()
+    return status == "failed"
+
+
+def _insert_ignoring_conflicts(model, *index_elements):
+    """INSERT for the session's dialect that skips rows clashing on the
+    given unique columns (Postgres and SQLite share the syntax)."""
+    if db.session.get_bind().dialect.name == "postgresql":
+        stmt = postgresql.insert(model)
+    else:
+        stmt = sqlite.insert(model)
+    return stmt.on_conflict_do_nothing(index_elements=index_elements)
 
-    # --- Idempotency check ---
-    existing = StripeEvent.query.filter_by(
-        stripe_event_id=event_id
-    ).first()
-    if existing:
-        logger.info(f"Duplicate webhook event {event_id}, skipping")
+
+def prune_stripe_events(older_than):
+    """Delete processed events received before `older_than`.
+
+    Stripe stops retrying an event after a few days, so old processed
+    rows only grow the table. Pending and failed events are kept for
+    `flask process-stripe-events`. Returns the number of rows deleted.
+    """
+    result = db.session.execute(
+        db.delete(StripeEvent).where(
+            StripeEvent.status == "processed",
+            StripeEvent.processed_at < older_than,
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def process_stripe_event(event_id, stale_before=None):
+    """Claim a recorded event, run its handler and mark it processed.
+
+    The claim is one conditional UPDATE (pending/failed -> processing), so
+    a redelivery or sweep that races a run already in flight finds nothing
+    to claim and backs off. Pass `stale_before` to also reclaim events
+    stuck in "processing" since before then (a worker died mid-run).
+
+    The handler's writes and the status change commit together. On
+    failure the event is marked "failed" (payload kept) for
+    `flask process-stripe-events` to retry.
+
+    Returns (success: bool, message: str).
+    """
+    claimable = StripeEvent.status.in_(("pending", "failed"))
+    if stale_before is not None:
+        claimable = db.or_(claimable, db.and_(
+            StripeEvent.status == "processing",
+            StripeEvent.processed_at < stale_before,
+        ))
+    claimed = db.session.execute(
+        db.update(StripeEvent)
+        .where(StripeEvent.stripe_event_id == event_id, claimable)
+        .values(status="processing", processed_at=datetime.now(timezone.utc))
+    ).rowcount
+    db.session.commit()
+    if not claimed:
         return True, "already_processed"
 
-    # --- Route to handler ---
-    handlers = {
-        "checkout.session.completed": _handle_checkout_completed,
-        "customer.subscription.updated": _handle_subscription_updated,
-        "customer.subscription.deleted": _handle_subscription_deleted,
-        "invoice.payment_failed": _handle_payment_failed,
-        "invoice.payment_succeeded": _handle_payment_succeeded,
-    }
+    record = db.session.scalars(lambda_stmt(
+        lambda: db.select(StripeEvent).where(StripeEvent.stripe_event_id == event_id)
+    )).first()
 
-    handler = handlers.get(event_type)
+    handler = _WEBHOOK_HANDLERS.get(record.event_type)
     if handler:
         try:
-            handler(event)
+            handler(json.loads(record.payload))
         except Exception as e:
-            logger.error(f"Error handling {event_type}: {e}", exc_info=True)
+            logger.error(f"Error handling {record.event_type}: {e}", exc_info=True)
             db.session.rollback()
+            record.status = "failed"
+            record.error = str(e)
+            db.session.commit()
             return False, str(e)
 
-    # --- Record event for idempotency ---
-    stripe_event = StripeEvent(
-        stripe_event_id=event_id,
-        event_type=event_type,
-    )
-    db.session.add(stripe_event)
+    record.status = "processed"
+    record.payload = None
+    record.error = None
+    record.processed_at = datetime.now(timezone.utc)
     db.session.commit()
 
     return True, "processed"
@@ -570,7 +652,6 @@ def _handle_subscription_deleted(event):
 
     existing_sub.status = "canceled"
     existing_sub.cancel_at_period_end = False
-    db.session.flush()
 
     derive_site_status(existing_sub.workspace_id, "canceled")
 
@@ -601,7 +682,6 @@ def _handle_payment_failed(event):
         ).first()
         if sub and sub.status != "past_due":
             sub.status = "past_due"
-            db.session.flush()
 
     log_billing_audit(workspace_id, "invoice.payment_failed", {
         "stripe_subscription_id": stripe_subscription_id,
@@ -631,10 +711,18 @@ def _handle_payment_succeeded(event):
         ).first()
         if sub and sub.status in ("past_due", "unpaid"):
             sub.status = "active"
-            db.session.flush()
             derive_site_status(workspace_id, "active")
 
     log_billing_audit(workspace_id, "invoice.payment_succeeded", {
         "stripe_subscription_id": stripe_subscription_id,
         "amount_paid": invoice.get("amount_paid"),
     })
+
+
+_WEBHOOK_HANDLERS = {
+    "checkout.session.completed": _handle_checkout_completed,
+    "customer.subscription.updated": _handle_subscription_updated,
+    "customer.subscription.deleted": _handle_subscription_deleted,
+    "invoice.payment_failed": _handle_payment_failed,
+    "invoice.payment_succeeded": _handle_payment_succeeded,
+}
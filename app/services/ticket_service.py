@@ -4,13 +4,17 @@ All ticket content (subject, description, messages) is sanitized with
 bleach.clean() to strip HTML tags. Status transitions are enforced via
 Ticket.VALID_TRANSITIONS dict.
 
-Functions flush but do NOT commit — the caller commits.
+Functions write through the session but do NOT commit — the caller
+commits. Row inserts use INSERT ... RETURNING so the new objects come back
+fully loaded in one round-trip; follow-up writes (audit events, activity
+timestamps) stay pending and go out with the commit.
 """
 
 import logging
 
 import bleach
 from datetime import datetime, timezone
+from sqlalchemy.orm import raiseload
 
 from app.extensions import db
 from app.models.ticket import Ticket, TicketMessage, TicketAttachment
@@ -19,6 +23,18 @@ from app.models.audit import AuditEvent
 logger = logging.getLogger(__name__)
 
 
+class TicketNotFound(ValueError):
+    """A ticket lookup missed or the ticket belongs to another workspace.
+
+    A ValueError subclass, so callers that only flash errors can keep
+    catching ValueError; catch it first to tell it apart from validation
+    errors.
+    """
+
+    def __init__(self, message="Ticket not found."):
+        super().__init__(message)
+
+
 def _sanitize(text):
     """Strip all HTML tags from user input."""
     if text is None:
@@ -58,21 +74,24 @@ def create_ticket(workspace_id, site_id, user_id, subject, description, category
 
     now = datetime.now(timezone.utc)
 
-    ticket = Ticket(
-        workspace_id=workspace_id,
-        site_id=site_id,
-        author_user_id=user_id,
-        subject=subject,
-        description=description,
-        category=category,
-        status="open",
-        priority="normal",
-        last_activity_at=now,
-    )
-    db.session.add(ticket)
-    db.session.flush()
+    # INSERT ... RETURNING hands back the row with its server defaults
+    # filled in, so nothing has to be re-SELECTed before the commit.
+    ticket = db.session.scalars(
+        db.insert(Ticket).returning(Ticket),
+        [{
+            "workspace_id": workspace_id,
+            "site_id": site_id,
+            "author_user_id": user_id,
+            "subject": subject,
+            "description": description,
+            "category": category,
+            "status": "open",
+            "priority": "normal",
+            "last_activity_at": now,
+        }],
+    ).one()
 
-    # Audit log
+    # Audit log — goes out with the caller's commit
     audit = AuditEvent(
         workspace_id=workspace_id,
         actor_user_id=user_id,
@@ -84,12 +103,11 @@ def create_ticket(workspace_id, site_id, user_id, subject, description, category
         },
     )
     db.session.add(audit)
-    db.session.flush()
 
     return ticket
 
 
-def add_message(ticket_id, user_id, message, is_internal=False):
+def add_message(ticket_id, user_id, message, is_internal=False, workspace_id=None):
     """Add a message to a ticket's thread.
 
     Args:
@@ -97,30 +115,40 @@ def add_message(ticket_id, user_id, message, is_internal=False):
         user_id: Author's user UUID string.
         message: Message body (will be sanitized).
         is_internal: If True, only visible to admins.
+        workspace_id: If given, the ticket must belong to this workspace
+            (tenant check folded into the ticket lookup).
 
     Returns:
-        The created TicketMessage object.
+        The created TicketMessage object (msg.ticket is loaded).
 
     Raises:
-        ValueError: If ticket not found or message is empty.
+        TicketNotFound: If the ticket is not found (or not in workspace_id).
+        ValueError: If the message is empty.
     """
     message_text = _sanitize(message)
     if not message_text:
         raise ValueError("Message cannot be empty.")
 
-    ticket = db.session.get(Ticket, ticket_id)
+    if workspace_id is None:
+        ticket = db.session.get(Ticket, ticket_id)
+    else:
+        ticket = Ticket.query.filter_by(
+            id=ticket_id, workspace_id=workspace_id
+        ).first()
     if ticket is None:
-        raise ValueError(f"Ticket {ticket_id} not found.")
+        raise TicketNotFound()
 
     now = datetime.now(timezone.utc)
 
-    msg = TicketMessage(
-        ticket_id=ticket_id,
-        author_user_id=user_id,
-        message=message_text,
-        is_internal=bool(is_internal),
-    )
-    db.session.add(msg)
+    msg = db.session.scalars(
+        db.insert(TicketMessage).returning(TicketMessage),
+        [{
+            "ticket_id": ticket_id,
+            "author_user_id": user_id,
+            "message": message_text,
+            "is_internal": bool(is_internal),
+        }],
+    ).unique().one()  # unique(): attachments are a joined eager load
 
     # Update ticket activity timestamp
     ticket.last_activity_at = now
@@ -138,9 +166,8 @@ def add_message(ticket_id, user_id, message, is_internal=False):
     ):
         ticket.status = "in_progress"
 
-    db.session.flush()
-
-    # Audit log
+    # Audit log — the ticket UPDATE and this INSERT go out with the
+    # caller's commit
     audit = AuditEvent(
         workspace_id=ticket.workspace_id,
         actor_user_id=user_id,
@@ -151,7 +178,6 @@ def add_message(ticket_id, user_id, message, is_internal=False):
         },
     )
     db.session.add(audit)
-    db.session.flush()
 
     return msg
 
@@ -167,35 +193,42 @@ def add_attachments(ticket_id, message_id, files):
     Returns:
         List of created TicketAttachment objects.
     """
-    from app.services.storage_service import validate_file, upload_file
+    from app.services.storage_service import validate_file, upload_files
 
-    attachments = []
+    valid = []
     for file in files:
         ok, error = validate_file(file)
         if not ok:
             logger.warning(f"Skipping invalid attachment: {error}")
             continue
-
-        try:
-            meta = upload_file(file, ticket_id, message_id)
-            attachment = TicketAttachment(
-                message_id=message_id,
-                ticket_id=ticket_id,
-                filename=meta["filename"],
-                storage_path=meta["storage_path"],
-                content_type=meta["content_type"],
-                file_size=meta["file_size"],
-                public_url=meta["public_url"],
-            )
-            db.session.add(attachment)
-            attachments.append(attachment)
-        except Exception as e:
-            logger.error(f"Failed to upload attachment {file.filename}: {e}")
+        valid.append(file)
+
+    # Uploads run concurrently, within the request: staging them on the
+    # web container's disk for a background task wouldn't survive a
+    # redeploy. The rows then go in as one multi-row INSERT ... RETURNING
+    # on the request's session.
+    rows = []
+    for file, meta in upload_files(valid, ticket_id, message_id):
+        if isinstance(meta, Exception):
+            logger.error(f"Failed to upload attachment {file.filename}: {meta}")
             continue
 
-    if attachments:
-        db.session.flush()
-    return attachments
+        rows.append({
+            "message_id": message_id,
+            "ticket_id": ticket_id,
+            "filename": meta["filename"],
+            "storage_path": meta["storage_path"],
+            "content_type": meta["content_type"],
+            "file_size": meta["file_size"],
+            "public_url": meta["public_url"],
+        })
+
+    if not rows:
+        return []
+    return db.session.scalars(
+        db.insert(TicketAttachment).returning(TicketAttachment, sort_by_parameter_order=True),
+        rows,
+    ).all()
 
 
 def update_status(ticket_id, new_status, actor_user_id):
@@ -210,11 +243,12 @@ def update_status(ticket_id, new_status, actor_user_id):
         The updated Ticket.
 
     Raises:
-        ValueError: If ticket not found, status invalid, or transition not allowed.
+        TicketNotFound: If the ticket is not found.
+        ValueError: If status invalid or transition not allowed.
     """
     ticket = db.session.get(Ticket, ticket_id)
     if ticket is None:
-        raise ValueError(f"Ticket {ticket_id} not found.")
+        raise TicketNotFound(f"Ticket {ticket_id} not found.")
 
     if new_status not in Ticket.STATUSES:
         raise ValueError(
@@ -269,11 +303,12 @@ def assign_ticket(ticket_id, assigned_to_user_id, actor_user_id):
         The updated Ticket.
 
     Raises:
-        ValueError: If ticket not found or assignee is not admin.
+        TicketNotFound: If the ticket is not found.
+        ValueError: If assignee is not admin.
     """
     ticket = db.session.get(Ticket, ticket_id)
     if ticket is None:
-        raise ValueError(f"Ticket {ticket_id} not found.")
+        raise TicketNotFound(f"Ticket {ticket_id} not found.")
 
     if assigned_to_user_id is not None:
         from app.models.user import User
@@ -433,11 +468,12 @@ def update_category(ticket_id, new_category, actor_user_id):
         The updated Ticket.
 
     Raises:
-        ValueError: If ticket not found or category invalid.
+        TicketNotFound: If the ticket is not found.
+        ValueError: If category invalid.
     """
     ticket = db.session.get(Ticket, ticket_id)
     if ticket is None:
-        raise ValueError(f"Ticket {ticket_id} not found.")
+        raise TicketNotFound(f"Ticket {ticket_id} not found.")
 
     if new_category and new_category not in Ticket.CATEGORIES:
         raise ValueError(
@@ -479,7 +515,14 @@ def list_tickets_for_workspace(workspace_id, status_filter=None):
     Returns:
         List of Ticket objects, ordered by last_activity_at desc.
     """
-    query = Ticket.query.filter_by(workspace_id=workspace_id)
+    # The list page renders ticket columns only; raiseload turns any
+    # relationship access on these rows into an error instead of a
+    # per-ticket lazy load.
+    query = (
+        Ticket.query
+        .options(raiseload("*"))
+        .filter_by(workspace_id=workspace_id)
+    )
     if status_filter and status_filter in Ticket.STATUSES:
         query = query.filter_by(status=status_filter)
     return query.order_by(Ticket.last_activity_at.desc()).all()
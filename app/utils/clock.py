@@ -0,0 +1,22 @@
+"""Request-scoped clock.
+
+request_now() hands out one UTC timestamp per request, taken on first use
+and kept on g, so per-row checks over a list (e.g. WorkspaceInvite.is_expired
+in the admin invite tables) share a single datetime instead of each taking
+its own. Outside a request (CLI, background tasks) it is just the current
+time.
+"""
+
+from datetime import datetime, timezone
+
+from flask import g, has_request_context
+
+
+def request_now():
+    """Current UTC time, fixed for the duration of the request."""
+    if not has_request_context():
+        return datetime.now(timezone.utc)
+    now = g.get("now")
+    if now is None:
+        now = g.now = datetime.now(timezone.utc)
+    return now
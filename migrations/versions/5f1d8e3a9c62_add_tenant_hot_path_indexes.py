@@ -0,0 +1,28 @@
+"""add tenant hot path indexes
+
+Revision ID: 5f1d8e3a9c62
+Revises: e4a9c2f7d1b8
+Create Date: 2026-02-25 14:03:27.114095
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1d8e3a9c62'
+down_revision = 'e4a9c2f7d1b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Latest subscription per workspace (tenant middleware, every portal request)
+    op.create_index('ix_billing_subscriptions_workspace_created', 'billing_subscriptions', ['workspace_id', 'created_at'], unique=False)
+    # Recent tickets per workspace (dashboard, ticket list)
+    op.create_index('ix_tickets_workspace_activity', 'tickets', ['workspace_id', 'last_activity_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tickets_workspace_activity', table_name='tickets')
+    op.drop_index('ix_billing_subscriptions_workspace_created', table_name='billing_subscriptions')
@@ -0,0 +1,31 @@
+"""add kanban position indexes
+
+Revision ID: 7c2e9a41b5d3
+Revises: 03e7ed406604
+Create Date: 2026-02-24 10:12:41.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9a41b5d3'
+down_revision = '03e7ed406604'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Board query: WHERE kanban_column_id = ? ORDER BY position
+    op.create_index(
+        'ix_kanban_cards_column_position',
+        'kanban_cards',
+        ['kanban_column_id', 'position'],
+    )
+    op.create_index('ix_kanban_columns_position', 'kanban_columns', ['position'])
+
+
+def downgrade():
+    op.drop_index('ix_kanban_columns_position', table_name='kanban_columns')
+    op.drop_index('ix_kanban_cards_column_position', table_name='kanban_cards')
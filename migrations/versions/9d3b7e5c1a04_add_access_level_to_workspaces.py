@@ -0,0 +1,43 @@
+"""add access_level to workspaces
+
+Revision ID: 9d3b7e5c1a04
+Revises: 5f1d8e3a9c62
+Create Date: 2026-02-26 10:41:52.608317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3b7e5c1a04'
+down_revision = '5f1d8e3a9c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('workspaces', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('access_level', sa.String(length=16), server_default='subscribe', nullable=False))
+        batch_op.create_index(batch_op.f('ix_workspaces_access_level'), ['access_level'], unique=False)
+
+    # Backfill from each workspace's newest subscription
+    op.execute("""
+        UPDATE workspaces SET access_level = COALESCE((
+            SELECT CASE
+                WHEN s.status IN ('active', 'trialing') THEN 'full'
+                WHEN s.status = 'past_due' THEN 'read_only'
+                ELSE 'blocked'
+            END
+            FROM billing_subscriptions s
+            WHERE s.workspace_id = workspaces.id
+            ORDER BY s.created_at DESC
+            LIMIT 1
+        ), 'subscribe')
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('workspaces', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_workspaces_access_level'))
+        batch_op.drop_column('access_level')
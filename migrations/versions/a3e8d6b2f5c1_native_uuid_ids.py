@@ -0,0 +1,81 @@
+"""store id columns as native uuid on postgres
+
+Revision ID: a3e8d6b2f5c1
+Revises: c6a2f9d4e817
+Create Date: 2026-02-27 10:04:51.318277
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e8d6b2f5c1'
+down_revision = 'c6a2f9d4e817'
+branch_labels = None
+depends_on = None
+
+
+# Every primary / foreign key column typed UUIDString in app/models
+UUID_COLUMNS = {
+    'kanban_columns': ['id'],
+    'pitch_templates': ['id'],
+    'prospects': ['id', 'workspace_id'],
+    'stripe_events': ['id'],
+    'users': ['id'],
+    'workspaces': ['id', 'prospect_id'],
+    'audit_events': ['id', 'workspace_id', 'actor_user_id'],
+    'billing_customers': ['id', 'workspace_id'],
+    'billing_subscriptions': ['id', 'workspace_id'],
+    'kanban_cards': ['id', 'kanban_column_id', 'prospect_id'],
+    'prospect_activities': ['id', 'prospect_id', 'actor_user_id'],
+    'sites': ['id', 'workspace_id'],
+    'workspace_members': ['id', 'user_id', 'workspace_id'],
+    'workspace_settings': ['id', 'workspace_id'],
+    'contact_form_configs': ['id', 'site_id'],
+    'tickets': ['id', 'workspace_id', 'site_id', 'author_user_id', 'assigned_to_user_id'],
+    'workspace_invites': ['id', 'workspace_id', 'site_id'],
+    'ticket_messages': ['id', 'ticket_id', 'author_user_id'],
+    'ticket_attachments': ['id', 'message_id', 'ticket_id'],
+}
+
+
+def _convert(new_type, using):
+    # SQLite keeps storing ids as text; only Postgres has a uuid type
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # Postgres won't retype a column while a foreign key ties it to a
+    # column of the old type, so drop every FK between the tables first
+    # and put them back (same names / ON DELETE) afterwards.
+    inspector = sa.inspect(bind)
+    foreign_keys = [
+        (table, fk)
+        for table in UUID_COLUMNS
+        for fk in inspector.get_foreign_keys(table)
+    ]
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+    for table, columns in UUID_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'ALTER TABLE {table} ALTER COLUMN {column} '
+                f'TYPE {new_type} USING {column}::{using}'
+            )
+
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'],
+            fk['constrained_columns'], fk['referred_columns'],
+            ondelete=fk.get('options', {}).get('ondelete'),
+        )
+
+
+def upgrade():
+    _convert('uuid', 'uuid')
+
+
+def downgrade():
+    _convert('varchar(36)', 'text')
@@ -0,0 +1,43 @@
+"""add reminder_tier to prospect activities
+
+Revision ID: a9d2e5c7f3b1
+Revises: f1e6b3a8d4c7
+Create Date: 2026-03-01 10:27:18.552940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d2e5c7f3b1'
+down_revision = 'f1e6b3a8d4c7'
+branch_labels = None
+depends_on = None
+
+REMINDER_TIERS = ('d3', 'd10', 'd30')
+
+
+def upgrade():
+    with op.batch_alter_table('prospect_activities', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reminder_tier', sa.String(length=8), nullable=True))
+
+    # Reminders were only recorded in the note text until now
+    for tier in REMINDER_TIERS:
+        op.execute(
+            "UPDATE prospect_activities SET reminder_tier = '{0}' "
+            "WHERE activity_type = 'email' AND note LIKE '%Reminder {0} sent%'".format(tier)
+        )
+
+    op.create_index(
+        'ix_prospect_activities_reminder_tier', 'prospect_activities',
+        ['prospect_id', 'reminder_tier'], unique=False,
+        postgresql_where=sa.text('reminder_tier IS NOT NULL'),
+        sqlite_where=sa.text('reminder_tier IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_prospect_activities_reminder_tier', table_name='prospect_activities')
+    with op.batch_alter_table('prospect_activities', schema=None) as batch_op:
+        batch_op.drop_column('reminder_tier')
@@ -0,0 +1,28 @@
+"""add prospect_id/activity_type/created_at index to prospect activities
+
+Revision ID: b4c7e2d9a6f8
+Revises: a9d2e5c7f3b1
+Create Date: 2026-03-01 14:52:41.307815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4c7e2d9a6f8'
+down_revision = 'a9d2e5c7f3b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_prospect_activities_prospect_type_created', 'prospect_activities',
+        ['prospect_id', 'activity_type', 'created_at'], unique=False,
+        postgresql_include=['reminder_tier'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_prospect_activities_prospect_type_created', table_name='prospect_activities')
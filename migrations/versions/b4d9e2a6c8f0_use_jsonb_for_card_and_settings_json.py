@@ -0,0 +1,67 @@
+"""use jsonb for kanban card labels/comments and workspace settings
+
+Revision ID: b4d9e2a6c8f0
+Revises: f7c3a1d9e5b2
+Create Date: 2026-02-28 09:12:44.873106
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d9e2a6c8f0'
+down_revision = 'f7c3a1d9e5b2'
+branch_labels = None
+depends_on = None
+
+
+def _clean_card_json():
+    """Rewrite card labels/comments that aren't valid JSON lists as '[]'.
+
+    The columns were free text, so the API could store anything a client
+    sent; the jsonb cast (and the JSON type's decoder on SQLite) would
+    choke on those rows.
+    """
+    bind = op.get_bind()
+    rows = bind.execute(sa.text('SELECT id, labels, comments FROM kanban_cards')).fetchall()
+    for card_id, labels, comments in rows:
+        fixed = {}
+        for key, value in (('labels', labels), ('comments', comments)):
+            try:
+                ok = isinstance(json.loads(value), list)
+            except (TypeError, ValueError):
+                ok = False
+            if not ok:
+                fixed[key] = '[]'
+        if fixed:
+            sets = ', '.join(f'{key} = :{key}' for key in fixed)
+            bind.execute(
+                sa.text(f'UPDATE kanban_cards SET {sets} WHERE id = :id'),
+                {'id': card_id, **fixed},
+            )
+
+
+def upgrade():
+    _clean_card_json()
+
+    # SQLite stores JSON as text either way
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE kanban_cards ALTER COLUMN labels TYPE jsonb USING labels::jsonb')
+    op.execute('ALTER TABLE kanban_cards ALTER COLUMN comments TYPE jsonb USING comments::jsonb')
+    op.execute('ALTER TABLE workspace_settings ALTER COLUMN plan_features TYPE jsonb USING plan_features::jsonb')
+    op.execute('ALTER TABLE workspace_settings ALTER COLUMN notification_prefs TYPE jsonb USING notification_prefs::jsonb')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE workspace_settings ALTER COLUMN notification_prefs TYPE json USING notification_prefs::json')
+    op.execute('ALTER TABLE workspace_settings ALTER COLUMN plan_features TYPE json USING plan_features::json')
+    op.execute('ALTER TABLE kanban_cards ALTER COLUMN comments TYPE text USING comments::text')
+    op.execute('ALTER TABLE kanban_cards ALTER COLUMN labels TYPE text USING labels::text')
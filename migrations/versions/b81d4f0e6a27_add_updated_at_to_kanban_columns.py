@@ -0,0 +1,26 @@
+"""add updated_at to kanban_columns
+
+Revision ID: b81d4f0e6a27
+Revises: 7c2e9a41b5d3
+Create Date: 2026-02-24 11:40:03.227916
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81d4f0e6a27'
+down_revision = '7c2e9a41b5d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('kanban_columns', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('kanban_columns', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,28 @@
+"""add prospect activity timeline index
+
+Revision ID: c6a2f9d4e817
+Revises: 9d3b7e5c1a04
+Create Date: 2026-02-26 15:22:08.930541
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a2f9d4e817'
+down_revision = '9d3b7e5c1a04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (prospect_id, created_at) serves the timeline's ORDER BY and replaces
+    # the single-column prospect_id index
+    op.create_index('ix_prospect_activities_prospect_created', 'prospect_activities', ['prospect_id', 'created_at'], unique=False)
+    op.drop_index('ix_prospect_activities_prospect_id', table_name='prospect_activities')
+
+
+def downgrade():
+    op.create_index('ix_prospect_activities_prospect_id', 'prospect_activities', ['prospect_id'], unique=False)
+    op.drop_index('ix_prospect_activities_prospect_created', table_name='prospect_activities')
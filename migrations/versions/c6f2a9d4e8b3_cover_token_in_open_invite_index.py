@@ -0,0 +1,42 @@
+"""cover token and expires_at in the open-invite index
+
+Revision ID: c6f2a9d4e8b3
+Revises: b4c7e2d9a6f8
+Create Date: 2026-03-01 16:08:27.941362
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f2a9d4e8b3'
+down_revision = 'b4c7e2d9a6f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # INCLUDE columns are Postgres-only; the SQLite index is unchanged
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_workspace_invites_open', table_name='workspace_invites')
+    op.create_index(
+        'ix_workspace_invites_open', 'workspace_invites', ['workspace_id', 'created_at'], unique=False,
+        postgresql_include=['token', 'expires_at'],
+        postgresql_where=sa.text('used_at IS NULL'),
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_workspace_invites_open', table_name='workspace_invites')
+    op.create_index(
+        'ix_workspace_invites_open', 'workspace_invites', ['workspace_id', 'created_at'], unique=False,
+        postgresql_where=sa.text('used_at IS NULL'),
+    )
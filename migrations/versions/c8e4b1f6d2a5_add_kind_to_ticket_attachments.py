@@ -0,0 +1,34 @@
+"""add kind to ticket attachments
+
+Revision ID: c8e4b1f6d2a5
+Revises: d5a1f8c3b7e9
+Create Date: 2026-02-28 13:20:36.140752
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e4b1f6d2a5'
+down_revision = 'd5a1f8c3b7e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ticket_attachments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('kind', sa.SmallInteger(), server_default='0', nullable=False))
+
+    # AttachmentKind: 0 other, 1 image, 2 pdf
+    op.execute(
+        "UPDATE ticket_attachments SET kind = CASE "
+        "WHEN content_type LIKE 'image/%' THEN 1 "
+        "WHEN content_type = 'application/pdf' THEN 2 "
+        "ELSE 0 END"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('ticket_attachments', schema=None) as batch_op:
+        batch_op.drop_column('kind')
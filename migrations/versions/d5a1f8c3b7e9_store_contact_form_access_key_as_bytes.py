@@ -0,0 +1,58 @@
+"""store contact form access keys as raw bytes
+
+Revision ID: d5a1f8c3b7e9
+Revises: b4d9e2a6c8f0
+Create Date: 2026-02-28 11:47:05.519384
+
+"""
+import base64
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1f8c3b7e9'
+down_revision = 'b4d9e2a6c8f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Keys are unpadded base64url; pad and map to the standard alphabet
+        # so decode() accepts them. The unique constraint carries over.
+        op.execute(
+            "ALTER TABLE contact_form_configs ALTER COLUMN access_key TYPE bytea "
+            "USING decode(translate(access_key, '-_', '+/') "
+            "|| repeat('=', (4 - length(access_key) % 4) % 4), 'base64')"
+        )
+        return
+
+    # SQLite: column types are advisory, so rewrite the values in place
+    rows = bind.execute(sa.text('SELECT id, access_key FROM contact_form_configs')).fetchall()
+    for config_id, key in rows:
+        raw = base64.urlsafe_b64decode(key + '=' * (-len(key) % 4))
+        bind.execute(
+            sa.text('UPDATE contact_form_configs SET access_key = :key WHERE id = :id'),
+            {'key': raw, 'id': config_id},
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE contact_form_configs ALTER COLUMN access_key TYPE varchar(100) "
+            "USING rtrim(translate(encode(access_key, 'base64'), '+/', '-_'), '=')"
+        )
+        return
+
+    rows = bind.execute(sa.text('SELECT id, access_key FROM contact_form_configs')).fetchall()
+    for config_id, raw in rows:
+        key = base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+        bind.execute(
+            sa.text('UPDATE contact_form_configs SET access_key = :key WHERE id = :id'),
+            {'key': key, 'id': config_id},
+        )
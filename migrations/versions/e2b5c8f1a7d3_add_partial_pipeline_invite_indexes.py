@@ -0,0 +1,36 @@
+"""add partial indexes for open prospects and unused invites
+
+Revision ID: e2b5c8f1a7d3
+Revises: a3e8d6b2f5c1
+Create Date: 2026-02-27 14:38:12.604915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b5c8f1a7d3'
+down_revision = 'a3e8d6b2f5c1'
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUS = "status IN ('researching', 'site_built', 'pitched')"
+
+
+def upgrade():
+    op.create_index(
+        'ix_prospects_active', 'prospects', ['status', 'updated_at'], unique=False,
+        postgresql_where=sa.text(ACTIVE_STATUS),
+        sqlite_where=sa.text(ACTIVE_STATUS),
+    )
+    op.create_index(
+        'ix_workspace_invites_open', 'workspace_invites', ['workspace_id', 'created_at'], unique=False,
+        postgresql_where=sa.text('used_at IS NULL'),
+        sqlite_where=sa.text('used_at IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_workspace_invites_open', table_name='workspace_invites')
+    op.drop_index('ix_prospects_active', table_name='prospects')
@@ -0,0 +1,31 @@
+"""add processing state to stripe_events
+
+Revision ID: e4a9c2f7d1b8
+Revises: b81d4f0e6a27
+Create Date: 2026-02-25 09:12:41.508331
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c2f7d1b8'
+down_revision = 'b81d4f0e6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows were all processed synchronously before being recorded.
+    with op.batch_alter_table('stripe_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='processed', nullable=False))
+        batch_op.add_column(sa.Column('payload', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('error', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('stripe_events', schema=None) as batch_op:
+        batch_op.drop_column('error')
+        batch_op.drop_column('payload')
+        batch_op.drop_column('status')
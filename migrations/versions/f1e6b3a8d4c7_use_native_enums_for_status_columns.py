@@ -0,0 +1,104 @@
+"""use native enums for status/category columns
+
+Revision ID: f1e6b3a8d4c7
+Revises: c8e4b1f6d2a5
+Create Date: 2026-02-28 15:02:51.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1e6b3a8d4c7'
+down_revision = 'c8e4b1f6d2a5'
+branch_labels = None
+depends_on = None
+
+
+# (table, column) -> (enum type, values, fallback for out-of-range rows)
+ENUM_COLUMNS = {
+    ('prospects', 'status'): (
+        'prospect_status',
+        ('researching', 'site_built', 'pitched', 'converted', 'declined'),
+        'researching',
+    ),
+    ('prospect_activities', 'activity_type'): (
+        'prospect_activity_type',
+        ('email', 'text', 'call', 'note'),
+        'note',
+    ),
+    ('tickets', 'status'): (
+        'ticket_status',
+        ('open', 'in_progress', 'waiting_on_client', 'done'),
+        'open',
+    ),
+    ('tickets', 'category'): (
+        'ticket_category',
+        ('content_update', 'bug', 'question'),
+        None,
+    ),
+    ('tickets', 'priority'): (
+        'ticket_priority',
+        ('low', 'normal', 'high'),
+        'normal',
+    ),
+    ('pitch_templates', 'category'): (
+        'pitch_template_category',
+        ('initial', 'followup'),
+        'initial',
+    ),
+}
+
+ACTIVE_STATUS = "status IN ('researching', 'site_built', 'pitched')"
+
+
+def _create_active_prospects_index():
+    op.create_index(
+        'ix_prospects_active', 'prospects', ['status', 'updated_at'], unique=False,
+        postgresql_where=sa.text(ACTIVE_STATUS),
+    )
+
+
+def upgrade():
+    # SQLite has no enum type; the columns stay VARCHAR there
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # The partial index predicate compares status as text; rebuild it
+    # against the enum so the planner can still match it.
+    op.drop_index('ix_prospects_active', table_name='prospects')
+
+    for (table, column), (type_name, values, fallback) in ENUM_COLUMNS.items():
+        sa.Enum(*values, name=type_name).create(bind, checkfirst=True)
+        bind.execute(
+            sa.text(
+                f'UPDATE {table} SET {column} = :fallback '
+                f'WHERE {column} IS NOT NULL AND {column} NOT IN :values'
+            ).bindparams(sa.bindparam('values', expanding=True)),
+            {'fallback': fallback, 'values': list(values)},
+        )
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE {type_name} USING {column}::{type_name}'
+        )
+
+    _create_active_prospects_index()
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_prospects_active', table_name='prospects')
+
+    for (table, column), (type_name, values, _) in ENUM_COLUMNS.items():
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE VARCHAR(50) USING {column}::text'
+        )
+        sa.Enum(*values, name=type_name).drop(bind, checkfirst=True)
+
+    _create_active_prospects_index()
@@ -0,0 +1,46 @@
+"""number kanban cards from a sequence
+
+Revision ID: f7c3a1d9e5b2
+Revises: e2b5c8f1a7d3
+Create Date: 2026-02-27 16:51:30.227418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c3a1d9e5b2'
+down_revision = 'e2b5c8f1a7d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite has no sequences; the app keeps numbering cards inline there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE SEQUENCE kanban_card_num_seq OWNED BY kanban_cards.card_number')
+    op.execute(
+        "SELECT setval('kanban_card_num_seq', COALESCE(MAX(card_number), 0) + 1, false) "
+        "FROM kanban_cards"
+    )
+    # Number any cards created before card_number existed
+    op.execute(
+        "UPDATE kanban_cards SET card_number = nextval('kanban_card_num_seq') "
+        "WHERE card_number IS NULL"
+    )
+    # Rows inserted outside the ORM get a number too
+    op.execute(
+        "ALTER TABLE kanban_cards ALTER COLUMN card_number "
+        "SET DEFAULT nextval('kanban_card_num_seq')"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('ALTER TABLE kanban_cards ALTER COLUMN card_number DROP DEFAULT')
+    op.execute('DROP SEQUENCE kanban_card_num_seq')
@@ -90,6 +90,10 @@ def reset():
         n = BillingSubscription.query.delete()
         print(f"    billing_subscriptions: {n}")
 
+        # A bulk delete skips the after_flush hook that mirrors the newest
+        # subscription onto workspaces.access_level, so reset it here
+        Workspace.query.update({Workspace.access_level: "subscribe"})
+
         n = BillingCustomer.query.delete()
         print(f"    billing_customers: {n}")
 
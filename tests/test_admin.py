@@ -3,7 +3,7 @@
 Covers:
 - Dashboard (metrics, pipeline counts)
 - Prospects CRUD (list, new, detail, update, convert)
-- Workspaces (list, detail, invite generation)
+- Workspaces (list with latest subscription/invite, detail, invite generation)
 - Tickets (list, detail, reply with internal notes, status changes, assignment)
 - Site status override
 - Auth guards (non-admin rejected)
@@ -12,6 +12,7 @@ Covers:
 import secrets
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy.orm import undefer
 from werkzeug.security import generate_password_hash
 
 from app.extensions import db
@@ -360,6 +361,55 @@ class TestAdminWorkspaces:
         assert b"Workspaces" in resp.data
         assert b"Test Pizza Shop" in resp.data
 
+    def test_workspace_list_picks_newest_subscription_and_invite(self, app, seed_data):
+        """Latest rows are picked by created_at, not by the (random) id."""
+        from app.blueprints.admin import _latest_per_workspace
+
+        ws_id = seed_data["workspace_id"]
+        old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        new = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        with app.app_context():
+            db.session.add_all([
+                BillingSubscription(
+                    id="ffffffff-ffff-4fff-bfff-ffffffffffff", workspace_id=ws_id,
+                    stripe_subscription_id="sub_old", status="canceled", created_at=old,
+                ),
+                BillingSubscription(
+                    id="00000000-0000-4000-8000-000000000000", workspace_id=ws_id,
+                    stripe_subscription_id="sub_new", status="active", created_at=new,
+                ),
+                WorkspaceInvite(
+                    id="ffffffff-ffff-4fff-bfff-ffffffffffff", workspace_id=ws_id,
+                    site_id=seed_data["site_id"], email="old@example.com", token=secrets.token_urlsafe(32),
+                    expires_at=new, created_at=old,
+                ),
+                WorkspaceInvite(
+                    id="00000000-0000-4000-8000-000000000000", workspace_id=ws_id,
+                    site_id=seed_data["site_id"], email="new@example.com", token=secrets.token_urlsafe(32),
+                    expires_at=new, created_at=new,
+                ),
+            ])
+            db.session.commit()
+
+            subs = _latest_per_workspace(BillingSubscription, [ws_id])
+            invites = _latest_per_workspace(WorkspaceInvite, [ws_id])
+            assert subs[ws_id].stripe_subscription_id == "sub_new"
+            assert invites[ws_id].email == "new@example.com"
+
+    def test_member_count_column_property(self, app, seed_data):
+        with app.app_context():
+            ws = db.session.scalars(
+                db.select(Workspace)
+                .options(undefer(Workspace.member_count))
+                .where(Workspace.id == seed_data["workspace_id"])
+            ).one()
+            expected = db.session.scalar(
+                db.select(db.func.count(WorkspaceMember.id))
+                .where(WorkspaceMember.workspace_id == ws.id)
+            )
+            assert expected >= 1
+            assert ws.member_count == expected
+
     def test_workspace_detail_loads(self, client, app, seed_data):
         login_admin(client, app)
         ws_id = seed_data["workspace_id"]
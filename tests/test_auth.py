@@ -9,6 +9,7 @@ Covers:
 - Login with valid credentials
 - Login with invalid credentials
 - Login with deactivated account
+- Session user loader skips credential columns
 - Logout
 - Open redirect protection
 - No-token redirect to login
@@ -16,6 +17,10 @@ Covers:
 - Registration creates audit event
 """
 
+from sqlalchemy import inspect
+from werkzeug.security import check_password_hash
+
+from app.extensions import db, load_user
 from app.models.user import User
 from app.models.workspace import WorkspaceMember
 from app.models.invite import WorkspaceInvite
@@ -324,6 +329,16 @@ class TestLogin:
         location = resp.headers["Location"]
         assert "evil.com" not in location
 
+    def test_user_loader_skips_credential_columns(self, app, seed_data):
+        """The per-request user load leaves the password hash unloaded."""
+        with app.app_context():
+            db.session.expunge_all()
+            user = load_user(seed_data["admin_id"])
+            assert user.email == "admin@waas.local"
+            assert user.is_active
+            assert "password_hash" in inspect(user).unloaded
+            assert check_password_hash(user.password_hash, "admin123")  # loads on demand
+
 
 class TestLogout:
     """Tests for the /auth/logout route."""
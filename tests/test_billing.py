@@ -8,6 +8,7 @@ Covers:
 - Customer portal route (creates portal session, redirects)
 - Customer portal without billing customer
 - Billing overview page (active subscriber vs no subscription)
+- Deriving site status for several workspaces at once
 """
 
 from datetime import datetime, timezone
@@ -206,3 +207,30 @@ class TestBilling:
         )
         assert resp.status_code == 302
         assert "/auth/login" in resp.headers["Location"]
+
+
+class TestDeriveSiteStatuses:
+
+    def test_updates_each_workspace_site(self, app, seed_data):
+        from app.models.site import Site
+        from app.models.workspace import Workspace
+        from app.services.billing_service import derive_site_statuses
+
+        with app.app_context():
+            other = Workspace(name="Other Shop")
+            db.session.add(other)
+            db.session.flush()
+            db.session.add(Site(
+                workspace_id=other.id, site_slug="other-shop",
+                display_name="Other Shop", status="active",
+            ))
+            db.session.flush()
+
+            derive_site_statuses([
+                (seed_data["workspace_id"], "active"),
+                (other.id, "canceled"),
+                ("no-such-workspace", "active"),
+            ])
+
+            assert db.session.get(Site, seed_data["site_id"]).status == "active"
+            assert Site.query.filter_by(workspace_id=other.id).one().status == "paused"
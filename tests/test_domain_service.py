@@ -0,0 +1,227 @@
+"""Tests for the domain service availability check.
+
+Covers:
+- Repeat checks for the same domain are served from the cache
+- Inconclusive lookups are not cached
+- Cached "available" answers expire sooner than "taken" ones
+- The cache is bounded
+- Concurrent checks of one domain share a single lookup, even racing its end
+- WHOIS only for TLDs without RDAP, cached longer, with a hard timeout
+- TLD extraction, including multi-part TLDs
+- Cloudflare pricing flattened to (registration, renewal) per TLD
+- Pricing persisted to disk and reused by a cold worker
+- Malformed input rejected before any lookup
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("whois")
+
+from app.services import domain_service  # noqa: E402
+from app.services.domain_service import _extract_tld, check_domain_availability  # noqa: E402
+
+
+# the autouse fixture patches these
+_get_cf_prices = domain_service._get_cf_prices
+_whois_check = domain_service._whois_check
+
+
+@pytest.fixture(autouse=True)
+def _no_network():
+    domain_service._availability_cache.clear()
+    with patch.object(domain_service, "_get_cf_prices", return_value={}), \
+            patch.object(domain_service, "_get_rdap_servers",
+                         return_value={"com": "https://rdap.example/com/"}), \
+            patch.object(domain_service, "_whois_check", return_value=None):
+        yield
+    domain_service._availability_cache.clear()
+
+
+class TestAvailabilityCache:
+
+    def test_repeat_check_served_from_cache(self):
+        with patch.object(domain_service, "_rdap_check", return_value=True) as rdap:
+            first = check_domain_availability("mariospizza.com")
+            second = check_domain_availability("www.MariosPizza.com")
+        assert rdap.call_count == 1
+        assert first["available"] is False
+        assert second["available"] is False
+
+    def test_inconclusive_result_not_cached(self):
+        with patch.object(domain_service, "_rdap_check", return_value=None) as rdap:
+            assert check_domain_availability("mariospizza.com")["error"]
+            assert check_domain_availability("mariospizza.com")["error"]
+        assert rdap.call_count == 2
+
+    def test_available_expires_before_taken(self):
+        with patch.object(domain_service, "_rdap_check", side_effect=[False, True]) as rdap, \
+                patch.object(domain_service.time, "time", return_value=1000.0) as now:
+            check_domain_availability("free.com")
+            check_domain_availability("taken.com")
+            now.return_value += domain_service.AVAILABILITY_TTL_AVAILABLE + 1
+            rdap.side_effect = [True]
+            assert check_domain_availability("free.com")["available"] is False
+            assert check_domain_availability("taken.com")["available"] is False
+        assert rdap.call_count == 3
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(domain_service, "AVAILABILITY_CACHE_MAX", 2)
+        with patch.object(domain_service, "_rdap_check", return_value=False):
+            for name in ("a.com", "b.com", "c.com"):
+                check_domain_availability(name)
+        assert list(domain_service._availability_cache) == ["b.com", "c.com"]
+
+    def test_concurrent_checks_share_one_lookup(self, monkeypatch):
+        monkeypatch.setattr(domain_service, "AVAILABILITY_TTL_TAKEN", 0)  # no cache hits
+        started, release = threading.Event(), threading.Event()
+
+        def slow_rdap(domain, tld):
+            started.set()
+            release.wait(5)
+            return True
+
+        results = []
+
+        def check():
+            results.append(check_domain_availability("mariospizza.com")["available"])
+
+        with patch.object(domain_service, "_rdap_check", side_effect=slow_rdap) as rdap:
+            leader = threading.Thread(target=check)
+            leader.start()
+            started.wait(5)
+            follower = threading.Thread(target=check)
+            follower.start()
+            time.sleep(0.1)  # let the follower reach the in-flight lookup
+            release.set()
+            leader.join(5)
+            follower.join(5)
+        assert rdap.call_count == 1
+        assert results == [False, False]
+
+
+    def test_check_racing_a_finished_lookup_uses_its_answer(self):
+        """A check whose first cache read missed, but whose lookup finished
+        (cached and no longer in flight) before it took the lock, doesn't
+        start a second lookup."""
+        fresh_cache_entry = domain_service._fresh_cache_entry
+        with patch.object(domain_service, "_rdap_check", return_value=True) as rdap:
+            check_domain_availability("mariospizza.com")
+            with patch.object(domain_service, "_fresh_cache_entry",
+                              side_effect=[None, fresh_cache_entry("mariospizza.com")]):
+                assert check_domain_availability("mariospizza.com")["available"] is False
+        assert rdap.call_count == 1
+
+
+class TestWhoisFallback:
+
+    def test_rdap_failure_does_not_fall_back_to_whois(self):
+        with patch.object(domain_service, "_rdap_check", return_value=None), \
+                patch.object(domain_service, "_whois_check") as whois_check:
+            assert check_domain_availability("mariospizza.com")["error"]
+        whois_check.assert_not_called()
+
+    def test_whois_for_tld_without_rdap_cached_for_an_hour(self):
+        with patch.object(domain_service, "_rdap_check") as rdap, \
+                patch.object(domain_service, "_whois_check", return_value=False) as whois_check, \
+                patch.object(domain_service.time, "time", return_value=1000.0) as now:
+            check_domain_availability("mariospizza.io")
+            now.return_value += domain_service.AVAILABILITY_TTL_TAKEN + 1
+            assert check_domain_availability("mariospizza.io")["available"] is True
+        rdap.assert_not_called()
+        assert whois_check.call_count == 1
+
+    def test_whois_timeout_is_inconclusive(self, monkeypatch):
+        monkeypatch.setattr(domain_service, "WHOIS_TIMEOUT", 0.01)
+        release = threading.Event()
+        with patch.object(domain_service.whois, "whois", side_effect=lambda d: release.wait(5)):
+            try:
+                assert _whois_check("mariospizza.io") is None
+            finally:
+                release.set()
+
+
+class TestInputValidation:
+
+    @pytest.mark.parametrize("domain", [
+        "mario's pizza.com",
+        "-mariospizza.com",
+        "mariospizza-.com",
+        "mariospizza.c0m",
+        "mariospizza.com:8080",
+        "café.com",
+        ("a" * 64) + ".com",
+    ])
+    def test_malformed_domain_rejected_without_lookup(self, domain):
+        with patch.object(domain_service, "_rdap_check") as rdap:
+            result = check_domain_availability(domain)
+        assert result["error"].startswith("Please enter a valid domain name")
+        rdap.assert_not_called()
+
+    @pytest.mark.parametrize("domain", [
+        "https://www.mariospizza.com/menu",
+        "marios-pizza.co.uk",
+        "xn--caf-dma.com",
+        "pizza.xn--p1ai",
+    ])
+    def test_well_formed_domain_checked(self, domain):
+        with patch.object(domain_service, "_rdap_check", return_value=False), \
+                patch.object(domain_service, "_get_rdap_servers",
+                             return_value={"com": "x", "uk": "x", "co.uk": "x", "xn--p1ai": "x"}):
+            assert check_domain_availability(domain)["error"] is None
+
+
+class TestExtractTld:
+
+    @pytest.mark.parametrize("domain, tld", [
+        ("mariospizza.com", "com"),
+        ("shop.mariospizza.com", "com"),
+        ("mariospizza.co.uk", "co.uk"),
+        ("MariosPizza.Com.MX.", "com.mx"),
+        ("co.uk", "uk"),
+        ("localhost", ""),
+    ])
+    def test_extract_tld(self, domain, tld):
+        assert _extract_tld(domain) == tld
+
+
+class TestCloudflarePricing:
+
+    @pytest.fixture(autouse=True)
+    def _cold_cache(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(domain_service, "DOMAIN_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(domain_service, "_cf_prices", {})
+        monkeypatch.setattr(domain_service, "_cf_prices_fetched", 0)
+
+    def test_prices_flattened_per_tld(self):
+        with patch.object(domain_service._http, "get") as get:
+            get.return_value.json.return_value = {
+                "com": {"registration": 10.44, "renewal": 10.44},
+                "io": {"registration": 50.0},
+                "xyz": {},
+            }
+            assert _get_cf_prices() == {"com": (10.44, 10.44), "io": (50.0, None)}
+
+    def test_cold_worker_reads_prices_from_disk(self, monkeypatch):
+        with patch.object(domain_service._http, "get") as get:
+            get.return_value.json.return_value = {"com": {"registration": 10.44, "renewal": 10.44}}
+            _get_cf_prices()
+
+        # A fresh worker: nothing in memory, network unavailable
+        monkeypatch.setattr(domain_service, "_cf_prices", {})
+        monkeypatch.setattr(domain_service, "_cf_prices_fetched", 0)
+        with patch.object(domain_service._http, "get", side_effect=OSError) as get:
+            assert _get_cf_prices() == {"com": (10.44, 10.44)}
+        get.assert_not_called()
+
+    def test_price_applied_to_result(self):
+        with patch.object(domain_service, "_rdap_check", return_value=False), \
+                patch.object(domain_service, "_get_cf_prices",
+                             return_value={"com": (10.44, 12.0)}):
+            result = check_domain_availability("mariospizza.com", price_limit=25)
+        assert (result["price"], result["renewal"]) == (10.44, 12.0)
+        assert result["within_budget"] is True
+        assert result["price_source"] == "cloudflare"
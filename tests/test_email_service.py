@@ -0,0 +1,164 @@
+"""Tests for the email service SMTP connection pool and send queue.
+
+Covers:
+- send_email is queued on the dedicated "email" background queue
+- Connections are reused across sends
+- Dead connections are replaced
+- A send that hits a dropped connection is retried on a fresh one
+- Connections are retired after MAIL_POOL_MAX_MESSAGES_PER_CONN messages
+- send_emails_sync sends a batch over one connection, reporting per-message failures
+- send_emails_sync can spread a batch over several connections in parallel
+- Shutting down the background pools lets queued emails finish
+"""
+
+import smtplib
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from app.services import background_service, email_service
+from app.services.email_service import send_email, send_email_sync, send_emails_sync
+
+
+@pytest.fixture
+def smtp(app):
+    app.config.update(MAIL_USERNAME="info@example.com", MAIL_PASSWORD="secret")
+    email_service._pool = email_service.queue.LifoQueue()
+    with patch("app.services.email_service.smtplib.SMTP") as mock_smtp:
+        mock_smtp.return_value.noop.return_value = (250, b"OK")
+        yield mock_smtp
+    app.config.update(MAIL_USERNAME=None, MAIL_PASSWORD=None)
+    email_service._pool = email_service.queue.LifoQueue()
+
+
+def _send(app, n=1):
+    with app.test_request_context():
+        for _ in range(n):
+            send_email_sync(
+                to="joe@example.com",
+                subject="Hi",
+                template="emails/form_relay_notification.html",
+                context={"name": "Joe", "email": "joe@example.com",
+                         "phone": "", "message": "Hi", "site_name": "Test"},
+            )
+
+
+class TestSmtpPool:
+
+    def test_connection_reused_across_sends(self, app, smtp):
+        _send(app, 3)
+        assert smtp.call_count == 1
+        assert smtp.return_value.login.call_count == 1
+        assert smtp.return_value.send_message.call_count == 3
+
+    def test_dead_connection_replaced(self, app, smtp):
+        _send(app)
+        smtp.return_value.noop.side_effect = OSError("connection reset")
+        _send(app)
+        assert smtp.call_count == 2
+
+    def test_disconnect_during_send_retried(self, app, smtp):
+        smtp.return_value.send_message.side_effect = [
+            smtplib.SMTPServerDisconnected("gone"), None,
+        ]
+        _send(app)
+        assert smtp.call_count == 2
+        assert smtp.return_value.send_message.call_count == 2
+        assert email_service._pool.qsize() == 1
+
+    def test_connection_retired_after_max_messages(self, app, smtp):
+        app.config["MAIL_POOL_MAX_MESSAGES_PER_CONN"] = 2
+        try:
+            _send(app, 3)
+        finally:
+            app.config["MAIL_POOL_MAX_MESSAGES_PER_CONN"] = 100
+        assert smtp.call_count == 2
+        assert smtp.return_value.quit.call_count == 1
+
+
+class TestSendEmailsBatch:
+
+    def _email(self, to):
+        return {
+            "to": to, "subject": "Hi",
+            "template": "emails/form_relay_notification.html",
+            "context": {"name": "Joe", "email": to, "phone": "",
+                        "message": "Hi", "site_name": "Test"},
+        }
+
+    def test_batch_uses_one_connection(self, app, smtp):
+        with app.test_request_context():
+            results = send_emails_sync([self._email(f"{n}@example.com") for n in "abc"])
+        assert results == [None, None, None]
+        assert smtp.call_count == 1
+        assert smtp.return_value.noop.call_count == 0
+        assert smtp.return_value.send_message.call_count == 3
+
+    def test_failure_reported_and_batch_continues(self, app, smtp):
+        error = smtplib.SMTPRecipientsRefused({"b@example.com": (550, b"no")})
+        smtp.return_value.send_message.side_effect = [None, error, None]
+        with app.test_request_context():
+            results = send_emails_sync([self._email(f"{n}@example.com") for n in "abc"])
+        assert results == [None, error, None]
+        assert smtp.call_count == 2
+
+    def test_batch_spread_over_connections(self, app, smtp):
+        error = smtplib.SMTPRecipientsRefused({"c@example.com": (550, b"no")})
+
+        def send_message(msg):
+            if msg["To"] == "c@example.com":
+                raise error
+
+        smtp.return_value.send_message.side_effect = send_message
+        with app.test_request_context():
+            results = send_emails_sync(
+                [self._email(f"{n}@example.com") for n in "abcd"], connections=2,
+            )
+        assert results == [None, None, error, None]
+        assert smtp.return_value.send_message.call_count == 4
+        assert smtp.call_count >= 2
+
+
+class TestSendEmailQueue:
+
+    def test_send_email_queued_on_email_queue(self, app):
+        with app.test_request_context(), \
+                patch("app.services.email_service.background_service.submit_to") as submit:
+            send_email(to="joe@example.com", subject="Hi",
+                       template="emails/form_relay_notification.html")
+        assert submit.call_args.args[:2] == ("email", send_email_sync)
+
+    def test_send_email_delivers_when_eager(self, app, smtp):
+        with app.test_request_context():
+            send_email(
+                to="joe@example.com",
+                subject="Hi",
+                template="emails/form_relay_notification.html",
+                context={"name": "Joe", "email": "joe@example.com",
+                         "phone": "", "message": "Hi", "site_name": "Test"},
+            )
+        assert smtp.return_value.send_message.call_count == 1
+
+    def test_shutdown_waits_for_queued_email(self, app):
+        release = threading.Event()
+        sent = []
+
+        def slow_send(**kwargs):
+            release.wait(5)
+            sent.append(kwargs["to"])
+
+        app.config["TASKS_ALWAYS_EAGER"] = False
+        try:
+            with app.app_context():
+                futures = [
+                    background_service.submit_to("email", slow_send, to=f"{n}@example.com")
+                    for n in "abc"
+                ]
+            threading.Timer(0.1, release.set).start()
+            background_service.shutdown()
+        finally:
+            app.config["TASKS_ALWAYS_EAGER"] = True
+        assert all(f.done() for f in futures)
+        assert sorted(sent) == ["a@example.com", "b@example.com", "c@example.com"]
+        assert background_service._executors == {}
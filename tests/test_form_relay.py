@@ -0,0 +1,129 @@
+"""Tests for the form relay blueprint.
+
+Covers:
+- Access key validation
+- Recipient list normalization
+- Post-submit redirect allowlist (no open redirects)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.extensions import db
+from app.models.contact_form import ContactFormConfig
+
+
+@pytest.fixture
+def form_config(app, seed_data):
+    with app.app_context():
+        config = ContactFormConfig(
+            site_id=seed_data["site_id"],
+            access_key="relay-test-key",
+            recipient_emails="owner@testpizza.com",
+        )
+        db.session.add(config)
+        db.session.commit()
+    return "relay-test-key"
+
+
+def _submit(client, access_key, **extra):
+    return client.post("/api/forms/submit", data={
+        "access_key": access_key,
+        "name": "Jane Visitor",
+        "email": "jane@example.com",
+        "message": "Do you cater?",
+        **extra,
+    })
+
+
+# ══════════════════════════════════════════════
+#  ACCESS KEY
+# ══════════════════════════════════════════════
+
+class TestFormRelayAccessKey:
+
+    def test_invalid_access_key_rejected(self, client, form_config):
+        resp = _submit(client, "nope")
+        assert resp.status_code == 403
+
+    def test_malformed_access_key_rejected(self, client, form_config):
+        resp = _submit(client, "not a key!")
+        assert resp.status_code == 403
+
+    def test_generated_key_round_trips(self, app, seed_data):
+        key = ContactFormConfig.generate_access_key()
+        with app.app_context():
+            db.session.add(ContactFormConfig(
+                site_id=seed_data["site_id"], access_key=key,
+                recipient_emails="owner@testpizza.com",
+            ))
+            db.session.commit()
+            db.session.expire_all()
+            found = db.session.scalars(
+                db.select(ContactFormConfig).where(ContactFormConfig.access_key == key)
+            ).one()
+            assert found.access_key == key
+
+    @patch("app.services.email_service.send_email")
+    def test_valid_submission_relays_email(self, mock_send, client, form_config):
+        resp = _submit(client, form_config)
+        assert resp.status_code == 200
+        assert resp.get_json() == {"ok": True}
+        assert mock_send.call_args.kwargs["to"] == ["owner@testpizza.com"]
+
+
+class TestFormRelayRecipients:
+
+    def test_recipients_normalized_on_write(self):
+        config = ContactFormConfig(
+            recipient_emails=" Owner@TestPizza.com,, manager@testpizza.com ,owner@testpizza.com",
+        )
+        assert config.recipient_emails == "owner@testpizza.com, manager@testpizza.com"
+        assert config.get_recipient_list() == [
+            "owner@testpizza.com", "manager@testpizza.com",
+        ]
+
+
+# ══════════════════════════════════════════════
+#  REDIRECTS
+# ══════════════════════════════════════════════
+
+class TestFormRelayRedirect:
+
+    @patch("app.services.email_service.send_email")
+    def test_redirects_back_to_own_site(self, mock_send, client, form_config):
+        url = "https://testpizza.example.dev/thanks"
+        resp = _submit(client, form_config, redirect=url)
+        assert resp.status_code == 302
+        assert resp.headers["Location"] == url
+
+    @patch("app.services.email_service.send_email")
+    def test_foreign_host_not_redirected(self, mock_send, client, form_config):
+        resp = _submit(client, form_config, redirect="https://evil.example.com/")
+        assert resp.status_code == 200
+        assert resp.get_json() == {"ok": True}
+
+    @patch("app.services.email_service.send_email")
+    def test_lookalike_host_not_redirected(self, mock_send, client, form_config):
+        resp = _submit(
+            client, form_config,
+            redirect="https://testpizza.example.dev.evil.com/thanks",
+        )
+        assert resp.status_code == 200
+
+    @patch("app.services.email_service.send_email")
+    def test_non_http_scheme_not_redirected(self, mock_send, client, form_config):
+        resp = _submit(client, form_config, redirect="javascript:alert(1)")
+        assert resp.status_code == 200
+
+    @patch("app.services.email_service.send_email")
+    def test_configured_host_allowed(self, mock_send, app, client, form_config):
+        app.config["ALLOWED_REDIRECT_HOSTS"] = frozenset({"thanks.example.org"})
+        try:
+            resp = _submit(
+                client, form_config, redirect="https://thanks.example.org/done",
+            )
+            assert resp.status_code == 302
+        finally:
+            app.config["ALLOWED_REDIRECT_HOSTS"] = frozenset()
@@ -0,0 +1,270 @@
+"""Tests for the kanban blueprint — board API.
+
+Covers:
+- Auth guards (anonymous rejected, Bearer token accepted)
+- Board payload shape and ordering
+- Board cache invalidation on writes
+- Card update is a single statement against kanban_cards
+- Labels and comments stored as JSON
+- Prospect creation from a card
+- Card markdown parsing
+"""
+
+from sqlalchemy import event
+
+from app.blueprints.kanban import _parse_card_markdown
+from app.extensions import db
+from app.models.kanban import KanbanCard
+
+
+def _login_admin(client):
+    return client.post("/auth/login", data={
+        "email": "admin@waas.local", "password": "admin123",
+    }, follow_redirects=True)
+
+
+def _create_column(client, title):
+    resp = client.post("/admin/kanban/api/columns", json={"title": title})
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+def _create_card(client, column_id, title, **fields):
+    resp = client.post("/admin/kanban/api/cards", json={
+        "column_id": column_id, "title": title, **fields,
+    })
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+# ══════════════════════════════════════════════
+#  AUTH
+# ══════════════════════════════════════════════
+
+class TestKanbanAuth:
+
+    def test_board_requires_auth(self, client, seed_data):
+        resp = client.get("/admin/kanban/api/board")
+        assert resp.status_code == 401
+
+    def test_board_accepts_bearer_token(self, client, seed_data, app):
+        app.config["KANBAN_API_KEY"] = "kanban-test-key"
+        try:
+            resp = client.get(
+                "/admin/kanban/api/board",
+                headers={"Authorization": "Bearer kanban-test-key"},
+            )
+            assert resp.status_code == 200
+        finally:
+            app.config["KANBAN_API_KEY"] = None
+
+    def test_board_rejects_wrong_bearer_token(self, client, seed_data, app):
+        app.config["KANBAN_API_KEY"] = "kanban-test-key"
+        try:
+            resp = client.get(
+                "/admin/kanban/api/board",
+                headers={"Authorization": "Bearer wrong"},
+            )
+            assert resp.status_code == 401
+        finally:
+            app.config["KANBAN_API_KEY"] = None
+
+    def test_oversized_json_body_rejected(self, client, seed_data):
+        _login_admin(client)
+        resp = client.post("/admin/kanban/api/columns", json={
+            "title": "x" * (300 * 1024),
+        })
+        assert resp.status_code == 413
+
+
+# ══════════════════════════════════════════════
+#  BOARD
+# ══════════════════════════════════════════════
+
+class TestKanbanBoard:
+
+    def test_board_orders_columns_and_cards(self, client, seed_data):
+        _login_admin(client)
+        todo = _create_column(client, "To Do")
+        done = _create_column(client, "Done")
+        _create_card(client, todo["id"], "First")
+        _create_card(client, todo["id"], "Second")
+
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert [c["title"] for c in board] == ["To Do", "Done"]
+        assert [c["title"] for c in board[0]["cards"]] == ["First", "Second"]
+        assert board[1]["id"] == done["id"]
+        assert board[1]["cards"] == []
+
+    def test_board_reflects_writes_after_cached_read(self, client, seed_data):
+        _login_admin(client)
+        col = _create_column(client, "Research")
+        client.get("/admin/kanban/api/board")  # warm the cache
+
+        card = _create_card(client, col["id"], "Mario's Pizza")
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert [c["id"] for c in board[0]["cards"]] == [card["id"]]
+
+        client.put(f"/admin/kanban/api/columns/{col['id']}", json={"title": "Pitched"})
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert board[0]["title"] == "Pitched"
+
+        client.delete(f"/admin/kanban/api/cards/{card['id']}")
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert board[0]["cards"] == []
+
+    def test_update_card_fields(self, client, seed_data):
+        _login_admin(client)
+        todo = _create_column(client, "To Do")
+        done = _create_column(client, "Done")
+        card = _create_card(client, todo["id"], "A")
+
+        resp = client.put(f"/admin/kanban/api/cards/{card['id']}", json={
+            "title": "A (edited)", "column_id": done["id"], "labels": ["hot"],
+        })
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["title"] == "A (edited)"
+        assert body["column_id"] == done["id"]
+        assert body["labels"] == '["hot"]'
+
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert board[0]["cards"] == []
+        assert board[1]["cards"][0]["title"] == "A (edited)"
+
+    def test_update_missing_card_404(self, client, seed_data):
+        _login_admin(client)
+        resp = client.put("/admin/kanban/api/cards/nope", json={"title": "x"})
+        assert resp.status_code == 404
+
+    def test_update_card_does_not_reload_row(self, client, seed_data, app):
+        _login_admin(client)
+        col = _create_column(client, "To Do")
+        card = _create_card(client, col["id"], "A")
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                resp = client.put(f"/admin/kanban/api/cards/{card['id']}", json={"title": "B"})
+            finally:
+                event.remove(db.engine, "before_cursor_execute", record)
+        assert resp.get_json()["title"] == "B"
+        assert len([s for s in statements if "kanban_cards" in s]) == 1
+
+    def test_board_picks_up_writes_from_other_processes(self, client, seed_data, app):
+        """Rows written outside the API (e.g. another worker) bust the cache."""
+        _login_admin(client)
+        col = _create_column(client, "Research")
+        client.get("/admin/kanban/api/board")  # warm the cache
+
+        with app.app_context():
+            db.session.add(KanbanCard(
+                kanban_column_id=col["id"], title="Direct insert", position=0,
+            ))
+            db.session.commit()
+
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert [c["title"] for c in board[0]["cards"]] == ["Direct insert"]
+
+    def test_new_cards_get_sequential_numbers_and_positions(self, client, seed_data):
+        _login_admin(client)
+        todo = _create_column(client, "To Do")
+        done = _create_column(client, "Done")
+        a = _create_card(client, todo["id"], "A")
+        b = _create_card(client, todo["id"], "B")
+        c = _create_card(client, done["id"], "C")
+
+        assert [a["position"], b["position"], c["position"]] == [0, 1, 0]
+        assert [b["card_number"], c["card_number"]] == [
+            a["card_number"] + 1, a["card_number"] + 2,
+        ]
+
+    def test_labels_and_comments_round_trip(self, client, seed_data):
+        _login_admin(client)
+        col = _create_column(client, "To Do")
+        card = _create_card(client, col["id"], "A", labels='["red"]')
+        assert card["labels"] == '["red"]'
+
+        resp = client.post(f"/admin/kanban/api/cards/{card['id']}/comments", json={
+            "author": "Bot", "text": "Looks promising",
+        })
+        assert resp.status_code == 201
+        comments = client.get(f"/admin/kanban/api/cards/{card['id']}/comments").get_json()
+        assert [c["text"] for c in comments] == ["Looks promising"]
+
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert board[0]["cards"][0]["comments"][0]["author"] == "Bot"
+
+
+# ══════════════════════════════════════════════
+#  CREATE PROSPECT
+# ══════════════════════════════════════════════
+
+class TestKanbanCreateProspect:
+
+    def test_create_prospect_links_card(self, client, seed_data, app):
+        _login_admin(client)
+        col = _create_column(client, "Research")
+        card = _create_card(client, col["id"], "Mario's Pizza")
+
+        resp = client.post(f"/admin/kanban/api/cards/{card['id']}/create-prospect")
+        assert resp.status_code == 201
+        prospect_id = resp.get_json()["prospect_id"]
+
+        with app.app_context():
+            assert db.session.get(KanbanCard, card["id"]).prospect_id == prospect_id
+
+        board = client.get("/admin/kanban/api/board").get_json()
+        assert board[0]["cards"][0]["prospect_id"] == prospect_id
+
+    def test_create_prospect_twice_conflicts(self, client, seed_data):
+        _login_admin(client)
+        col = _create_column(client, "Research")
+        card = _create_card(client, col["id"], "Mario's Pizza")
+
+        client.post(f"/admin/kanban/api/cards/{card['id']}/create-prospect")
+        resp = client.post(f"/admin/kanban/api/cards/{card['id']}/create-prospect")
+        assert resp.status_code == 409
+
+
+# ══════════════════════════════════════════════
+#  CARD MARKDOWN PARSING
+# ══════════════════════════════════════════════
+
+class TestParseCardMarkdown:
+
+    def test_plain_text_falls_back_to_title(self):
+        parsed = _parse_card_markdown("Great reviews, no website.", "Mario's Pizza — Italian [A]")
+        assert parsed["business_name"] == "Mario's Pizza"
+        assert parsed["source"] == "other"
+        assert parsed["contact_name"] is None
+
+    def test_table_and_links(self):
+        desc = (
+            "| Name | Mario's Pizza |\n"
+            "| Owner | Mario Rossi |\n"
+            "| Email | mario@example.com |\n"
+            "| Facebook | https://facebook.com/mariospizza |\n"
+        )
+        parsed = _parse_card_markdown(desc, "Card")
+        assert parsed["business_name"] == "Mario's Pizza"
+        assert parsed["contact_name"] == "Mario Rossi"
+        assert parsed["contact_email"] == "mario@example.com"
+        assert parsed["source"] == "facebook"
+        assert parsed["source_url"] == "https://facebook.com/mariospizza"
+
+    def test_bold_key_values(self):
+        desc = (
+            "**Business Name:** Joe's Diner\n"
+            "**Phone:** 555-0100\n"
+            "**Demo URL:** https://joes.example.dev\n"
+        )
+        parsed = _parse_card_markdown(desc, "Card")
+        assert parsed["business_name"] == "Joe's Diner"
+        assert parsed["contact_phone"] == "555-0100"
+        assert parsed["demo_url"] == "https://joes.example.dev"
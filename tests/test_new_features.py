@@ -3,19 +3,30 @@
 Covers:
 - Password reset flow (forgot password, reset with token)
 - Prospect activity log (add activity, timeline)
-- Prospect outreach email (send + auto status change)
+- Prospect outreach email (send + auto status change, sent only after commit)
 - Invite email sending from admin
 - Yelp as prospect source
 - Prospect update preserving fields on status-only changes
 - Billing status poll endpoint (checkout_status)
 - Landing page CTA buttons open contact modal (not invite section)
 - _extract_period_end helper (Stripe SDK compatibility)
+- Pitch template rendering
+- Time-ordered (uuid7) ids
+- Invite validity as a SQL predicate
+- Request-scoped clock
+- Prospect reminder sweep (query count independent of prospect count,
+  transient send failures retried)
 """
 
 import secrets
+import smtplib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 
+import pytest
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash
 
 from app.extensions import db
@@ -27,6 +38,10 @@ from app.models.site import Site
 from app.models.invite import WorkspaceInvite
 from app.models.billing import BillingCustomer, BillingSubscription
 from app.models.audit import AuditEvent
+from app.models.types import uuid7
+from app.utils.clock import request_now
+from app.models.pitch_template import PitchTemplate
+from app.services.reminder_service import process_reminders
 
 
 def _login_admin(client):
@@ -293,6 +308,20 @@ class TestProspectOutreach:
             assert activity is not None
             assert activity.activity_type == "email"
 
+    @patch("app.blueprints.admin.send_email")
+    def test_outreach_not_sent_when_commit_fails(self, mock_send, client, seed_data, app):
+        """The invite link only goes out once the invite is committed."""
+        prospect_id = self._make_prospect(app)
+        _login_admin(client)
+
+        with patch("app.blueprints.admin.db.session.commit",
+                   side_effect=RuntimeError("db down")), \
+                pytest.raises(RuntimeError):
+            client.post(f"/admin/prospects/{prospect_id}/send-outreach", data={
+                "recipient_email": "jane@outreach.com",
+            })
+        mock_send.assert_not_called()
+
     def test_outreach_missing_email(self, client, seed_data, app):
         prospect_id = self._make_prospect(app)
         _login_admin(client)
@@ -685,3 +714,239 @@ class TestAdminDashboardEnhancements:
         assert resp.status_code == 200
         assert b"Past Due" in resp.data
         assert b"Past Due" in resp.data
+
+
+# ══════════════════════════════════════════════
+#  PITCH TEMPLATE RENDERING
+# ══════════════════════════════════════════════
+
+class TestPitchTemplateRender:
+
+    def _prospect(self, **fields):
+        defaults = {"business_name": "Joe's Diner", "contact_name": "Joe Smith"}
+        return Prospect(**{**defaults, **fields})
+
+    def test_all_placeholders_filled(self):
+        t = PitchTemplate(body=(
+            "Hi {{first_name}} ({{contact_name}}), see {{business_name}} at "
+            "{{demo_url}}. Call {{my_phone}} or visit {{portal_url}}."
+        ))
+        text = t.render(
+            self._prospect(demo_url="https://joes.example.dev"),
+            portal_url="https://portal.test", my_phone="555-0100",
+        )
+        assert text == (
+            "Hi Joe (Joe Smith), see Joe's Diner at https://joes.example.dev. "
+            "Call 555-0100 or visit https://portal.test."
+        )
+
+    def test_missing_values_and_unknown_placeholders(self):
+        t = PitchTemplate(body="{{first_name}}|{{demo_url}}|{{nope}}")
+        assert t.render(self._prospect(contact_name=None)) == "||{{nope}}"
+
+    def test_repeated_placeholder_and_edited_body(self):
+        t = PitchTemplate(body="{{business_name}} / {{business_name}}")
+        assert t.render(self._prospect()) == "Joe's Diner / Joe's Diner"
+        t.body = "No variables here."
+        assert t.render(self._prospect()) == "No variables here."
+
+
+# ══════════════════════════════════════════════
+#  TIME-ORDERED IDS
+# ══════════════════════════════════════════════
+
+class TestUuid7:
+
+    def test_uuid7_is_version_7(self):
+        value = uuid.UUID(uuid7())
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_uuid7_sorts_by_creation_time(self):
+        first = uuid7()
+        time.sleep(0.002)
+        assert uuid7() > first
+
+
+# ══════════════════════════════════════════════
+#  INVITE VALIDITY
+# ══════════════════════════════════════════════
+
+class TestInviteValidity:
+
+    def test_is_valid_filters_in_sql(self, app, seed_data):
+        with app.app_context():
+            tokens = set(db.session.scalars(
+                db.select(WorkspaceInvite.token)
+                .where(WorkspaceInvite.workspace_id == seed_data["workspace_id"])
+                .where(WorkspaceInvite.is_valid)
+            ))
+        assert tokens == {seed_data["invite_token"], seed_data["open_token"]}
+
+    def test_is_expired_matches_python_check(self, app, seed_data):
+        with app.app_context():
+            expired = db.session.scalars(
+                db.select(WorkspaceInvite).where(WorkspaceInvite.is_expired)
+            ).all()
+        assert [i.token for i in expired] == [seed_data["expired_token"]]
+        assert all(i.is_expired for i in expired)
+
+
+# ══════════════════════════════════════════════
+#  REQUEST CLOCK
+# ══════════════════════════════════════════════
+
+class TestRequestNow:
+
+    def test_fixed_within_a_request(self, app):
+        with app.test_request_context():
+            first = request_now()
+            time.sleep(0.002)
+            assert request_now() is first
+
+    def test_fresh_outside_a_request(self, app):
+        first = request_now()
+        time.sleep(0.002)
+        assert request_now() > first
+
+
+# ══════════════════════════════════════════════
+#  PROSPECT REMINDERS
+# ══════════════════════════════════════════════
+
+class TestProcessReminders:
+
+    def _pitch(self, days_ago, reminders=()):
+        prospect = Prospect.query.first()
+        prospect.status = "pitched"
+        prospect_id = prospect.id
+        sent_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+        db.session.add(ProspectActivity(
+            prospect_id=prospect_id, activity_type="email",
+            note="Outreach email sent", created_at=sent_at,
+        ))
+        for tier in reminders:
+            db.session.add(ProspectActivity(
+                prospect_id=prospect_id, activity_type="email",
+                note=f"Reminder {tier} sent to {prospect.contact_email}",
+                reminder_tier=tier,
+            ))
+        db.session.commit()
+        return prospect_id
+
+    def _reminder_notes(self, prospect_id):
+        return sorted(db.session.scalars(
+            db.select(ProspectActivity.note)
+            .where(ProspectActivity.prospect_id == prospect_id)
+            .where(ProspectActivity.note.startswith("Reminder "))
+        ))
+
+    def test_sends_highest_due_tier_with_invite_link(self, app, seed_data):
+        with app.app_context():
+            prospect_id = self._pitch(days_ago=11, reminders=["d3"])
+            with patch("app.services.reminder_service.send_emails_sync",
+                       return_value=[None]) as send:
+                assert process_reminders() == 1
+
+            (email,) = send.call_args.args[0]
+            context = email["context"]
+            assert context["reminder_tier"] == "d10"
+            assert context["invite_link"].rsplit("=", 1)[1] in {
+                seed_data["invite_token"], seed_data["open_token"],
+            }
+            assert self._reminder_notes(prospect_id) == [
+                "Reminder d10 sent to joe@testpizza.com",
+                "Reminder d3 sent to joe@testpizza.com",
+            ]
+
+    def test_failed_send_not_logged(self, app, seed_data):
+        with app.app_context():
+            prospect_id = self._pitch(days_ago=4)
+            with patch("app.services.reminder_service.send_emails_sync",
+                       return_value=[OSError("smtp down")]), \
+                    patch("app.services.reminder_service.time.sleep"):
+                assert process_reminders() == 0
+            assert self._reminder_notes(prospect_id) == []
+
+    def test_transient_failure_retried(self, app, seed_data):
+        with app.app_context():
+            prospect_id = self._pitch(days_ago=4)
+            with patch("app.services.reminder_service.send_emails_sync", side_effect=[
+                [smtplib.SMTPServerDisconnected("gone")], [None],
+            ]) as send, patch("app.services.reminder_service.time.sleep") as sleep:
+                assert process_reminders() == 1
+            assert send.call_count == 2
+            sleep.assert_called_once()
+            assert self._reminder_notes(prospect_id) == [
+                "Reminder d3 sent to joe@testpizza.com",
+            ]
+
+    def test_permanent_failure_not_retried(self, app, seed_data):
+        with app.app_context():
+            self._pitch(days_ago=4)
+            refused = smtplib.SMTPRecipientsRefused({"joe@testpizza.com": (550, b"no")})
+            with patch("app.services.reminder_service.send_emails_sync",
+                       return_value=[refused]) as send:
+                assert process_reminders() == 0
+            assert send.call_count == 1
+
+    def test_skips_prospect_without_outreach(self, app, seed_data):
+        with app.app_context():
+            prospect = Prospect.query.first()
+            prospect.status = "pitched"
+            db.session.commit()
+            with patch("app.services.reminder_service.send_emails_sync") as send:
+                assert process_reminders() == 0
+            send.assert_not_called()
+
+    def test_nothing_due_yet(self, app, seed_data):
+        with app.app_context():
+            self._pitch(days_ago=1)
+            with patch("app.services.reminder_service.send_emails_sync") as send:
+                assert process_reminders() == 0
+            send.assert_not_called()
+
+    def test_skips_prospect_with_every_due_tier_sent(self, app, seed_data):
+        with app.app_context():
+            self._pitch(days_ago=11, reminders=["d3", "d10"])
+            with patch("app.services.reminder_service.send_emails_sync") as send:
+                assert process_reminders() == 0
+            send.assert_not_called()
+
+    def test_quiet_skips_per_prospect_report(self, app, seed_data):
+        with app.app_context():
+            self._pitch(days_ago=4)
+            result = app.test_cli_runner().invoke(args=["send-reminders", "--dry-run", "--quiet"])
+        assert "Done: 1 reminder(s) would be sent." in result.output
+        assert "Outreach sent" not in result.output
+
+    def test_query_count_independent_of_prospects(self, app, seed_data):
+        """Due prospects (with outreach and sent tiers) and invite links
+        are one query each."""
+        with app.app_context():
+            self._pitch(days_ago=11, reminders=["d3"])
+            sent_at = datetime.now(timezone.utc) - timedelta(days=31)
+            for n in range(5):
+                prospect = Prospect(
+                    business_name=f"Shop {n}", contact_email=f"shop{n}@example.com",
+                    source="other", status="pitched",
+                )
+                db.session.add(prospect)
+                db.session.flush()
+                db.session.add(ProspectActivity(
+                    prospect_id=prospect.id, activity_type="email",
+                    note="Outreach email sent", created_at=sent_at,
+                ))
+            db.session.commit()
+
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                assert process_reminders(dry_run=True) == 6
+            finally:
+                event.remove(db.engine, "before_cursor_execute", record)
+            assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 2
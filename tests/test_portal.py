@@ -2,10 +2,13 @@
 
 Covers:
 - Tenant resolution (valid slug, invalid slug)
+- Access level mirrored onto the workspace from its newest subscription
 - Dashboard rendering by access level
 - Subscribe page for no-subscription state
 - Suspended page for canceled subscription
 - Past-due warning banner
+- Conditional GET (ETag / 304) on the dashboard and ticket list
+- ETag keyed on the session's CSRF secret
 - Unauthenticated redirect to login
 - Non-member access denied
 """
@@ -14,8 +17,9 @@ from datetime import datetime, timezone
 
 from app.extensions import db
 from app.models.user import User
-from app.models.workspace import WorkspaceMember
+from app.models.workspace import Workspace, WorkspaceMember
 from app.models.billing import BillingSubscription
+from app.models.ticket import Ticket
 from werkzeug.security import generate_password_hash
 
 
@@ -40,6 +44,67 @@ class TestTenantResolution:
         assert resp.status_code == 302
 
 
+class TestAccessLevel:
+    """Tests for workspaces.access_level, mirrored from the newest subscription."""
+
+    def _login_admin(self, client):
+        return client.post(
+            "/auth/login",
+            data={"email": "admin@waas.local", "password": "admin123"},
+        )
+
+    def _add_subscription(self, app, seed_data, status, sub_id):
+        with app.app_context():
+            db.session.add(BillingSubscription(
+                workspace_id=seed_data["workspace_id"],
+                stripe_subscription_id=sub_id,
+                stripe_price_id="price_basic_test",
+                plan="basic",
+                status=status,
+            ))
+            db.session.commit()
+
+    def _access_level(self, seed_data):
+        return db.session.get(Workspace, seed_data["workspace_id"]).access_level
+
+    def test_defaults_to_subscribe(self, app, seed_data):
+        assert self._access_level(seed_data) == "subscribe"
+
+    def test_follows_subscription_status(self, app, seed_data, db_session):
+        self._add_subscription(app, seed_data, "active", "sub_level_1")
+        assert self._access_level(seed_data) == "full"
+
+        sub = BillingSubscription.query.filter_by(
+            stripe_subscription_id="sub_level_1"
+        ).first()
+        for status, level in [
+            ("past_due", "read_only"),
+            ("canceled", "blocked"),
+            ("trialing", "full"),
+        ]:
+            sub.status = status
+            db_session.commit()
+            assert self._access_level(seed_data) == level
+
+        db_session.delete(sub)
+        db_session.commit()
+        assert self._access_level(seed_data) == "subscribe"
+
+    def test_status_change_shows_on_next_request(self, client, seed_data, app, db_session):
+        self._add_subscription(app, seed_data, "active", "sub_level_2")
+        self._login_admin(client)
+        assert b"Payment failed" not in client.get("/test-pizza/dashboard").data
+
+        # Same session the requests use (see conftest), so commit expires it
+        sub = BillingSubscription.query.filter_by(
+            stripe_subscription_id="sub_level_2"
+        ).first()
+        sub.status = "past_due"
+        db_session.commit()
+
+        assert b"Payment failed" in client.get("/test-pizza/dashboard").data
+
+
 class TestDashboard:
     """Tests for the portal dashboard by access level."""
 
@@ -102,6 +167,125 @@ class TestDashboard:
         assert b"Welcome back" in resp.data
         assert b"Active" in resp.data
 
+    def test_dashboard_recent_tickets_and_counts(self, client, seed_data, app):
+        """Dashboard lists the 5 latest tickets and counts across all of them."""
+        user_id = self._create_client_user(app, seed_data)
+        self._login(client, "client@test.com", "clientpass123")
+
+        with app.app_context():
+            db.session.add(BillingSubscription(
+                workspace_id=seed_data["workspace_id"],
+                stripe_subscription_id="sub_test_tickets",
+                plan="basic",
+                status="active",
+            ))
+            for i in range(7):
+                db.session.add(Ticket(
+                    workspace_id=seed_data["workspace_id"],
+                    site_id=seed_data["site_id"],
+                    author_user_id=user_id,
+                    subject=f"Ticket {i}",
+                    description="...",
+                    status="done" if i < 2 else "open",
+                    last_activity_at=datetime(2026, 1, 1 + i, tzinfo=timezone.utc),
+                ))
+            db.session.commit()
+
+        resp = client.get("/test-pizza/dashboard")
+        assert resp.status_code == 200
+        assert b"Ticket 6" in resp.data
+        assert b"Ticket 2" in resp.data
+        assert b"Ticket 1" not in resp.data  # 6th most recent
+        assert b"View all 7 tickets (5 open)" in resp.data
+
+    def test_dashboard_conditional_get(self, client, seed_data, app, db_session):
+        """Unchanged dashboard revalidates to a 304; a new ticket busts it."""
+        user_id = self._create_client_user(app, seed_data)
+        self._login(client, "client@test.com", "clientpass123")
+        db_session.add(BillingSubscription(
+            workspace_id=seed_data["workspace_id"],
+            stripe_subscription_id="sub_test_etag",
+            plan="basic",
+            status="active",
+        ))
+        db_session.commit()
+
+        resp = client.get("/test-pizza/dashboard")
+        assert "ETag" not in resp.headers  # renders the "Logged in" flash
+
+        resp = client.get("/test-pizza/dashboard")
+        etag = resp.headers["ETag"]
+        assert resp.headers["Cache-Control"] == "private, no-cache"
+
+        resp = client.get("/test-pizza/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+        db_session.add(Ticket(
+            workspace_id=seed_data["workspace_id"],
+            site_id=seed_data["site_id"],
+            author_user_id=user_id,
+            subject="Fresh ticket",
+            description="...",
+        ))
+        db_session.commit()
+
+        resp = client.get("/test-pizza/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert b"Fresh ticket" in resp.data
+        assert resp.headers["ETag"] != etag
+
+    def test_dashboard_etag_tracks_csrf_secret(self, client, seed_data, app, db_session):
+        """A cached page's CSRF tokens must belong to the current session."""
+        self._create_client_user(app, seed_data)
+        self._login(client, "client@test.com", "clientpass123")
+        db_session.add(BillingSubscription(
+            workspace_id=seed_data["workspace_id"],
+            stripe_subscription_id="sub_test_csrf",
+            plan="basic",
+            status="active",
+        ))
+        db_session.commit()
+        client.get("/test-pizza/dashboard")  # consumes the login flash
+        etag = client.get("/test-pizza/dashboard").headers["ETag"]
+
+        with client.session_transaction() as sess:
+            sess["csrf_token"] = "rotated"
+        resp = client.get("/test-pizza/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+        with client.session_transaction() as sess:
+            del sess["csrf_token"]
+        resp = client.get("/test-pizza/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+
+    def test_ticket_list_conditional_get(self, client, seed_data, app, db_session):
+        """The ticket list's ETag tracks ticket changes, not just additions."""
+        user_id = self._create_client_user(app, seed_data)
+        self._login(client, "client@test.com", "clientpass123")
+        ticket = Ticket(
+            workspace_id=seed_data["workspace_id"],
+            site_id=seed_data["site_id"],
+            author_user_id=user_id,
+            subject="Broken form",
+            description="...",
+        )
+        db_session.add(ticket)
+        db_session.commit()
+
+        client.get("/test-pizza/tickets")  # consumes the login flash
+        etag = client.get("/test-pizza/tickets").headers["ETag"]
+        resp = client.get("/test-pizza/tickets", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+        ticket.status = "done"
+        ticket.updated_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        db_session.commit()
+
+        resp = client.get("/test-pizza/tickets", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+
     def test_dashboard_past_due_shows_warning(self, client, seed_data, app):
         """Dashboard with past_due subscription -> warning banner."""
         self._create_client_user(app, seed_data)
@@ -163,3 +347,28 @@ class TestDashboard:
         self._login(client, "outsider@test.com", "outsider123")
         resp = client.get("/test-pizza/dashboard")
         assert resp.status_code == 403
+
+    def test_non_member_admitted_once_added(self, client, seed_data, app):
+        """A 403 isn't cached — a user let in afterwards gets access at once."""
+        with app.app_context():
+            outsider = User(
+                email="outsider@test.com",
+                password_hash=generate_password_hash("outsider123"),
+                full_name="Outsider",
+            )
+            db.session.add(outsider)
+            db.session.commit()
+            outsider_id = outsider.id
+
+        self._login(client, "outsider@test.com", "outsider123")
+        assert client.get("/test-pizza/dashboard").status_code == 403
+
+        with app.app_context():
+            db.session.add(WorkspaceMember(
+                user_id=outsider_id,
+                workspace_id=seed_data["workspace_id"],
+                role="member",
+            ))
+            db.session.commit()
+
+        assert client.get("/test-pizza/dashboard").status_code == 200
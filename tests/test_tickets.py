@@ -10,9 +10,14 @@ Covers:
 - Status transitions (valid + invalid)
 - Input sanitization via bleach
 - Assignment validation
+- Attachment uploads (concurrent, invalid files skipped, content-addressed)
+- Attachment size display
 """
 
+import io
+
 import pytest
+from werkzeug.datastructures import FileStorage
 from werkzeug.security import generate_password_hash
 
 from app.extensions import db
@@ -20,8 +25,8 @@ from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceMember, WorkspaceSettings
 from app.models.site import Site
 from app.models.billing import BillingSubscription
-from app.models.ticket import Ticket, TicketMessage
-from app.services import ticket_service
+from app.models.ticket import Ticket, TicketAttachment, TicketMessage
+from app.services import storage_service, ticket_service
 
 
 # ─── Helpers ───────────────────────────────────────────────
@@ -202,6 +207,22 @@ class TestTicketService:
             db.session.commit()
             assert msg.is_internal is True
 
+    def test_add_message_other_workspace_raises_not_found(self, app, seed_data):
+        with app.app_context():
+            ticket = _make_ticket(
+                db.session, seed_data["workspace_id"],
+                seed_data["site_id"], seed_data["admin_id"],
+            )
+            db.session.commit()
+
+            with pytest.raises(ticket_service.TicketNotFound):
+                ticket_service.add_message(
+                    ticket_id=ticket.id,
+                    user_id=seed_data["admin_id"],
+                    message="Hello",
+                    workspace_id="some-other-workspace",
+                )
+
     def test_auto_transition_waiting_to_in_progress_on_client_reply(self, app, seed_data):
         """Client reply on a waiting_on_client ticket auto-transitions to in_progress."""
         with app.app_context():
@@ -350,6 +371,76 @@ class TestTicketService:
             assert len(open_only) == 1
             assert open_only[0].subject == "Open ticket"
 
+    def test_add_attachments_uploads_all_valid_files(self, app, seed_data, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, "UPLOAD_DIR", str(tmp_path / "uploads"))
+        monkeypatch.delenv("SUPABASE_URL", raising=False)
+        storage_service._get_supabase_config.cache_clear()
+        with app.app_context():
+            ticket = _make_ticket(
+                db.session, seed_data["workspace_id"],
+                seed_data["site_id"], seed_data["admin_id"],
+            )
+            msg = ticket_service.add_message(
+                ticket_id=ticket.id,
+                user_id=seed_data["admin_id"],
+                message="Screenshots attached",
+            )
+            files = [
+                FileStorage(io.BytesIO(b"png-%d" % i), filename=f"shot{i}.png",
+                            content_type="image/png")
+                for i in range(3)
+            ]
+            files.append(FileStorage(io.BytesIO(b"MZ"), filename="virus.exe"))
+
+            attachments = ticket_service.add_attachments(ticket.id, msg.id, files)
+            db.session.commit()
+
+            assert [a.filename for a in attachments] == ["shot0.png", "shot1.png", "shot2.png"]
+            for i, a in enumerate(attachments):
+                assert a.file_size == 5
+                assert (tmp_path / "uploads" / a.storage_path).read_bytes() == b"png-%d" % i
+                assert a.is_image and not a.is_pdf
+
+    def test_identical_attachments_share_storage(self, app, seed_data, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, "UPLOAD_DIR", str(tmp_path / "uploads"))
+        monkeypatch.delenv("SUPABASE_URL", raising=False)
+        storage_service._get_supabase_config.cache_clear()
+        with app.app_context():
+            ticket = _make_ticket(
+                db.session, seed_data["workspace_id"],
+                seed_data["site_id"], seed_data["admin_id"],
+            )
+            msg = ticket_service.add_message(
+                ticket_id=ticket.id,
+                user_id=seed_data["admin_id"],
+                message="Same screenshot twice",
+            )
+            files = [
+                FileStorage(io.BytesIO(b"same-bytes"), filename=name, content_type="image/png")
+                for name in ("a.png", "b.png")
+            ]
+
+            first, second = ticket_service.add_attachments(ticket.id, msg.id, files)
+            assert first.storage_path == second.storage_path
+            assert list((tmp_path / "uploads").rglob("*.png")) == [
+                tmp_path / "uploads" / first.storage_path,
+            ]
+
+
+class TestAttachmentHumanSize:
+
+    @pytest.mark.parametrize("size, expected", [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1.0 KB"),
+        (1536, "1.5 KB"),
+        (1024 * 1024 - 1, "1024.0 KB"),
+        (5 * 1024 * 1024, "5.0 MB"),
+        (3 * 1024 ** 3, "3072.0 MB"),
+    ])
+    def test_human_size(self, size, expected):
+        assert TicketAttachment(file_size=size).human_size == expected
+
 
 # ─── Portal Route Tests ───────────────────────────────────
 
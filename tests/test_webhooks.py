@@ -1,18 +1,26 @@
 """Tests for the webhooks blueprint and Stripe event handling.
 
 Covers:
-- Webhook signature verification (missing, invalid)
-- Idempotent event processing (duplicate events skipped)
+- Webhook signature verification (missing, invalid, valid)
+- Raw payload stored as received
+- Idempotent event processing (duplicate and still-pending events skipped)
 - checkout.session.completed handler
 - customer.subscription.updated handler
 - customer.subscription.deleted handler
 - invoice.payment_failed handler
 - invoice.payment_succeeded handler
 - Unknown event types (accepted but not processed)
+- Background processing (queued ack, failed-event retry, CLI sweep)
+- Events are claimed before processing (no second run while one is in flight)
+- Pruning old processed events
 - Site status derivation from subscription status
 """
 
+import hashlib
+import hmac
 import json
+import time
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
@@ -21,6 +29,7 @@ from app.models.billing import BillingCustomer, BillingSubscription
 from app.models.stripe_event import StripeEvent
 from app.models.site import Site
 from app.models.audit import AuditEvent
+from app.services.stripe_service import process_stripe_event
 
 
 class TestWebhookSignature:
@@ -36,10 +45,10 @@ class TestWebhookSignature:
         assert resp.status_code == 400
         assert b"Missing signature" in resp.data
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_invalid_signature_returns_400(self, mock_construct, client, seed_data):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_invalid_signature_returns_400(self, mock_verify, client, seed_data):
         """POST /stripe/webhooks with bad signature -> 400."""
-        mock_construct.side_effect = Exception("Invalid signature")
+        mock_verify.side_effect = Exception("Invalid signature")
 
         resp = client.post(
             "/stripe/webhooks",
@@ -50,12 +59,37 @@ class TestWebhookSignature:
         assert resp.status_code == 400
         assert b"Invalid signature" in resp.data
 
+    @patch("app.blueprints.webhooks.background_service.submit")
+    def test_valid_signature_stores_raw_payload(self, mock_submit, client, seed_data, app):
+        """Correctly signed body -> 200, stored byte-for-byte as the payload."""
+        mock_submit.return_value = Future()
+        payload = '{"id": "evt_signed_001", "type": "some.unknown.event",  "data": {}}'
+        timestamp = int(time.time())
+        signature = hmac.new(
+            app.config["STRIPE_WEBHOOK_SECRET"].encode(),
+            f"{timestamp}.{payload}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+
+        resp = client.post(
+            "/stripe/webhooks",
+            data=payload,
+            content_type="application/json",
+            headers={"Stripe-Signature": f"t={timestamp},v1={signature}"},
+        )
+        assert resp.status_code == 200
+
+        with app.app_context():
+            evt = StripeEvent.query.filter_by(stripe_event_id="evt_signed_001").first()
+            assert evt.event_type == "some.unknown.event"
+            assert evt.payload == payload
+
 
 class TestWebhookIdempotency:
     """Tests for duplicate event handling."""
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_duplicate_event_returns_200(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_duplicate_event_returns_200(self, mock_verify, client, seed_data, app):
         """Duplicate event_id -> 200 with 'already_processed'."""
         # Pre-insert the event
         with app.app_context():
@@ -66,7 +100,7 @@ class TestWebhookIdempotency:
             db.session.add(existing)
             db.session.commit()
 
-        mock_construct.return_value = {
+        event = {
             "id": "evt_duplicate_123",
             "type": "checkout.session.completed",
             "data": {"object": {}},
@@ -74,7 +108,7 @@ class TestWebhookIdempotency:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -87,11 +121,11 @@ class TestCheckoutCompleted:
     """Tests for checkout.session.completed webhook."""
 
     @patch("app.services.stripe_service.stripe.Subscription.retrieve")
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_creates_subscription(self, mock_construct, mock_sub_retrieve,
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_creates_subscription(self, mock_verify, mock_sub_retrieve,
                                    client, seed_data, app):
         """checkout.session.completed -> creates BillingSubscription + BillingCustomer."""
-        mock_construct.return_value = {
+        event = {
             "id": "evt_checkout_001",
             "type": "checkout.session.completed",
             "data": {
@@ -119,7 +153,7 @@ class TestCheckoutCompleted:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -182,12 +216,12 @@ class TestSubscriptionUpdated:
             db.session.add(sub)
             db.session.commit()
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_updates_subscription_status(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_updates_subscription_status(self, mock_verify, client, seed_data, app):
         """subscription.updated -> updates status and period end."""
         self._setup_existing_sub(app, seed_data)
 
-        mock_construct.return_value = {
+        event = {
             "id": "evt_update_001",
             "type": "customer.subscription.updated",
             "data": {
@@ -206,7 +240,7 @@ class TestSubscriptionUpdated:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -218,12 +252,12 @@ class TestSubscriptionUpdated:
             ).first()
             assert sub.status == "past_due"
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_updates_cancel_at_period_end(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_updates_cancel_at_period_end(self, mock_verify, client, seed_data, app):
         """subscription.updated with cancel_at_period_end -> updates flag."""
         self._setup_existing_sub(app, seed_data)
 
-        mock_construct.return_value = {
+        event = {
             "id": "evt_update_002",
             "type": "customer.subscription.updated",
             "data": {
@@ -242,7 +276,7 @@ class TestSubscriptionUpdated:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -277,12 +311,12 @@ class TestSubscriptionDeleted:
             db.session.add(sub)
             db.session.commit()
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_marks_subscription_canceled(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_marks_subscription_canceled(self, mock_verify, client, seed_data, app):
         """subscription.deleted -> marks status=canceled, site=paused."""
         self._setup_existing_sub(app, seed_data)
 
-        mock_construct.return_value = {
+        event = {
             "id": "evt_delete_001",
             "type": "customer.subscription.deleted",
             "data": {
@@ -295,7 +329,7 @@ class TestSubscriptionDeleted:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -333,12 +367,12 @@ class TestPaymentFailed:
             db.session.add(sub)
             db.session.commit()
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_sets_past_due(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_sets_past_due(self, mock_verify, client, seed_data, app):
         """payment_failed -> sets subscription to past_due."""
         self._setup_existing_sub(app, seed_data)
 
-        mock_construct.return_value = {
+        event = {
             "id": "evt_fail_001",
             "type": "invoice.payment_failed",
             "data": {
@@ -352,7 +386,7 @@ class TestPaymentFailed:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -387,12 +421,12 @@ class TestPaymentSucceeded:
             db.session.add(sub)
             db.session.commit()
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_reactivates_subscription(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_reactivates_subscription(self, mock_verify, client, seed_data, app):
         """payment_succeeded on past_due sub -> sets active, site active."""
         self._setup_past_due_sub(app, seed_data)
 
-        mock_construct.return_value = {
+        event = {
             "id": "evt_succeed_001",
             "type": "invoice.payment_succeeded",
             "data": {
@@ -406,7 +440,7 @@ class TestPaymentSucceeded:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -425,10 +459,10 @@ class TestPaymentSucceeded:
 class TestUnknownEvent:
     """Tests for unhandled event types."""
 
-    @patch("app.services.stripe_service.stripe.Webhook.construct_event")
-    def test_unknown_event_accepted(self, mock_construct, client, seed_data, app):
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_unknown_event_accepted(self, mock_verify, client, seed_data, app):
         """Unknown event type -> 200, recorded but no handler called."""
-        mock_construct.return_value = {
+        event = {
             "id": "evt_unknown_001",
             "type": "some.unknown.event",
             "data": {"object": {}},
@@ -436,7 +470,7 @@ class TestUnknownEvent:
 
         resp = client.post(
             "/stripe/webhooks",
-            data="{}",
+            data=json.dumps(event),
             content_type="application/json",
             headers={"Stripe-Signature": "valid_sig"},
         )
@@ -448,3 +482,162 @@ class TestUnknownEvent:
             ).first()
             assert evt is not None
             assert evt.event_type == "some.unknown.event"
+
+
+class TestBackgroundProcessing:
+    """Tests for acknowledge-first processing and retries."""
+
+    def _post(self, client, event):
+        return client.post(
+            "/stripe/webhooks",
+            data=json.dumps(event),
+            content_type="application/json",
+            headers={"Stripe-Signature": "valid_sig"},
+        )
+
+    @patch("app.blueprints.webhooks.background_service.submit")
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_event_queued_before_processing(self, mock_verify, mock_submit,
+                                            client, seed_data, app):
+        """Event is stored as pending and acknowledged without running handlers."""
+        event = {
+            "id": "evt_async_001",
+            "type": "invoice.payment_failed",
+            "data": {"object": {"customer": "cus_nope"}},
+        }
+        mock_submit.return_value = Future()  # never completes
+
+        resp = self._post(client, event)
+        assert resp.status_code == 200
+        assert json.loads(resp.data)["status"] == "queued"
+
+        with app.app_context():
+            evt = StripeEvent.query.filter_by(stripe_event_id="evt_async_001").first()
+            assert evt.status == "pending"
+            assert json.loads(evt.payload)["type"] == "invoice.payment_failed"
+
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_failed_event_is_retried(self, mock_verify, client, seed_data, app):
+        """A failed event keeps its payload and is re-run on redelivery."""
+        handler = MagicMock(side_effect=[RuntimeError("boom"), None])
+        event = {
+            "id": "evt_retry_001",
+            "type": "invoice.payment_failed",
+            "data": {"object": {}},
+        }
+
+        with patch.dict(
+            "app.services.stripe_service._WEBHOOK_HANDLERS",
+            {"invoice.payment_failed": handler},
+        ):
+            assert self._post(client, event).status_code == 500
+            with app.app_context():
+                evt = StripeEvent.query.filter_by(stripe_event_id="evt_retry_001").first()
+                assert evt.status == "failed"
+                assert evt.error == "boom"
+                assert evt.payload is not None
+
+            assert self._post(client, event).status_code == 200
+
+        with app.app_context():
+            evt = StripeEvent.query.filter_by(stripe_event_id="evt_retry_001").first()
+            assert evt.status == "processed"
+            assert evt.payload is None
+        assert handler.call_count == 2
+
+    @patch("app.blueprints.webhooks.background_service.submit")
+    @patch("app.services.stripe_service.stripe.WebhookSignature.verify_header")
+    def test_pending_event_not_queued_twice(self, mock_verify, mock_submit,
+                                            client, seed_data, app):
+        """A redelivery while the first copy is still pending isn't re-queued."""
+        event = {
+            "id": "evt_async_002",
+            "type": "invoice.payment_failed",
+            "data": {"object": {"customer": "cus_nope"}},
+        }
+        mock_submit.return_value = Future()  # never completes
+
+        assert json.loads(self._post(client, event).data)["status"] == "queued"
+        assert json.loads(self._post(client, event).data)["status"] == "already_processed"
+        assert mock_submit.call_count == 1
+
+    def test_cli_processes_stale_pending_events(self, app, seed_data):
+        """`flask process-stripe-events` picks up events left pending."""
+        with app.app_context():
+            db.session.add(StripeEvent(
+                stripe_event_id="evt_stale_001",
+                event_type="some.unknown.event",
+                status="pending",
+                payload=json.dumps({"id": "evt_stale_001", "type": "some.unknown.event"}),
+                processed_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            ))
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["process-stripe-events"])
+        assert "Processed 1/1" in result.output
+
+        with app.app_context():
+            evt = StripeEvent.query.filter_by(stripe_event_id="evt_stale_001").first()
+            assert evt.status == "processed"
+
+    def test_event_in_flight_is_not_run_again(self, app, seed_data):
+        """An event another worker has claimed is left alone."""
+        handler = MagicMock()
+        with app.app_context():
+            db.session.add(StripeEvent(
+                stripe_event_id="evt_claimed_001",
+                event_type="invoice.payment_failed",
+                status="processing",
+                payload=json.dumps({"id": "evt_claimed_001", "data": {"object": {}}}),
+            ))
+            db.session.commit()
+
+            with patch.dict(
+                "app.services.stripe_service._WEBHOOK_HANDLERS",
+                {"invoice.payment_failed": handler},
+            ):
+                assert process_stripe_event("evt_claimed_001") == (True, "already_processed")
+
+            evt = StripeEvent.query.filter_by(stripe_event_id="evt_claimed_001").first()
+            assert evt.status == "processing"
+        handler.assert_not_called()
+
+    def test_cli_reclaims_stale_processing_events(self, app, seed_data):
+        """`flask process-stripe-events` re-runs events stuck mid-processing."""
+        with app.app_context():
+            db.session.add(StripeEvent(
+                stripe_event_id="evt_stuck_001",
+                event_type="some.unknown.event",
+                status="processing",
+                payload=json.dumps({"id": "evt_stuck_001", "type": "some.unknown.event"}),
+                processed_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            ))
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["process-stripe-events"])
+        assert "Processed 1/1" in result.output
+
+        with app.app_context():
+            evt = StripeEvent.query.filter_by(stripe_event_id="evt_stuck_001").first()
+            assert evt.status == "processed"
+
+    def test_cli_prunes_old_processed_events(self, app, seed_data):
+        """`flask prune-stripe-events` keeps recent and unfinished events."""
+        old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        with app.app_context():
+            db.session.add_all([
+                StripeEvent(stripe_event_id="evt_old_done", event_type="x",
+                            status="processed", processed_at=old),
+                StripeEvent(stripe_event_id="evt_old_failed", event_type="x",
+                            status="failed", processed_at=old),
+                StripeEvent(stripe_event_id="evt_new_done", event_type="x",
+                            status="processed"),
+            ])
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["prune-stripe-events"])
+        assert "Deleted 1 " in result.output
+
+        with app.app_context():
+            remaining = {e.stripe_event_id for e in StripeEvent.query}
+            assert remaining == {"evt_old_failed", "evt_new_done"}